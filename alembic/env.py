@@ -6,15 +6,16 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from sqlalchemy import pool
 from alembic import context
 
-from app.db.database import engine
-from app.db import models
+from app.core.config import settings
+from app.db.database import Base, engine
+import app.models  # noqa: F401  (registers every table on Base.metadata)
 
 config = context.config
 
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-target_metadata = models.Base.metadata
+target_metadata = Base.metadata
 
 def run_migrations_offline() -> None:
     url = config.get_main_option("sqlalchemy.url")
@@ -30,12 +31,25 @@ def run_migrations_offline() -> None:
 def run_migrations_online() -> None:
     connectable = engine
     with connectable.connect() as connection:
+        is_sqlite = connection.dialect.name == "sqlite"
+        if is_sqlite:
+            # Batch migrations rebuild a table by copying it and dropping the
+            # original; with foreign keys enforced that DROP would cascade.
+            connection.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            connection.commit()
         context.configure(
             connection=connection,
             target_metadata=target_metadata
         )
-        with context.begin_transaction():
-            context.run_migrations()
+        try:
+            with context.begin_transaction():
+                context.run_migrations()
+        finally:
+            if is_sqlite:
+                # The connection goes back to the app's pool; without this, later
+                # sessions on it would silently skip ON DELETE CASCADE.
+                connection.exec_driver_sql(f"PRAGMA foreign_keys={'ON' if settings.SQLITE_FOREIGN_KEYS else 'OFF'}")
+                connection.commit()
 
 if context.is_offline_mode():
     run_migrations_offline()
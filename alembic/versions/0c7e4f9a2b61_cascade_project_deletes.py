@@ -0,0 +1,83 @@
+"""Cascade deletes from projects down to tasks, snapshots and rollups
+
+Revision ID: 0c7e4f9a2b61
+Revises: f3b8a2d6c419
+Create Date: 2025-07-08 10:41:19.552804
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0c7e4f9a2b61'
+down_revision: Union[str, None] = 'f3b8a2d6c419'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> (column, referred table) of each foreign key that gets ON DELETE CASCADE
+CASCADES = {
+    'project_phases': [('project_id', 'projects')],
+    'task_buckets': [('phase_id', 'project_phases'), ('project_id', 'projects')],
+    'tasks': [('task_bucket_id', 'task_buckets'), ('project_id', 'projects')],
+    'task_snapshots': [('task_id', 'tasks')],
+    'task_daily_rollups': [
+        ('project_id', 'projects'), ('phase_id', 'project_phases'), ('task_bucket_id', 'task_buckets'),
+    ],
+}
+
+# Names the earlier migrations gave these keys; SQLite tables built by
+# create_all have unnamed ones, which the convention names the same way.
+NAMING_CONVENTION = {'fk': 'fk_%(table_name)s_%(column_0_name)s'}
+
+# SQLite rebuilds tasks to change its keys, and the rebuild drops its triggers (see 9a1d7e3c5b20).
+FTS_COLUMNS = 'subject, description, detailed_description, vendor_system'
+FTS_NEW = 'new.subject, new.description, new.detailed_description, new.vendor_system'
+FTS_OLD = 'old.subject, old.description, old.detailed_description, old.vendor_system'
+SQLITE_FTS_TRIGGERS = [
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {FTS_OLD}); END",
+    f"CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF {FTS_COLUMNS} ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {FTS_COLUMNS}) VALUES ('delete', old.id, {FTS_OLD}); "
+    f"INSERT INTO tasks_fts(rowid, {FTS_COLUMNS}) VALUES (new.id, {FTS_NEW}); END",
+]
+
+
+def _foreign_key_names(table: str) -> dict:
+    """column -> current constraint name of the table's single-column foreign keys."""
+    return {
+        fk['constrained_columns'][0]: fk['name'] or f'fk_{table}_{fk["constrained_columns"][0]}'
+        for fk in sa.inspect(op.get_bind()).get_foreign_keys(table)
+        if len(fk['constrained_columns']) == 1
+    }
+
+
+def _set_ondelete(ondelete) -> None:
+    bind = op.get_bind()
+    for table, keys in CASCADES.items():
+        names = _foreign_key_names(table)
+        with op.batch_alter_table(table, naming_convention=NAMING_CONVENTION) as batch_op:
+            for column, referred in keys:
+                if column in names:
+                    batch_op.drop_constraint(names[column], type_='foreignkey')
+                batch_op.create_foreign_key(f'fk_{table}_{column}', referred, [column], ['id'], ondelete=ondelete)
+    if bind.dialect.name == 'sqlite' and sa.inspect(bind).has_table('tasks_fts'):
+        for statement in SQLITE_FTS_TRIGGERS:
+            op.execute(statement)
+
+
+def upgrade() -> None:
+    """Let the database delete a project's (or phase's, bucket's, task's) dependent rows."""
+    _set_ondelete('CASCADE')
+    # Deleting a phase cascades into rollups by phase_id; without an index every delete scans them.
+    op.create_index('ix_task_daily_rollups_phase_id', 'task_daily_rollups', ['phase_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Restore the plain (restricting) foreign keys."""
+    op.drop_index('ix_task_daily_rollups_phase_id', table_name='task_daily_rollups')
+    _set_ondelete(None)
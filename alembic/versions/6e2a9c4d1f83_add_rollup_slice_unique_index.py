@@ -0,0 +1,57 @@
+"""Make task_daily_rollups unique per slice
+
+Revision ID: 6e2a9c4d1f83
+Revises: 0c7e4f9a2b61
+Create Date: 2025-07-10 14:02:37.815402
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6e2a9c4d1f83'
+down_revision: Union[str, None] = '0c7e4f9a2b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# NULL team/subsystem ids never collide in a unique index; compare them as 0.
+SLICE = 'project_id, phase_id, task_bucket_id, coalesce(team_id, 0), coalesce(subsystem_id, 0), date'
+SAME_SLICE = ' AND '.join(
+    f'{expr.format("r")} = {expr.format("task_daily_rollups")}'
+    for expr in (
+        '{}.project_id', '{}.phase_id', '{}.task_bucket_id',
+        'coalesce({}.team_id, 0)', 'coalesce({}.subsystem_id, 0)', '{}.date',
+    )
+)
+COUNT_COLUMNS = ('done_count', 'pending_count', 'overdue_count')
+
+MERGE_DUPLICATES = [
+    # Racing writers could insert a slice twice; the first row takes the totals...
+    'UPDATE task_daily_rollups SET '
+    + ', '.join(f'{c} = (SELECT sum(r.{c}) FROM task_daily_rollups r WHERE {SAME_SLICE})' for c in COUNT_COLUMNS)
+    + f' WHERE id IN (SELECT min(id) FROM task_daily_rollups GROUP BY {SLICE} HAVING count(*) > 1)',
+    # ...and the others go.
+    f'DELETE FROM task_daily_rollups WHERE id NOT IN (SELECT min(id) FROM task_daily_rollups GROUP BY {SLICE})',
+    'DELETE FROM task_daily_rollups WHERE ' + ' AND '.join(f'{c} = 0' for c in COUNT_COLUMNS),
+]
+
+
+def upgrade() -> None:
+    """Merge duplicate slice rows, then index the slice so writers can upsert it."""
+    for statement in MERGE_DUPLICATES:
+        op.execute(statement)
+    op.create_index(
+        'ux_task_daily_rollups_slice',
+        'task_daily_rollups',
+        ['project_id', 'phase_id', 'task_bucket_id',
+         sa.text('coalesce(team_id, 0)'), sa.text('coalesce(subsystem_id, 0)'), 'date'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    """Drop the slice index."""
+    op.drop_index('ux_task_daily_rollups_slice', table_name='task_daily_rollups')
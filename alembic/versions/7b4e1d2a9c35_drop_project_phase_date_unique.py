@@ -0,0 +1,48 @@
+"""Drop the unique constraint on project_phases.date
+
+Revision ID: 7b4e1d2a9c35
+Revises: 6e2a9c4d1f83
+Create Date: 2025-07-12 09:27:51.240316
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b4e1d2a9c35'
+down_revision: Union[str, None] = '6e2a9c4d1f83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# 089825a3950d left the constraint unnamed; SQLite reflects it without a name,
+# which batch mode then gives this one.
+NAMING_CONVENTION = {'uq': 'uq_%(table_name)s_%(column_0_name)s'}
+
+
+def _date_unique_name():
+    for constraint in sa.inspect(op.get_bind()).get_unique_constraints('project_phases'):
+        if constraint['column_names'] == ['date']:
+            return constraint['name'] or 'uq_project_phases_date'
+    return None
+
+
+def upgrade() -> None:
+    """Let phases of different projects share a date (the model never had this constraint).
+
+    Cloning a project copies its phase dates, so with the constraint every
+    clone without a date offset failed.
+    """
+    name = _date_unique_name()
+    if name is None:
+        return
+    with op.batch_alter_table('project_phases', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.drop_constraint(name, type_='unique')
+
+
+def downgrade() -> None:
+    """Restore the constraint; fails while two phases share a date."""
+    with op.batch_alter_table('project_phases', naming_convention=NAMING_CONVENTION) as batch_op:
+        batch_op.create_unique_constraint('uq_project_phases_date', ['date'])
@@ -0,0 +1,62 @@
+"""Add task_snapshots table and backfill it from tasks.status_by_day
+
+Revision ID: 7c1e5a9d2f4b
+Revises: b2f9d4e71c08
+Create Date: 2025-06-15 10:12:44.318207
+"""
+
+import json
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1e5a9d2f4b'
+down_revision: Union[str, None] = 'b2f9d4e71c08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    """Create task_snapshots and copy every status_by_day entry into it."""
+    snapshots = op.create_table(
+        'task_snapshots',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], name='fk_task_snapshots_task_id'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('task_id', 'date', name='uq_task_snapshots_task_date'),
+    )
+    op.create_index('ix_task_snapshots_date_status_task', 'task_snapshots', ['date', 'status', 'task_id'], unique=False)
+
+    bind = op.get_bind()
+    rows = []
+    for task_id, status_by_day in bind.execute(sa.text("SELECT id, status_by_day FROM tasks")):
+        if isinstance(status_by_day, str):
+            status_by_day = json.loads(status_by_day)
+        for day, status in (status_by_day or {}).items():
+            try:
+                snapshot_date = date.fromisoformat(str(day))
+            except ValueError:
+                continue
+            if status is None:
+                continue
+            rows.append({'task_id': task_id, 'date': snapshot_date, 'status': str(status).strip().lower()})
+            if len(rows) >= BACKFILL_BATCH_SIZE:
+                op.bulk_insert(snapshots, rows)
+                rows = []
+    if rows:
+        op.bulk_insert(snapshots, rows)
+
+
+def downgrade() -> None:
+    """Drop task_snapshots; status_by_day remains the source of truth."""
+    op.drop_index('ix_task_snapshots_date_status_task', table_name='task_snapshots')
+    op.drop_table('task_snapshots')
@@ -0,0 +1,79 @@
+"""Add the full-text search index on tasks
+
+Revision ID: 9a1d7e3c5b20
+Revises: e8b4c6d1a937
+Create Date: 2025-07-02 09:12:44.381026
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a1d7e3c5b20'
+down_revision: Union[str, None] = 'e8b4c6d1a937'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = 'subject, description, detailed_description, vendor_system'
+NEW = 'new.subject, new.description, new.detailed_description, new.vendor_system'
+OLD = 'old.subject, old.description, old.detailed_description, old.vendor_system'
+
+# SQLite: external-content FTS5 table kept in sync by triggers
+SQLITE_UPGRADE = [
+    f"CREATE VIRTUAL TABLE tasks_fts USING fts5({COLUMNS}, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW}); END",
+    f"CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD}); END",
+    f"CREATE TRIGGER tasks_fts_update AFTER UPDATE OF {COLUMNS} ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD}); "
+    f"INSERT INTO tasks_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW}); END",
+    # index the rows that already exist
+    "INSERT INTO tasks_fts(tasks_fts) VALUES ('rebuild')",
+]
+SQLITE_DOWNGRADE = [
+    "DROP TRIGGER IF EXISTS tasks_fts_update",
+    "DROP TRIGGER IF EXISTS tasks_fts_delete",
+    "DROP TRIGGER IF EXISTS tasks_fts_insert",
+    "DROP TABLE IF EXISTS tasks_fts",
+]
+
+# Postgres: generated weighted tsvector (computed for existing rows by the ALTER) + GIN
+POSTGRES_UPGRADE = [
+    "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(subject, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(vendor_system, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(detailed_description, '')), 'D')) STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+]
+POSTGRES_DOWNGRADE = [
+    "DROP INDEX IF EXISTS ix_tasks_search_vector",
+    "ALTER TABLE tasks DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(statements) -> None:
+    for statement in statements:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    """Create the search index for the current dialect."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _run(POSTGRES_UPGRADE)
+    elif dialect == 'sqlite':
+        _run(SQLITE_UPGRADE)
+
+
+def downgrade() -> None:
+    """Drop the search index."""
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        _run(POSTGRES_DOWNGRADE)
+    elif dialect == 'sqlite':
+        _run(SQLITE_DOWNGRADE)
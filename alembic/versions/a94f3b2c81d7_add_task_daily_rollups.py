@@ -0,0 +1,81 @@
+"""Add task_daily_rollups table for burndown dashboards
+
+Revision ID: a94f3b2c81d7
+Revises: 7c1e5a9d2f4b
+Create Date: 2025-06-18 09:40:12.551930
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a94f3b2c81d7'
+down_revision: Union[str, None] = '7c1e5a9d2f4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+DONE_STATUS = 'done'
+
+# One row per task and day of its start_date..end_date window, grouped into
+# slices. Same counts as app.db.rollups.rebuild_project_rollup: done if the
+# day's snapshot (7c1e5a9d2f4b) is done, else overdue on end_date, else pending.
+BACKFILL = """
+WITH RECURSIVE task_days (task_id, day, end_date) AS (
+    SELECT id, start_date, end_date FROM tasks
+    WHERE start_date IS NOT NULL AND end_date IS NOT NULL AND start_date <= end_date
+    UNION ALL
+    SELECT task_id, {next_day}, end_date FROM task_days WHERE day < end_date
+)
+INSERT INTO task_daily_rollups
+    (project_id, phase_id, task_bucket_id, team_id, subsystem_id, date, done_count, pending_count, overdue_count)
+SELECT b.project_id, b.phase_id, t.task_bucket_id, t.team_id, t.subsystem_id, d.day,
+    sum(CASE WHEN s.status = :done THEN 1 ELSE 0 END),
+    sum(CASE WHEN s.status = :done OR d.day = d.end_date THEN 0 ELSE 1 END),
+    sum(CASE WHEN s.status = :done THEN 0 WHEN d.day = d.end_date THEN 1 ELSE 0 END)
+FROM task_days d
+JOIN tasks t ON t.id = d.task_id
+JOIN task_buckets b ON b.id = t.task_bucket_id
+LEFT JOIN task_snapshots s ON s.task_id = d.task_id AND s.date = d.day
+WHERE b.project_id IS NOT NULL AND b.phase_id IS NOT NULL
+GROUP BY b.project_id, b.phase_id, t.task_bucket_id, t.team_id, t.subsystem_id, d.day
+"""
+
+
+def upgrade() -> None:
+    """Create task_daily_rollups and fill it from the existing tasks and snapshots."""
+    op.create_table(
+        'task_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('phase_id', sa.Integer(), nullable=False),
+        sa.Column('task_bucket_id', sa.Integer(), nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=True),
+        sa.Column('subsystem_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('done_count', sa.Integer(), nullable=False),
+        sa.Column('pending_count', sa.Integer(), nullable=False),
+        sa.Column('overdue_count', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], name='fk_task_daily_rollups_project_id'),
+        sa.ForeignKeyConstraint(['phase_id'], ['project_phases.id'], name='fk_task_daily_rollups_phase_id'),
+        sa.ForeignKeyConstraint(['task_bucket_id'], ['task_buckets.id'], name='fk_task_daily_rollups_task_bucket_id'),
+        sa.ForeignKeyConstraint(['team_id'], ['teams.id'], name='fk_task_daily_rollups_team_id'),
+        sa.ForeignKeyConstraint(['subsystem_id'], ['subsystems.id'], name='fk_task_daily_rollups_subsystem_id'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_task_daily_rollups_project_date', 'task_daily_rollups', ['project_id', 'date'], unique=False)
+    op.create_index('ix_task_daily_rollups_bucket_date', 'task_daily_rollups', ['task_bucket_id', 'date'], unique=False)
+
+    bind = op.get_bind()
+    next_day = "day + 1" if bind.dialect.name == 'postgresql' else "date(day, '+1 day')"
+    bind.execute(sa.text(BACKFILL.format(next_day=next_day)), {'done': DONE_STATUS})
+
+
+def downgrade() -> None:
+    """Drop task_daily_rollups."""
+    op.drop_index('ix_task_daily_rollups_bucket_date', table_name='task_daily_rollups')
+    op.drop_index('ix_task_daily_rollups_project_date', table_name='task_daily_rollups')
+    op.drop_table('task_daily_rollups')
@@ -0,0 +1,67 @@
+"""Add project_id to task_buckets and tasks
+
+Revision ID: b2f9d4e71c08
+Revises: 2d03a11c5ea3
+Create Date: 2025-06-12 09:18:37.660415
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2f9d4e71c08'
+down_revision: Union[str, None] = '2d03a11c5ea3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table -> subquery giving each row's project through its parent
+PROJECT_SOURCES = (
+    ('task_buckets', 'SELECT project_id FROM project_phases WHERE project_phases.id = task_buckets.phase_id'),
+    ('tasks', 'SELECT project_id FROM task_buckets WHERE task_buckets.id = tasks.task_bucket_id'),
+)
+
+
+def upgrade() -> None:
+    """Create projects if missing, then add and backfill the denormalized project_id columns.
+
+    Databases that were stamped at 2d03a11c5ea3 by the old create_all
+    startup already have projects and may have some of the columns, so each
+    step checks first. On a fresh SQLite database 2d03a11c5ea3 has declared
+    its project_phases foreign key before projects exists; SQLite resolves
+    it lazily.
+    """
+    bind = op.get_bind()
+    if not sa.inspect(bind).has_table('projects'):
+        op.create_table(
+            'projects',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(), nullable=False),
+            sa.Column('description', sa.String(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('name'),
+        )
+        op.create_index(op.f('ix_projects_id'), 'projects', ['id'], unique=False)
+
+    for table, source in PROJECT_SOURCES:
+        if 'project_id' in {column['name'] for column in sa.inspect(bind).get_columns(table)}:
+            continue
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.add_column(sa.Column('project_id', sa.Integer(), nullable=True))
+            batch_op.create_foreign_key(f'fk_{table}_project_id', 'projects', ['project_id'], ['id'])
+        op.execute(f'UPDATE {table} SET project_id = ({source})')
+        # Rows whose parent has no project cannot be backfilled; leave the column nullable then.
+        orphans = bind.execute(sa.text(f'SELECT count(*) FROM {table} WHERE project_id IS NULL')).scalar()
+        if not orphans:
+            with op.batch_alter_table(table) as batch_op:
+                batch_op.alter_column('project_id', existing_type=sa.Integer(), nullable=False)
+
+
+def downgrade() -> None:
+    """Drop the project_id columns; projects stays, as project_phases.project_id refers to it."""
+    for table, _ in reversed(PROJECT_SOURCES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_constraint(f'fk_{table}_project_id', type_='foreignkey')
+            batch_op.drop_column('project_id')
@@ -0,0 +1,45 @@
+"""Add composite indexes for task, bucket and phase access paths
+
+Revision ID: c3d8e1f05a62
+Revises: a94f3b2c81d7
+Create Date: 2025-06-21 14:05:31.902117
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3d8e1f05a62'
+down_revision: Union[str, None] = 'a94f3b2c81d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    # by-bucket listing: filter on bucket, ordered by "order"
+    ('ix_tasks_bucket_order', 'tasks', ['task_bucket_id', 'order']),
+    # project-scoped exports, burndown rebuilds and deletes
+    ('ix_tasks_project_id', 'tasks', ['project_id']),
+    # daily summary: start_date <= day AND end_date >= day, optionally per team/subsystem
+    ('ix_tasks_dates', 'tasks', ['start_date', 'end_date']),
+    ('ix_tasks_team_dates', 'tasks', ['team_id', 'start_date', 'end_date']),
+    ('ix_tasks_subsystem_dates', 'tasks', ['subsystem_id', 'start_date', 'end_date']),
+    # by-phase listing
+    ('ix_task_buckets_phase_order', 'task_buckets', ['phase_id', 'order']),
+    ('ix_task_buckets_project_id', 'task_buckets', ['project_id']),
+    # by-project listing
+    ('ix_project_phases_project_order', 'project_phases', ['project_id', 'order']),
+]
+
+
+def upgrade() -> None:
+    """Create the composite indexes."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Drop the composite indexes."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,34 @@
+"""Add resource_versions for conditional GETs
+
+Revision ID: e8b4c6d1a937
+Revises: d5a7f2e9c814
+Create Date: 2025-06-26 10:41:52.517204
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b4c6d1a937'
+down_revision: Union[str, None] = 'd5a7f2e9c814'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Create resource_versions."""
+    op.create_table(
+        'resource_versions',
+        sa.Column('key', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('key'),
+    )
+
+
+def downgrade() -> None:
+    """Drop resource_versions."""
+    op.drop_table('resource_versions')
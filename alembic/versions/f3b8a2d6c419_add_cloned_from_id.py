@@ -0,0 +1,34 @@
+"""Add cloned_from_id to project_phases and task_buckets
+
+Revision ID: f3b8a2d6c419
+Revises: 9a1d7e3c5b20
+Create Date: 2025-07-05 16:27:03.118530
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b8a2d6c419'
+down_revision: Union[str, None] = '9a1d7e3c5b20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Record the source row of phases and buckets created by a project clone."""
+    with op.batch_alter_table('project_phases') as batch_op:
+        batch_op.add_column(sa.Column('cloned_from_id', sa.Integer(), nullable=True))
+    with op.batch_alter_table('task_buckets') as batch_op:
+        batch_op.add_column(sa.Column('cloned_from_id', sa.Integer(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop cloned_from_id."""
+    with op.batch_alter_table('task_buckets') as batch_op:
+        batch_op.drop_column('cloned_from_id')
+    with op.batch_alter_table('project_phases') as batch_op:
+        batch_op.drop_column('cloned_from_id')
@@ -0,0 +1,36 @@
+# app/api/conditional.py
+from datetime import timezone
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ResourceVersion
+
+
+async def version_headers(db: AsyncSession, key: str) -> dict:
+    """ETag and Last-Modified for a resource key, from one primary-key lookup."""
+    row = await db.get(ResourceVersion, key)
+    if row is None:
+        return {"ETag": '"0"'}
+    last_modified = row.updated_at.replace(tzinfo=timezone.utc, microsecond=0)
+    return {"ETag": f'"{row.version}"', "Last-Modified": format_datetime(last_modified, usegmt=True)}
+
+
+def is_not_modified(request: Request, headers: dict) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in tags or headers["ETag"] in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and "Last-Modified" in headers:
+        try:
+            return parsedate_to_datetime(headers["Last-Modified"]) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def not_modified_response(headers: dict) -> Response:
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,65 @@
+# app/api/endpoints/changes.py
+import asyncio
+import json
+from contextlib import suppress
+
+from fastapi import APIRouter, HTTPException, WebSocket
+from fastapi.responses import StreamingResponse
+
+from app.core.changes import broadcaster
+from app.core.config import settings
+from app.db.database import AsyncSessionLocal
+from app.models import Project
+
+router = APIRouter(tags=["Changes"])
+
+
+async def _project_exists(project_id: int) -> bool:
+    # Short-lived session: a subscription can stay open for hours and must not hold a connection.
+    async with AsyncSessionLocal() as db:
+        return await db.get(Project, project_id) is not None
+
+# ------------------ SERVER-SENT EVENTS ------------------
+async def _event_stream(project_id: int):
+    async with broadcaster.subscribe(project_id) as queue:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                events = await asyncio.wait_for(queue.get(), timeout=settings.CHANGE_FEED_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"  # keeps proxies from closing an idle stream
+                continue
+            yield f"event: changes\ndata: {json.dumps(events)}\n\n"
+
+@router.get("/projects/{project_id}/changes", response_class=StreamingResponse)
+async def stream_project_changes(project_id: int):
+    """Server-sent events: one `changes` event (a JSON list) per committed write to the project."""
+    if not await _project_exists(project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    return StreamingResponse(
+        _event_stream(project_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# ------------------ WEBSOCKET ------------------
+async def _send_changes(websocket: WebSocket, queue: asyncio.Queue):
+    while True:
+        await websocket.send_json(await queue.get())
+
+@router.websocket("/projects/{project_id}/changes/ws")
+async def project_changes_websocket(websocket: WebSocket, project_id: int):
+    """Same events as the SSE stream, one JSON list per message. Client messages are ignored."""
+    if not await _project_exists(project_id):
+        await websocket.close(code=1008)
+        return
+    await websocket.accept()
+    async with broadcaster.subscribe(project_id) as queue:
+        sender = asyncio.create_task(_send_changes(websocket, queue))
+        try:
+            while (await websocket.receive())["type"] != "websocket.disconnect":
+                pass
+        finally:
+            sender.cancel()
+            with suppress(asyncio.CancelledError, Exception):
+                await sender
@@ -0,0 +1,61 @@
+# app/api/endpoints/jobs.py
+import os
+import shutil
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
+from app.db.task_export import EXPORT_ENCODERS
+from app.db.task_import import is_supported_import
+from app.jobs.tasks import enqueue_job, job_file_path
+from app.models import Job
+from app.db import schemas
+
+router = APIRouter(tags=["Jobs"])
+
+# ------------------ DB DEPENDENCY ------------------
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# ------------------ JOB ENDPOINTS ------------------
+@router.post("/jobs/import", response_model=schemas.JobOut, status_code=202)
+async def create_import_job(file: UploadFile = File(...), db: AsyncSession = Depends(get_db)):
+    if not is_supported_import(file.filename):
+        raise HTTPException(status_code=400, detail="Only .csv and .xlsx files are supported")
+    path = job_file_path(f"upload-{uuid.uuid4().hex}{os.path.splitext(file.filename)[1].lower()}")
+    with open(path, "wb") as staged:
+        await run_in_threadpool(shutil.copyfileobj, file.file, staged)
+    return await enqueue_job(db, "import_tasks", {"path": path, "filename": file.filename})
+
+@router.post("/jobs/export", response_model=schemas.JobOut, status_code=202)
+async def create_export_job(export: schemas.ExportJobCreate, db: AsyncSession = Depends(get_db)):
+    return await enqueue_job(db, "export_tasks", jsonable_encoder(export))
+
+@router.post("/jobs/rollup-rebuild", response_model=schemas.JobOut, status_code=202)
+async def create_rollup_rebuild_job(rebuild: schemas.RollupRebuildJobCreate, db: AsyncSession = Depends(get_db)):
+    return await enqueue_job(db, "rebuild_rollups", rebuild.dict())
+
+@router.get("/jobs/{job_id}", response_model=schemas.JobOut)
+async def read_job(job_id: int, db: AsyncSession = Depends(get_db)):
+    db_job = await db.get(Job, job_id)
+    if not db_job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return db_job
+
+@router.get("/jobs/{job_id}/download")
+async def download_job_result(job_id: int, db: AsyncSession = Depends(get_db)):
+    db_job = await db.get(Job, job_id)
+    if not db_job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if db_job.kind != "export_tasks" or db_job.status != "succeeded":
+        raise HTTPException(status_code=409, detail="Job has no downloadable result")
+    filename = db_job.result["filename"]
+    return FileResponse(
+        job_file_path(filename),
+        media_type=EXPORT_ENCODERS[db_job.params["format"]].media_type,
+        filename=filename,
+    )
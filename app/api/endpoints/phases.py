@@ -1,70 +1,136 @@
 # app/api/endpoints/phases.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
 from app.models import ProjectPhase, Project
 from app.db import schemas
-from typing import List
+from app.api.pagination import paginate, next_cursor_headers
+from app.core.cache import cache, cached_json_response
+from app.api.conditional import is_not_modified, not_modified_response, version_headers
+from app.db.versions import bump_versions, project_phases_key
+from app.core.changes import changed_fields, publish_changes, record_change
+from app.db.ordering import move_item, next_order
+from app.db.deletes import delete_phase_rows
+from app.jobs.tasks import enqueue_rebalance
+from typing import List, Optional
 
 router = APIRouter(tags=["Phases"])
 
 # ------------------ DB DEPENDENCY ------------------
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # ------------------ PROJECT PHASE ENDPOINTS ------------------
 @router.post("/phases/", response_model=schemas.ProjectPhaseOut)
-def create_phase(phase: schemas.ProjectPhaseCreate, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == phase.project_id).first()
+async def create_phase(phase: schemas.ProjectPhaseCreate, db: AsyncSession = Depends(get_db)):
+    project = await db.get(Project, phase.project_id)
     if not project:
         raise HTTPException(status_code=400, detail="Project does not exist")
 
-    max_order = db.query(ProjectPhase).filter(ProjectPhase.project_id == phase.project_id).count()
-    db_phase = ProjectPhase(**phase.dict(), order=max_order + 1)
+    db_phase = ProjectPhase(**phase.dict(), order=next_order("phases", phase.project_id))
     db.add(db_phase)
-    db.commit()
-    db.refresh(db_phase)
+    await db.flush()
+    await db.run_sync(bump_versions, [project_phases_key(phase.project_id)])
+    record_change(db, "phase", "created", db_phase.id, db_phase.project_id)
+    await db.commit()
+    await cache.invalidate("phases")
+    await publish_changes(db)
+    await db.refresh(db_phase)
     return db_phase
 
 @router.get("/phases/", response_model=List[schemas.ProjectPhaseOut])
-def read_phases(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(ProjectPhase).order_by(ProjectPhase.order).offset(skip).limit(limit).all()
+async def read_phases(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    async def load():
+        phases = (await db.scalars(paginate(select(ProjectPhase), [ProjectPhase.order, ProjectPhase.id], skip, limit, cursor))).all()
+        return [schemas.ProjectPhaseOut.from_orm(phase) for phase in phases], next_cursor_headers(phases, [ProjectPhase.order, ProjectPhase.id], limit)
+
+    return await cached_json_response("phases", f"list:{skip}:{limit}:{cursor}", load)
+
+def phases_by_project_statement(project_id: int):
+    return select(ProjectPhase).where(ProjectPhase.project_id == project_id).order_by(ProjectPhase.order)
 
 @router.get("/phases/by-project/{project_id}", response_model=List[schemas.ProjectPhaseOut])
-def read_phases_by_project(project_id: int, db: Session = Depends(get_db)):
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project:
+async def read_phases_by_project(project_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    # Checked first: a project without a version row still validates as "0".
+    if not await db.get(Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
+    validators = await version_headers(db, project_phases_key(project_id))
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
 
-    return db.query(ProjectPhase).filter(ProjectPhase.project_id == project_id).order_by(ProjectPhase.order).all()
+    async def load():
+        phases = (await db.scalars(phases_by_project_statement(project_id))).all()
+        return [schemas.ProjectPhaseOut.from_orm(phase) for phase in phases], {}
+
+    # Keyed by the version the validators carry, so a write the cache did not see
+    # (another worker, a background job) can never pair a new ETag with an old body.
+    version = validators["ETag"].strip('"')
+    response = await cached_json_response("phases", f"by-project:{project_id}:{version}", load)
+    response.headers.update(validators)
+    return response
 
 @router.get("/phases/{phase_id}", response_model=schemas.ProjectPhaseOut)
-def read_phase(phase_id: int, db: Session = Depends(get_db)):
-    db_phase = db.query(ProjectPhase).filter(ProjectPhase.id == phase_id).first()
-    if not db_phase:
-        raise HTTPException(status_code=404, detail="Phase not found")
-    return db_phase
+async def read_phase(phase_id: int, db: AsyncSession = Depends(get_db)):
+    async def load():
+        db_phase = await db.get(ProjectPhase, phase_id)
+        if not db_phase:
+            raise HTTPException(status_code=404, detail="Phase not found")
+        return schemas.ProjectPhaseOut.from_orm(db_phase), {}
+
+    return await cached_json_response("phases", f"item:{phase_id}", load)
 
 @router.put("/phases/{phase_id}", response_model=schemas.ProjectPhaseOut)
-def update_phase(phase_id: int, phase: schemas.ProjectPhaseUpdate, db: Session = Depends(get_db)):
-    db_phase = db.query(ProjectPhase).filter(ProjectPhase.id == phase_id).first()
+async def update_phase(phase_id: int, phase: schemas.ProjectPhaseUpdate, db: AsyncSession = Depends(get_db)):
+    db_phase = await db.get(ProjectPhase, phase_id)
     if not db_phase:
         raise HTTPException(status_code=404, detail="Phase not found")
+    old_project_id = db_phase.project_id
+    fields = changed_fields(db_phase, phase.dict())
     for key, value in phase.dict().items():
         setattr(db_phase, key, value)
-    db.commit()
-    db.refresh(db_phase)
+    await db.run_sync(bump_versions, [project_phases_key(old_project_id), project_phases_key(db_phase.project_id)])
+    for project_id in {old_project_id, db_phase.project_id}:
+        record_change(db, "phase", "updated", db_phase.id, project_id, fields)
+    await db.commit()
+    await cache.invalidate("phases")
+    await publish_changes(db)
+    await db.refresh(db_phase)
+    return db_phase
+
+@router.post("/phases/{phase_id}/reorder", response_model=schemas.ProjectPhaseOut)
+async def reorder_phase(phase_id: int, move: schemas.ReorderRequest, db: AsyncSession = Depends(get_db)):
+    db_phase = await db.get(ProjectPhase, phase_id)
+    if not db_phase:
+        raise HTTPException(status_code=404, detail="Phase not found")
+    target = await db.get(ProjectPhase, move.target_id)
+    if not target or target.id == db_phase.id or target.project_id != db_phase.project_id:
+        raise HTTPException(status_code=400, detail="Target must be another Phase in the same Project")
+    record_change(db, "phase", "updated", db_phase.id, db_phase.project_id, ["order"])
+    if await db.run_sync(move_item, "phases", db_phase, target, move.position):
+        await enqueue_rebalance(db, "phases", db_phase.project_id)
+    else:
+        await db.commit()
+    await cache.invalidate("phases")
+    await publish_changes(db)
+    await db.refresh(db_phase)
     return db_phase
 
 @router.delete("/phases/{phase_id}")
-def delete_phase(phase_id: int, db: Session = Depends(get_db)):
-    db_phase = db.query(ProjectPhase).filter(ProjectPhase.id == phase_id).first()
+async def delete_phase(phase_id: int, db: AsyncSession = Depends(get_db)):
+    """Delete the phase together with its buckets and their tasks."""
+    db_phase = await db.get(ProjectPhase, phase_id)
     if not db_phase:
         raise HTTPException(status_code=404, detail="Phase not found")
-    db.delete(db_phase)
-    db.commit()
+    await db.run_sync(delete_phase_rows, phase_id, db_phase.project_id)
+    record_change(db, "phase", "deleted", phase_id, db_phase.project_id)
+    await db.commit()
+    await cache.invalidate("phases")
+    await publish_changes(db)
     return {"message": "Phase deleted successfully"}
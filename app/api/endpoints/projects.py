@@ -1,59 +1,213 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
-from app.db.database import SessionLocal
-from app.models import Project
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from typing import List, Optional
+from datetime import date
+import json
+from app.db.database import AsyncSessionLocal
+from app.models import Project, ProjectPhase, Task, TaskBucket, TaskDailyRollup
 from app.db import schemas
+from app.api.pagination import paginate, next_cursor_headers
+from app.core.cache import cache, cached_json_response
+from app.db.versions import ALL_TASKS, bump_versions, project_phases_key
+from app.core.changes import changed_fields, publish_changes, record_change
+from app.db.clone import clone_project
+from app.db.deletes import delete_project_rows
+from app.core.config import settings
+from app.jobs.tasks import enqueue_job
 
 router = APIRouter(tags=["Projects"])
 
 # ------------------ DB DEPENDENCY ------------------
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # ------------------ PROJECT ENDPOINTS ------------------
 @router.post("/projects/", response_model=schemas.ProjectOut)
-def create_project(project: schemas.ProjectCreate, db: Session = Depends(get_db)):
-    db_project = db.query(Project).filter(Project.name == project.name).first()
+async def create_project(project: schemas.ProjectCreate, db: AsyncSession = Depends(get_db)):
+    db_project = await db.scalar(select(Project).where(Project.name == project.name))
     if db_project:
         raise HTTPException(status_code=400, detail="Project with this name already exists")
     new_project = Project(**project.dict())
     db.add(new_project)
-    db.commit()
-    db.refresh(new_project)
+    await db.flush()
+    record_change(db, "project", "created", new_project.id, new_project.id)
+    await db.commit()
+    await cache.invalidate("projects")
+    await publish_changes(db)
+    await db.refresh(new_project)
     return new_project
 
 @router.get("/projects/", response_model=List[schemas.ProjectOut])
-def read_projects(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(Project).offset(skip).limit(limit).all()
+async def read_projects(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    async def load():
+        projects = (await db.scalars(paginate(select(Project), [Project.id], skip, limit, cursor))).all()
+        return [schemas.ProjectOut.from_orm(project) for project in projects], next_cursor_headers(projects, [Project.id], limit)
+
+    return await cached_json_response("projects", f"list:{skip}:{limit}:{cursor}", load)
 
 @router.get("/projects/{project_id}", response_model=schemas.ProjectOut)
-def read_project(project_id: int, db: Session = Depends(get_db)):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+async def read_project(project_id: int, db: AsyncSession = Depends(get_db)):
+    async def load():
+        db_project = await db.get(Project, project_id)
+        if not db_project:
+            raise HTTPException(status_code=404, detail="Project not found")
+        return schemas.ProjectOut.from_orm(db_project), {}
+
+    return await cached_json_response("projects", f"item:{project_id}", load)
+
+# ------------------ PROJECT TREE ENDPOINT ------------------
+def _iter_project_tree(project: Project):
+    """Yield the nested project JSON one phase at a time."""
+    head = json.dumps(jsonable_encoder(schemas.ProjectOut.from_orm(project)))
+    yield head[:-1] + ', "phases": ['
+    for index, phase in enumerate(sorted(project.phases, key=lambda p: p.order)):
+        node = jsonable_encoder(schemas.ProjectPhaseOut.from_orm(phase))
+        node["task_buckets"] = [
+            {
+                **jsonable_encoder(schemas.TaskBucketOut.from_orm(bucket)),
+                "tasks": [
+                    jsonable_encoder(schemas.TaskOut.from_orm(task))
+                    for task in sorted(bucket.tasks, key=lambda t: t.order)
+                ],
+            }
+            for bucket in sorted(phase.task_buckets, key=lambda b: b.order)
+        ]
+        yield ("," if index else "") + json.dumps(node)
+    yield "]}"
+
+def project_tree_statement(project_id: int):
+    # One query per level: projects, phases, buckets, tasks.
+    return select(Project).options(
+        selectinload(Project.phases)
+        .selectinload(ProjectPhase.task_buckets)
+        .selectinload(TaskBucket.tasks)
+    ).where(Project.id == project_id)
+
+@router.get(
+    "/projects/{project_id}/tree",
+    response_class=StreamingResponse,
+    responses={200: {"model": schemas.ProjectTreeOut}},
+)
+async def read_project_tree(project_id: int, db: AsyncSession = Depends(get_db)):
+    db_project = await db.scalar(project_tree_statement(project_id))
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return db_project
+    return StreamingResponse(_iter_project_tree(db_project), media_type="application/json")
 
 @router.put("/projects/{project_id}", response_model=schemas.ProjectOut)
-def update_project(project_id: int, project: schemas.ProjectCreate, db: Session = Depends(get_db)):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
+async def update_project(project_id: int, project: schemas.ProjectCreate, db: AsyncSession = Depends(get_db)):
+    db_project = await db.get(Project, project_id)
     if not db_project:
         raise HTTPException(status_code=404, detail="Project not found")
+    record_change(db, "project", "updated", project_id, project_id, changed_fields(db_project, project.dict()))
     for key, value in project.dict().items():
         setattr(db_project, key, value)
-    db.commit()
-    db.refresh(db_project)
+    await db.commit()
+    await cache.invalidate("projects")
+    await publish_changes(db)
+    await db.refresh(db_project)
     return db_project
 
 @router.delete("/projects/{project_id}")
-def delete_project(project_id: int, db: Session = Depends(get_db)):
-    db_project = db.query(Project).filter(Project.id == project_id).first()
-    if not db_project:
+async def delete_project(project_id: int, response: Response, db: AsyncSession = Depends(get_db)):
+    """Delete the project with all its phases, buckets, tasks and history.
+
+    Projects with more than PROJECT_DELETE_ASYNC_THRESHOLD tasks are deleted
+    by a background job instead (202 with the job id; poll /jobs/{id}).
+    """
+    if not await db.get(Project, project_id):
         raise HTTPException(status_code=404, detail="Project not found")
-    db.delete(db_project)
-    db.commit()
+    # Probes one index entry past the threshold instead of counting every task.
+    beyond_threshold = select(Task.id).where(Task.project_id == project_id).offset(
+        settings.PROJECT_DELETE_ASYNC_THRESHOLD).limit(1)
+    if await db.scalar(beyond_threshold) is not None:
+        db_job = await enqueue_job(db, "delete_project", {"project_id": project_id})
+        response.status_code = 202
+        return {"message": "Project deletion queued", "job_id": db_job.id}
+    await db.run_sync(delete_project_rows, project_id)
+    record_change(db, "project", "deleted", project_id, project_id)
+    await db.commit()
+    await cache.invalidate("projects")
+    await cache.invalidate("phases")
+    await publish_changes(db)
     return {"message": "Project deleted successfully"}
+
+# ------------------ CLONE ENDPOINT ------------------
+@router.post("/projects/{project_id}/clone", response_model=schemas.ProjectOut)
+async def clone_project_endpoint(project_id: int, clone: schemas.ProjectClone, db: AsyncSession = Depends(get_db)):
+    """Copy the project's phases, buckets and tasks (without status history) into a new project."""
+    if not await db.get(Project, project_id):
+        raise HTTPException(status_code=404, detail="Project not found")
+    if await db.scalar(select(Project.id).where(Project.name == clone.name)):
+        raise HTTPException(status_code=400, detail="Project with this name already exists")
+    new_project = await db.run_sync(clone_project, project_id, clone.name, clone.description, clone.date_offset_days)
+    await db.run_sync(bump_versions, [ALL_TASKS, project_phases_key(new_project.id)])
+    record_change(db, "project", "created", new_project.id, new_project.id)
+    await db.commit()
+    await cache.invalidate("projects")
+    await cache.invalidate("phases")
+    await publish_changes(db)
+    return new_project
+
+# ------------------ BURNDOWN ENDPOINT ------------------
+def burndown_statement(
+    project_id: int,
+    phase_id: Optional[int] = None,
+    task_bucket_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    subsystem_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    query = select(
+        TaskDailyRollup.date,
+        func.sum(TaskDailyRollup.done_count),
+        func.sum(TaskDailyRollup.pending_count),
+        func.sum(TaskDailyRollup.overdue_count),
+    ).where(TaskDailyRollup.project_id == project_id)
+    if phase_id:
+        query = query.where(TaskDailyRollup.phase_id == phase_id)
+    if task_bucket_id:
+        query = query.where(TaskDailyRollup.task_bucket_id == task_bucket_id)
+    if team_id:
+        query = query.where(TaskDailyRollup.team_id == team_id)
+    if subsystem_id:
+        query = query.where(TaskDailyRollup.subsystem_id == subsystem_id)
+    if start_date:
+        query = query.where(TaskDailyRollup.date >= start_date)
+    if end_date:
+        query = query.where(TaskDailyRollup.date <= end_date)
+    return query.group_by(TaskDailyRollup.date).order_by(TaskDailyRollup.date)
+
+@router.get("/projects/{project_id}/burndown", response_model=List[schemas.BurndownPoint])
+async def read_project_burndown(
+    project_id: int,
+    phase_id: Optional[int] = None,
+    task_bucket_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    subsystem_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    db_project = await db.get(Project, project_id)
+    if not db_project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+    rows = (await db.execute(burndown_statement(
+        project_id, phase_id, task_bucket_id, team_id, subsystem_id, start_date, end_date
+    ))).all()
+    return [
+        schemas.BurndownPoint(date=day, done_count=done, pending_count=pending, overdue_count=overdue)
+        for day, done, pending, overdue in rows
+    ]
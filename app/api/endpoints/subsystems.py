@@ -1,47 +1,62 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models import Subsystem
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
+from app.models import Subsystem, Task
 from app.db import schemas
-from typing import List
+from app.api.pagination import paginate, next_cursor_headers
+from app.core.cache import cache, cached_json_response
+from typing import List, Optional
 
 router = APIRouter(tags=["SubSystems"])
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @router.post("/subsystems/", response_model=schemas.SubsystemOut)
-def create_subsystem(subsystem: schemas.SubsystemCreate, db: Session = Depends(get_db)):
+async def create_subsystem(subsystem: schemas.SubsystemCreate, db: AsyncSession = Depends(get_db)):
     db_subsystem = Subsystem(**subsystem.dict())
     db.add(db_subsystem)
-    db.commit()
-    db.refresh(db_subsystem)
+    await db.commit()
+    await cache.invalidate("subsystems")
+    await db.refresh(db_subsystem)
     return db_subsystem
 
 @router.get("/subsystems/", response_model=List[schemas.SubsystemOut])
-def read_subsystems(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(Subsystem).offset(skip).limit(limit).all()
+async def read_subsystems(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    async def load():
+        subsystems = (await db.scalars(paginate(select(Subsystem), [Subsystem.id], skip, limit, cursor))).all()
+        return [schemas.SubsystemOut.from_orm(subsystem) for subsystem in subsystems], next_cursor_headers(subsystems, [Subsystem.id], limit)
+
+    return await cached_json_response("subsystems", f"list:{skip}:{limit}:{cursor}", load)
 
 @router.put("/subsystems/{subsystem_id}", response_model=schemas.SubsystemOut)
-def update_subsystem(subsystem_id: int, subsystem: schemas.SubsystemCreate, db: Session = Depends(get_db)):
-    db_subsystem = db.query(Subsystem).filter(Subsystem.id == subsystem_id).first()
+async def update_subsystem(subsystem_id: int, subsystem: schemas.SubsystemCreate, db: AsyncSession = Depends(get_db)):
+    db_subsystem = await db.get(Subsystem, subsystem_id)
     if not db_subsystem:
         raise HTTPException(status_code=404, detail="Subsystem not found")
     for key, value in subsystem.dict().items():
         setattr(db_subsystem, key, value)
-    db.commit()
-    db.refresh(db_subsystem)
+    await db.commit()
+    await cache.invalidate("subsystems")
+    await db.refresh(db_subsystem)
     return db_subsystem
 
 @router.delete("/subsystems/{subsystem_id}")
-def delete_subsystem(subsystem_id: int, db: Session = Depends(get_db)):
-    db_subsystem = db.query(Subsystem).filter(Subsystem.id == subsystem_id).first()
+async def delete_subsystem(subsystem_id: int, db: AsyncSession = Depends(get_db)):
+    db_subsystem = await db.get(Subsystem, subsystem_id)
     if not db_subsystem:
         raise HTTPException(status_code=404, detail="Subsystem not found")
-    db.delete(db_subsystem)
-    db.commit()
+    # tasks.subsystem_id is a plain foreign key: with foreign keys enforced the delete would fail at commit.
+    if await db.scalar(select(Task.id).where(Task.subsystem_id == subsystem_id).limit(1)) is not None:
+        raise HTTPException(status_code=400, detail="Cannot delete Subsystem with associated Tasks")
+    await db.delete(db_subsystem)
+    await db.commit()
+    await cache.invalidate("subsystems")
     return {"message": "Subsystem deleted successfully"}
@@ -1,72 +1,143 @@
 # app/api/endpoints/task_buckets.py
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
+from fastapi import APIRouter, Depends, HTTPException, Response
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
 from app.models import TaskBucket, Task, ProjectPhase
 from app.db import schemas
-from typing import List
+from app.db.versions import ALL_TASKS, bucket_tasks_key, bump_versions
+from app.core.changes import changed_fields, publish_changes, record_change
+from app.db.batch import apply_task_bucket_batch, follow_bucket_move
+from app.db.ordering import move_item
+from app.jobs.tasks import enqueue_rebalance
+from app.api.pagination import paginate, set_next_cursor
+from app.api.responses import fetch_dicts, projected_response, projection
+from typing import List, Optional
 
 router = APIRouter(tags=["TaskBuckets"])
 
+BUCKET_OUT_COLUMNS = projection(TaskBucket, schemas.TaskBucketOut)
+
 # ------------------ DB DEPENDENCY ------------------
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # ------------------ TASK BUCKET ENDPOINTS ------------------
 @router.post("/task-buckets/", response_model=schemas.TaskBucketOut)
-def create_task_bucket(bucket: schemas.TaskBucketCreate, db: Session = Depends(get_db)):
-    phase = db.query(ProjectPhase).filter(ProjectPhase.id == bucket.phase_id).first()
+async def create_task_bucket(bucket: schemas.TaskBucketCreate, db: AsyncSession = Depends(get_db)):
+    phase = await db.get(ProjectPhase, bucket.phase_id)
     if not phase:
         raise HTTPException(status_code=400, detail="ProjectPhase does not exist")
 
-    db_bucket = TaskBucket(**bucket.dict())
+    db_bucket = TaskBucket(**bucket.dict(), project_id=phase.project_id)
     db.add(db_bucket)
-    db.commit()
-    db.refresh(db_bucket)
+    await db.flush()
+    record_change(db, "task_bucket", "created", db_bucket.id, db_bucket.project_id)
+    await db.commit()
+    await publish_changes(db)
+    await db.refresh(db_bucket)
     return db_bucket
 
+@router.post("/task-buckets/batch", response_model=schemas.BatchResult)
+async def batch_task_buckets(batch: schemas.TaskBucketBatchRequest, response: Response, db: AsyncSession = Depends(get_db)):
+    """Apply create/update/delete operations in one transaction, or none of them if any is invalid."""
+    result = await db.run_sync(apply_task_bucket_batch, batch.operations)
+    if not result.applied:
+        response.status_code = 422
+        return result
+    await db.commit()
+    await publish_changes(db)
+    return result
+
 @router.get("/task-buckets/", response_model=List[schemas.TaskBucketOut])
-def read_task_buckets(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(TaskBucket).offset(skip).limit(limit).all()
+async def read_task_buckets(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    buckets = await fetch_dicts(db, paginate(select(*BUCKET_OUT_COLUMNS), [TaskBucket.id], skip, limit, cursor))
+    set_next_cursor(response, buckets, [TaskBucket.id], limit)
+    return projected_response(buckets, response)
 
 @router.get("/task-buckets/{bucket_id}", response_model=schemas.TaskBucketOut)
-def read_task_bucket(bucket_id: int, db: Session = Depends(get_db)):
-    db_bucket = db.query(TaskBucket).filter(TaskBucket.id == bucket_id).first()
+async def read_task_bucket(bucket_id: int, db: AsyncSession = Depends(get_db)):
+    db_bucket = await db.get(TaskBucket, bucket_id)
     if not db_bucket:
         raise HTTPException(status_code=404, detail="TaskBucket not found")
     return db_bucket
     
+def buckets_by_phase_statement(phase_id: int):
+    return select(*BUCKET_OUT_COLUMNS).where(TaskBucket.phase_id == phase_id).order_by(TaskBucket.order)
+
+
 @router.get("/task-buckets/by-phase/{phase_id}", response_model=List[schemas.TaskBucketOut])
-def read_task_buckets_by_phase(phase_id: int, db: Session = Depends(get_db)):
-    phase = db.query(ProjectPhase).filter(ProjectPhase.id == phase_id).first()
+async def read_task_buckets_by_phase(phase_id: int, db: AsyncSession = Depends(get_db)):
+    phase = await db.get(ProjectPhase, phase_id)
     if not phase:
         raise HTTPException(status_code=404, detail="ProjectPhase not found")
-    return db.query(TaskBucket).filter(TaskBucket.phase_id == phase_id).order_by(TaskBucket.order).all()
+    buckets = await fetch_dicts(db, buckets_by_phase_statement(phase_id))
+    return projected_response(buckets)
 
 
 @router.put("/task-buckets/{bucket_id}", response_model=schemas.TaskBucketOut)
-def update_task_bucket(bucket_id: int, bucket: schemas.TaskBucketUpdate, db: Session = Depends(get_db)):
-    db_bucket = db.query(TaskBucket).filter(TaskBucket.id == bucket_id).first()
+async def update_task_bucket(bucket_id: int, bucket: schemas.TaskBucketUpdate, db: AsyncSession = Depends(get_db)):
+    db_bucket = await db.get(TaskBucket, bucket_id)
     if not db_bucket:
         raise HTTPException(status_code=404, detail="TaskBucket not found")
+    fields = changed_fields(db_bucket, bucket.dict())
+    old_project_id = db_bucket.project_id
+    if bucket.phase_id is not None and bucket.phase_id != db_bucket.phase_id:
+        phase = await db.get(ProjectPhase, bucket.phase_id)
+        if not phase:
+            raise HTTPException(status_code=400, detail="ProjectPhase does not exist")
+        # The bucket's tasks and rollup rows carry its project; they move with it.
+        db_bucket.project_id = phase.project_id
+        await db.run_sync(follow_bucket_move, bucket_id, phase.id, phase.project_id)
     for key, value in bucket.dict().items():
         setattr(db_bucket, key, value)
-    db.commit()
-    db.refresh(db_bucket)
+    for project_id in {old_project_id, db_bucket.project_id}:
+        record_change(db, "task_bucket", "updated", db_bucket.id, project_id, fields)
+    await db.commit()
+    await publish_changes(db)
+    await db.refresh(db_bucket)
     return db_bucket
 
-@router.delete("/task-buckets/{bucket_id}")
-def delete_task_bucket(bucket_id: int, db: Session = Depends(get_db)):
-    if db.query(Task).filter(Task.task_bucket_id == bucket_id).count() > 0:
-        raise HTTPException(status_code=400, detail="Cannot delete TaskBucket with associated Tasks")
-
-    db_bucket = db.query(TaskBucket).filter(TaskBucket.id == bucket_id).first()
+@router.post("/task-buckets/{bucket_id}/reorder", response_model=schemas.TaskBucketOut)
+async def reorder_task_bucket(bucket_id: int, move: schemas.ReorderRequest, db: AsyncSession = Depends(get_db)):
+    db_bucket = await db.get(TaskBucket, bucket_id)
     if not db_bucket:
         raise HTTPException(status_code=404, detail="TaskBucket not found")
-    db.delete(db_bucket)
-    db.commit()
+    target = await db.get(TaskBucket, move.target_id)
+    if not target or target.id == db_bucket.id or target.phase_id != db_bucket.phase_id:
+        raise HTTPException(status_code=400, detail="Target must be another TaskBucket in the same ProjectPhase")
+    record_change(db, "task_bucket", "updated", db_bucket.id, db_bucket.project_id, ["order"])
+    if await db.run_sync(move_item, "task_buckets", db_bucket, target, move.position):
+        await enqueue_rebalance(db, "task_buckets", db_bucket.phase_id)
+    else:
+        await db.commit()
+    await publish_changes(db)
+    await db.refresh(db_bucket)
+    return db_bucket
+
+@router.delete("/task-buckets/{bucket_id}")
+async def delete_task_bucket(bucket_id: int, db: AsyncSession = Depends(get_db)):
+    # One statement: the emptiness check is part of the DELETE, so a task added
+    # concurrently can never be swept away by the ON DELETE CASCADE.
+    project_id = await db.scalar(
+        delete(TaskBucket)
+        .where(TaskBucket.id == bucket_id, ~select(Task.id).where(Task.task_bucket_id == bucket_id).exists())
+        .returning(TaskBucket.project_id),
+        execution_options={"synchronize_session": False},
+    )
+    if project_id is None:
+        if await db.get(TaskBucket, bucket_id):
+            raise HTTPException(status_code=400, detail="Cannot delete TaskBucket with associated Tasks")
+        raise HTTPException(status_code=404, detail="TaskBucket not found")
+    await db.run_sync(bump_versions, [ALL_TASKS, bucket_tasks_key(bucket_id)])
+    record_change(db, "task_bucket", "deleted", bucket_id, project_id)
+    await db.commit()
+    await publish_changes(db)
     return {"message": "TaskBucket deleted successfully"}
@@ -1,108 +1,415 @@
 # app/api/endpoints/tasks.py
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Request, Response, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, case, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models import Task, TaskBucket, Subsystem, ProjectPhase
+from app.db.database import SessionLocal, AsyncSessionLocal
+from app.models import Task, TaskBucket, TaskStatusSnapshot
 from app.db import schemas
-from io import BytesIO
-import pandas as pd
-from typing import List, Optional
+from app.api.pagination import paginate, set_next_cursor
+from app.api.responses import fetch_dicts, projected_response, projection
+from app.api.conditional import is_not_modified, not_modified_response, version_headers
+from app.db.snapshots import DONE_STATUS, insert_snapshots, replace_task_snapshots
+from app.db.rollups import apply_rollup_delta, task_state
+from app.db.versions import ALL_TASKS, bucket_tasks_key, bump_versions
+from app.core.changes import changed_fields, publish_changes, record_change
+from app.db.task_export import EXPORT_ENCODERS, export_statement
+from app.db.task_import import is_supported_import, run_task_import
+from app.db.batch import apply_task_batch
+from app.db.ordering import move_item
+from app.db.task_status import set_day_statuses
+from app.db.search import search_statement, search_terms
+from app.db.task_query import task_group_statement, task_query_conditions
+from app.jobs.tasks import enqueue_rebalance
+from typing import List, Optional, Literal
 from datetime import date
 
 router = APIRouter(tags=["Tasks"])
 
+TASK_OUT_COLUMNS = projection(Task, schemas.TaskOut)
+
 # ------------------ DB DEPENDENCY ------------------
-def get_db():
+async def get_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+# ------------------ TASK HISTORY HOOKS ------------------
+# Snapshot and rollup bookkeeping is written with the sync Session API and
+# run inside the request's AsyncSession through run_sync.
+def _record_task_created(session: Session, db_task: Task):
+    insert_snapshots(session, [{"id": db_task.id, "status_by_day": db_task.status_by_day}])
+    apply_rollup_delta(session, new_states=[task_state(session, db_task)])
+    bump_versions(session, [ALL_TASKS, bucket_tasks_key(db_task.task_bucket_id)])
+    record_change(session, "task", "created", db_task.id, db_task.project_id)
+
+def _record_task_updated(session: Session, db_task: Task, old_state: dict, fields: List[str]):
+    replace_task_snapshots(session, db_task.id, db_task.status_by_day)
+    apply_rollup_delta(session, old_states=[old_state], new_states=[task_state(session, db_task)])
+    bump_versions(session, [
+        ALL_TASKS, bucket_tasks_key(old_state["task_bucket_id"]), bucket_tasks_key(db_task.task_bucket_id)
+    ])
+    for project_id in {old_state["project_id"], db_task.project_id}:
+        record_change(session, "task", "updated", db_task.id, project_id, fields)
+
+def _record_task_deleted(session: Session, db_task: Task):
+    apply_rollup_delta(session, old_states=[task_state(session, db_task)])
+    bump_versions(session, [ALL_TASKS, bucket_tasks_key(db_task.task_bucket_id)])
+    record_change(session, "task", "deleted", db_task.id, db_task.project_id)
+
 # ------------------ TASK ENDPOINTS ------------------
 @router.post("/tasks/", response_model=schemas.TaskOut)
-def create_task(task: schemas.TaskCreate, db: Session = Depends(get_db)):
-    task_bucket = db.query(TaskBucket).filter(TaskBucket.id == task.task_bucket_id).first()
+async def create_task(task: schemas.TaskCreate, db: AsyncSession = Depends(get_db)):
+    task_bucket = await db.get(TaskBucket, task.task_bucket_id)
     if not task_bucket:
         raise HTTPException(status_code=400, detail="TaskBucket does not exist")
 
-    db_task = Task(**task.dict())
+    db_task = Task(**{**task.dict(), "status_by_day": task.status_by_day or {}}, project_id=task_bucket.project_id)
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.flush()
+    await db.run_sync(_record_task_created, db_task)
+    await db.commit()
+    await publish_changes(db)
+    await db.refresh(db_task)
     return db_task
 
+@router.post("/tasks/batch", response_model=schemas.BatchResult)
+async def batch_tasks(batch: schemas.TaskBatchRequest, response: Response, db: AsyncSession = Depends(get_db)):
+    """Apply create/update/delete operations in one transaction, or none of them if any is invalid."""
+    result = await db.run_sync(apply_task_batch, batch.operations)
+    if not result.applied:
+        response.status_code = 422
+        return result
+    await db.commit()
+    await publish_changes(db)
+    return result
+
 @router.get("/tasks/", response_model=List[schemas.TaskOut])
-def read_tasks(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(Task).offset(skip).limit(limit).all()
+async def read_tasks(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    tasks = await fetch_dicts(db, paginate(select(*TASK_OUT_COLUMNS), [Task.id], skip, limit, cursor))
+    set_next_cursor(response, tasks, [Task.id], limit)
+    return projected_response(tasks, response)
+
+# ------------------ SEARCH ENDPOINT ------------------
+# Search, query and export are declared before /tasks/{task_id} so their
+# paths are not parsed as an id.
+@router.get("/tasks/search", response_model=List[schemas.TaskSearchHit])
+async def search_tasks(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    project_id: Optional[int] = None,
+    task_bucket_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    skip: int = 0,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Tasks whose subject, description, detailed description or vendor system contain every word of q (as prefixes), best match first."""
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="Query has no searchable words")
+    stmt = search_statement(db.get_bind().dialect.name, terms, TASK_OUT_COLUMNS)
+    for column, value in ((Task.project_id, project_id), (Task.task_bucket_id, task_bucket_id), (Task.team_id, team_id)):
+        if value is not None:
+            stmt = stmt.where(column == value)
+    rank = stmt.selected_columns.rank
+    hits = await fetch_dicts(db, paginate(stmt, [rank, Task.id], skip, limit, cursor))
+    set_next_cursor(response, hits, [rank, Task.id], limit)
+    return projected_response(hits, response)
+
+# ------------------ QUERY ENDPOINT ------------------
+def task_list_statement(conditions: list, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return paginate(select(*TASK_OUT_COLUMNS).where(*conditions), [Task.id], skip, limit, cursor)
+
+@router.get("/tasks/query", response_model=schemas.TaskQueryResult, response_model_exclude_unset=True)
+async def query_tasks(
+    response: Response,
+    project_id: Optional[List[int]] = Query(None),
+    phase_id: Optional[List[int]] = Query(None),
+    task_bucket_id: Optional[List[int]] = Query(None),
+    team_id: Optional[List[int]] = Query(None),
+    subsystem_id: Optional[List[int]] = Query(None),
+    vendor_system: Optional[List[str]] = Query(None),
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[List[str]] = Query(None),
+    done: Optional[bool] = None,
+    status_date: Optional[date] = None,
+    group_by: Optional[List[schemas.TaskGroupBy]] = Query(None),
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Filtered tasks (paged by id), or with group_by, per-group counts; one SQL statement either way.
+
+    Repeat a filter to match any of its values. status/done/group_by=status
+    refer to the status_by_day entry for status_date.
+    """
+    group_by = list(dict.fromkeys(group_by or []))
+    if (status or done is not None or "status" in group_by) and status_date is None:
+        raise HTTPException(status_code=400, detail="status_date is required to filter or group by status")
+    conditions = task_query_conditions(
+        project_id, phase_id, task_bucket_id, team_id, subsystem_id, vendor_system,
+        start_date, end_date, status, done, status_date,
+    )
+    if group_by:
+        groups = await fetch_dicts(db, task_group_statement(conditions, group_by, status_date))
+        return projected_response({"groups": groups}, response)
+    tasks = await fetch_dicts(db, task_list_statement(conditions, skip, limit, cursor))
+    set_next_cursor(response, tasks, [Task.id], limit)
+    return projected_response({"tasks": tasks}, response)
+
+# ------------------ EXPORT ENDPOINT ------------------
+async def _stream_export(stmt, encoder):
+    """Encode row batches from a server-side cursor; the session lives as long as the stream."""
+    yield encoder.start()
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            yield encoder.encode(rows)
+    for chunk in encoder.finish():
+        yield chunk
+
+@router.get("/tasks/export", response_class=StreamingResponse)
+async def export_tasks(
+    export_format: Literal["ndjson", "csv", "xlsx"] = Query("ndjson", alias="format"),
+    project_id: Optional[int] = None,
+    task_bucket_id: Optional[int] = None,
+    subsystem_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    stmt = export_statement(project_id, task_bucket_id, subsystem_id, team_id, start_date, end_date)
+    encoder = EXPORT_ENCODERS[export_format]()
+    return StreamingResponse(
+        _stream_export(stmt, encoder),
+        media_type=encoder.media_type,
+        headers={"Content-Disposition": f'attachment; filename="tasks.{export_format}"'},
+    )
 
 @router.get("/tasks/{task_id}", response_model=schemas.TaskOut)
-def read_task(task_id: int, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+async def read_task(task_id: int, db: AsyncSession = Depends(get_db)):
+    db_task = await db.get(Task, task_id)
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
     return db_task
     
+def tasks_by_bucket_statement(bucket_id: int):
+    return select(*TASK_OUT_COLUMNS).where(Task.task_bucket_id == bucket_id).order_by(Task.order)
+
 @router.get("/tasks/by-bucket/{bucket_id}", response_model=List[schemas.TaskOut])
-def read_tasks_by_bucket(bucket_id: int, db: Session = Depends(get_db)):
-    bucket = db.query(TaskBucket).filter(TaskBucket.id == bucket_id).first()
-    if not bucket:
+async def read_tasks_by_bucket(
+    bucket_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    # Checked first: a bucket without a version row still validates as "0".
+    if not await db.get(TaskBucket, bucket_id):
         raise HTTPException(status_code=404, detail="TaskBucket not found")
-    return db.query(Task).filter(Task.task_bucket_id == bucket_id).order_by(Task.order).all()
+    validators = await version_headers(db, bucket_tasks_key(bucket_id))
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    response.headers.update(validators)
+    tasks = await fetch_dicts(db, tasks_by_bucket_statement(bucket_id))
+    return projected_response(tasks, response)
 
 @router.put("/tasks/{task_id}", response_model=schemas.TaskOut)
-def update_task(task_id: int, task: schemas.TaskUpdate, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+async def update_task(task_id: int, task: schemas.TaskUpdate, db: AsyncSession = Depends(get_db)):
+    db_task = await db.get(Task, task_id)
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
-    for key, value in task.dict().items():
+    if task.task_bucket_id != db_task.task_bucket_id:
+        task_bucket = await db.get(TaskBucket, task.task_bucket_id)
+        if not task_bucket:
+            raise HTTPException(status_code=400, detail="TaskBucket does not exist")
+        db_task.project_id = task_bucket.project_id
+    old_state = await db.run_sync(task_state, db_task)
+    values = {**task.dict(), "status_by_day": task.status_by_day or {}}
+    fields = changed_fields(db_task, values)
+    for key, value in values.items():
         setattr(db_task, key, value)
-    db.commit()
-    db.refresh(db_task)
+    await db.run_sync(_record_task_updated, db_task, old_state, fields)
+    await db.commit()
+    await publish_changes(db)
+    await db.refresh(db_task)
+    return db_task
+
+@router.post("/tasks/{task_id}/reorder", response_model=schemas.TaskOut)
+async def reorder_task(task_id: int, move: schemas.ReorderRequest, db: AsyncSession = Depends(get_db)):
+    db_task = await db.get(Task, task_id)
+    if not db_task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    target = await db.get(Task, move.target_id)
+    if not target or target.id == db_task.id or target.task_bucket_id != db_task.task_bucket_id:
+        raise HTTPException(status_code=400, detail="Target must be another Task in the same TaskBucket")
+    record_change(db, "task", "updated", db_task.id, db_task.project_id, ["order"])
+    if await db.run_sync(move_item, "tasks", db_task, target, move.position):
+        await enqueue_rebalance(db, "tasks", db_task.task_bucket_id)
+    else:
+        await db.commit()
+    await publish_changes(db)
+    await db.refresh(db_task)
     return db_task
 
+# ------------------ DAY STATUS ENDPOINTS ------------------
+@router.patch("/tasks/status", response_model=schemas.TaskStatusBulkResult)
+async def patch_task_statuses(patch: schemas.TaskStatusBulkPatch, db: AsyncSession = Depends(get_db)):
+    keys = [(change.task_id, change.date) for change in patch.changes]
+    if len(set(keys)) != len(keys):
+        raise HTTPException(status_code=400, detail="Each task/date pair may appear only once")
+    updated = await db.run_sync(set_day_statuses, patch.changes)
+    missing = sorted({change.task_id for change in patch.changes} - set(updated))
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Task(s) not found: {', '.join(map(str, missing))}")
+    await db.commit()
+    await publish_changes(db)
+    return {"updated": len(patch.changes)}
+
+@router.patch("/tasks/{task_id}/status/{day}", response_model=schemas.TaskStatusChange)
+async def patch_task_status(task_id: int, day: date, patch: schemas.TaskStatusPatch, db: AsyncSession = Depends(get_db)):
+    change = schemas.TaskStatusChange(task_id=task_id, date=day, status=patch.status)
+    if not await db.run_sync(set_day_statuses, [change]):
+        raise HTTPException(status_code=404, detail="Task not found")
+    await db.commit()
+    await publish_changes(db)
+    return change
+
 @router.delete("/tasks/{task_id}")
-def delete_task(task_id: int, db: Session = Depends(get_db)):
-    db_task = db.query(Task).filter(Task.id == task_id).first()
+async def delete_task(task_id: int, db: AsyncSession = Depends(get_db)):
+    db_task = await db.get(Task, task_id)
     if not db_task:
         raise HTTPException(status_code=404, detail="Task not found")
-    db.delete(db_task)
-    db.commit()
+    await db.run_sync(_record_task_deleted, db_task)
+    await db.delete(db_task)
+    await db.commit()
+    await publish_changes(db)
     return {"message": "Task deleted successfully"}
 
 # ------------------ DAILY SUMMARY ENDPOINT ------------------
-@router.get("/daily-summary/", response_model=schemas.DailySummary)
-def get_daily_summary(
+def _is_done_on(date_query: date):
+    """SQL expression that is true when the task is marked done on date_query.
+
+    Answered from the (date, status, task_id) index on task_snapshots, so the
+    status_by_day blob is never loaded or parsed.
+    """
+    done_task_ids = select(TaskStatusSnapshot.task_id).where(
+        TaskStatusSnapshot.date == date_query,
+        TaskStatusSnapshot.status == DONE_STATUS,
+    )
+    return Task.id.in_(done_task_ids)
+
+def daily_summary_statement(
     date_query: date,
+    view: str = "full",
     subsystem_id: Optional[int] = None,
     team_id: Optional[int] = None,
-    db: Session = Depends(get_db)
 ):
-    query = db.query(Task).filter(
+    """The one statement each view of GET /daily-summary/ runs."""
+    conditions = [
         Task.start_date <= date_query,
         Task.end_date >= date_query
-    )
+    ]
     if subsystem_id:
-        query = query.filter(Task.subsystem_id == subsystem_id)
+        conditions.append(Task.subsystem_id == subsystem_id)
     if team_id:
-        query = query.filter(Task.team_id == team_id)
-
-    tasks = query.all()
-    completed = []
-    pending = []
-
-    for task in tasks:
-        status = task.status_by_day.get(str(date_query), "Pending")
-        serialized = schemas.TaskOut.from_orm(task)
-        if status.lower() == "done":
-            completed.append(serialized)
-        else:
-            pending.append(serialized)
-
-    return schemas.DailySummary(
-        date=date_query,
-        subsystem_id=subsystem_id,
-        team_id=team_id,
-        completed_tasks=completed,
-        pending_tasks=pending
-    )
+        conditions.append(Task.team_id == team_id)
+
+    is_done = _is_done_on(date_query)
+    if view == "counts":
+        return select(
+            func.coalesce(func.sum(case((is_done, 1), else_=0)), 0),
+            func.count(Task.id),
+        ).where(*conditions)
+    # Unordered: ORDER BY id would walk the table by rowid instead of ix_tasks_dates;
+    # the handler sorts the (date-filtered) rows by id instead.
+    if view == "ids":
+        return select(Task.id, is_done).where(*conditions)
+    return select(*TASK_OUT_COLUMNS, is_done.label("done")).where(*conditions)
+
+@router.get("/daily-summary/", response_model=schemas.DailySummary, response_model_exclude_unset=True)
+async def get_daily_summary(
+    request: Request,
+    response: Response,
+    date_query: date,
+    subsystem_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    view: Literal["full", "counts", "ids"] = "full",
+    db: AsyncSession = Depends(get_db)
+):
+    validators = await version_headers(db, ALL_TASKS)
+    if is_not_modified(request, validators):
+        return not_modified_response(validators)
+    response.headers.update(validators)
+
+    summary = {"date": date_query, "subsystem_id": subsystem_id, "team_id": team_id}
+    stmt = daily_summary_statement(date_query, view, subsystem_id, team_id)
+
+    if view == "counts":
+        completed_count, total = (await db.execute(stmt)).one()
+        summary["completed_count"] = completed_count
+        summary["pending_count"] = total - completed_count
+        return projected_response(summary, response)
+
+    if view == "ids":
+        rows = sorted((await db.execute(stmt)).all())
+        completed = [task_id for task_id, done in rows if done]
+        pending = [task_id for task_id, done in rows if not done]
+    else:
+        rows = sorted(await fetch_dicts(db, stmt), key=lambda row: row["id"])
+        completed, pending = [], []
+        for row in rows:
+            (completed if row.pop("done") else pending).append(row)
+    summary["completed_count"] = len(completed)
+    summary["pending_count"] = len(pending)
+    summary["completed_ids" if view == "ids" else "completed_tasks"] = completed
+    summary["pending_ids" if view == "ids" else "pending_tasks"] = pending
+    return projected_response(summary, response)
+
+@router.get("/daily-summary/rollup", response_model=List[schemas.DailyRollupRow])
+async def get_daily_rollup(
+    date_query: date,
+    group_by: Literal["team", "subsystem"] = "team",
+    db: AsyncSession = Depends(get_db)
+):
+    group_column = Task.team_id if group_by == "team" else Task.subsystem_id
+    is_done = _is_done_on(date_query)
+    rows = (await db.execute(
+        select(
+            group_column,
+            func.coalesce(func.sum(case((is_done, 1), else_=0)), 0),
+            func.count(Task.id),
+        ).where(
+            Task.start_date <= date_query,
+            Task.end_date >= date_query
+        ).group_by(group_column).order_by(group_column)
+    )).all()
+
+    return [
+        schemas.DailyRollupRow(group_id=group_id, completed_count=completed, pending_count=total - completed)
+        for group_id, completed, total in rows
+    ]
+
+# ------------------ BULK IMPORT ENDPOINT ------------------
+@router.post("/tasks/import", response_model=schemas.TaskImportResult)
+def import_tasks(file: UploadFile = File(...), db: Session = Depends(get_sync_db)):
+    # Parsing is CPU bound, so this handler stays sync and runs in the threadpool.
+    if not is_supported_import(file.filename):
+        raise HTTPException(status_code=400, detail="Only .csv and .xlsx files are supported")
+    return run_task_import(db, file.file, file.filename)
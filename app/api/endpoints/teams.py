@@ -1,47 +1,62 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.db.database import SessionLocal
-from app.models import Team
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.database import AsyncSessionLocal
+from app.models import Team, Task
 from app.db import schemas
-from typing import List
+from app.api.pagination import paginate, next_cursor_headers
+from app.core.cache import cache, cached_json_response
+from typing import List, Optional
 
 router = APIRouter(tags=["Teams"])
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 @router.post("/teams/", response_model=schemas.TeamOut)
-def create_team(team: schemas.TeamCreate, db: Session = Depends(get_db)):
+async def create_team(team: schemas.TeamCreate, db: AsyncSession = Depends(get_db)):
     db_team = Team(**team.dict())
     db.add(db_team)
-    db.commit()
-    db.refresh(db_team)
+    await db.commit()
+    await cache.invalidate("teams")
+    await db.refresh(db_team)
     return db_team
 
 @router.get("/teams/", response_model=List[schemas.TeamOut])
-def read_teams(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    return db.query(Team).offset(skip).limit(limit).all()
+async def read_teams(
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    async def load():
+        teams = (await db.scalars(paginate(select(Team), [Team.id], skip, limit, cursor))).all()
+        return [schemas.TeamOut.from_orm(team) for team in teams], next_cursor_headers(teams, [Team.id], limit)
+
+    return await cached_json_response("teams", f"list:{skip}:{limit}:{cursor}", load)
 
 @router.put("/teams/{team_id}", response_model=schemas.TeamOut)
-def update_team(team_id: int, team: schemas.TeamCreate, db: Session = Depends(get_db)):
-    db_team = db.query(Team).filter(Team.id == team_id).first()
+async def update_team(team_id: int, team: schemas.TeamCreate, db: AsyncSession = Depends(get_db)):
+    db_team = await db.get(Team, team_id)
     if not db_team:
         raise HTTPException(status_code=404, detail="Team not found")
     for key, value in team.dict().items():
         setattr(db_team, key, value)
-    db.commit()
-    db.refresh(db_team)
+    await db.commit()
+    await cache.invalidate("teams")
+    await db.refresh(db_team)
     return db_team
 
 @router.delete("/teams/{team_id}")
-def delete_team(team_id: int, db: Session = Depends(get_db)):
-    db_team = db.query(Team).filter(Team.id == team_id).first()
+async def delete_team(team_id: int, db: AsyncSession = Depends(get_db)):
+    db_team = await db.get(Team, team_id)
     if not db_team:
         raise HTTPException(status_code=404, detail="Team not found")
-    db.delete(db_team)
-    db.commit()
+    # tasks.team_id is a plain foreign key: with foreign keys enforced the delete would fail at commit.
+    if await db.scalar(select(Task.id).where(Task.team_id == team_id).limit(1)) is not None:
+        raise HTTPException(status_code=400, detail="Cannot delete Team with associated Tasks")
+    await db.delete(db_team)
+    await db.commit()
+    await cache.invalidate("teams")
     return {"message": "Team deleted successfully"}
@@ -0,0 +1,62 @@
+# app/api/pagination.py
+import base64
+import json
+from datetime import date
+from typing import Mapping, Optional, Sequence
+
+from fastapi import HTTPException, Response
+from sqlalchemy import and_, or_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+CURSOR_VALUE_TYPES = (int, float, str, type(None))
+
+
+def encode_cursor(values: Sequence) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, date) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    # Only what encode_cursor writes; a list or object would reach the query as a bind value.
+    if any(isinstance(value, bool) or not isinstance(value, CURSOR_VALUE_TYPES) for value in values):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def paginate(stmt, key_columns: Sequence, skip: int, limit: int, cursor: Optional[str]):
+    """Order stmt by key_columns and page it by cursor (keyset) or by skip (offset).
+
+    The keyset predicate (k1, k2) > (v1, v2) is spelled out as OR/AND so every
+    backend can walk the index instead of counting past skipped rows.
+    """
+    stmt = stmt.order_by(*key_columns)
+    if cursor:
+        values = decode_cursor(cursor, len(key_columns))
+        clauses = []
+        for index, column in enumerate(key_columns):
+            equal_prefix = [key_columns[i] == values[i] for i in range(index)]
+            clauses.append(and_(*equal_prefix, column > values[index]))
+        stmt = stmt.where(or_(*clauses))
+    else:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit)
+
+
+def next_cursor_headers(rows: Sequence, key_columns: Sequence, limit: int) -> dict:
+    """Headers pointing at the page after rows, if there may be one."""
+    if rows and len(rows) >= limit:
+        last = rows[-1]
+        values = [last[column.key] if isinstance(last, Mapping) else getattr(last, column.key) for column in key_columns]
+        return {NEXT_CURSOR_HEADER: encode_cursor(values)}
+    return {}
+
+
+def set_next_cursor(response: Response, rows: Sequence, key_columns: Sequence, limit: int) -> None:
+    response.headers.update(next_cursor_headers(rows, key_columns, limit))
@@ -0,0 +1,36 @@
+# app/api/responses.py
+"""Row projection and the opt-in fast JSON path for large list endpoints."""
+from typing import List, Type
+
+from fastapi import Response
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+
+
+def projection(model, schema: Type[BaseModel]) -> list:
+    """The model columns behind each field of schema, for select(*projection(...))."""
+    return [model.__table__.c[name] for name in schema.model_fields]
+
+
+async def fetch_dicts(db: AsyncSession, stmt) -> List[dict]:
+    """Run a column select and return plain dicts, without building ORM instances."""
+    return [dict(row) for row in (await db.execute(stmt)).mappings()]
+
+
+def projected_response(content, response: Response = None):
+    """Return projected content for the route's response_model, or encode it directly.
+
+    With FAST_JSON_RESPONSES the content is dumped with orjson and returned
+    as a Response, so FastAPI skips validating it; headers already set on
+    the injected response are carried over.
+    """
+    if not settings.FAST_JSON_RESPONSES:
+        return content
+    import orjson
+
+    fast = Response(content=orjson.dumps(content), media_type="application/json")
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+    return fast
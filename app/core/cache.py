@@ -0,0 +1,139 @@
+# app/core/cache.py
+"""Read-through cache for reference data responses.
+
+Entries are the already-serialized JSON body (plus a few response headers),
+so a hit goes straight to the socket without touching the ORM or Pydantic.
+Each namespace ("teams", "phases", ...) has a generation number; the write
+handlers bump it, which orphans every entry of that namespace at once.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Hashable, Optional, Tuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class MemoryCache:
+    """In-process LRU with a per-entry TTL. Each worker process has its own copy."""
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._generations = {}
+
+    async def get(self, namespace: str, key: str) -> Tuple[Optional[bytes], Hashable]:
+        full_key = (namespace, self._generations.get(namespace, 0), key)
+        entry = self._entries.get(full_key)
+        if entry is None:
+            return None, full_key
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[full_key]
+            return None, full_key
+        self._entries.move_to_end(full_key)
+        return value, full_key
+
+    async def set(self, full_key: Hashable, value: bytes) -> None:
+        self._entries[full_key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(full_key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def invalidate(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisCache:
+    """Shared cache for multi-worker deployments. Redis errors degrade to cache misses."""
+
+    def __init__(self, url: str, ttl: int):
+        import redis.asyncio as redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl = ttl
+
+    async def _key(self, namespace: str, key: str) -> str:
+        generation = await self.client.get(f"cache:gen:{namespace}")
+        return f"cache:{namespace}:{int(generation or 0)}:{key}"
+
+    async def get(self, namespace: str, key: str) -> Tuple[Optional[bytes], Hashable]:
+        try:
+            full_key = await self._key(namespace, key)
+            return await self.client.get(full_key), full_key
+        except Exception:
+            logger.warning("Cache read failed for %s:%s", namespace, key, exc_info=True)
+            return None, None  # without the generation there is nothing safe to write back
+
+    async def set(self, full_key: Hashable, value: bytes) -> None:
+        if full_key is None:
+            return
+        try:
+            await self.client.set(full_key, value, ex=self.ttl)
+        except Exception:
+            logger.warning("Cache write failed for %s", full_key, exc_info=True)
+
+    async def invalidate(self, namespace: str) -> None:
+        try:
+            await self.client.incr(f"cache:gen:{namespace}")
+        except Exception:
+            logger.warning("Cache invalidation failed for %s", namespace, exc_info=True)
+
+
+class NullCache:
+    async def get(self, namespace: str, key: str) -> Tuple[Optional[bytes], Hashable]:
+        return None, None
+
+    async def set(self, full_key: Hashable, value: bytes) -> None:
+        pass
+
+    async def invalidate(self, namespace: str) -> None:
+        pass
+
+
+def _create_cache():
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCache(settings.CACHE_REDIS_URL, settings.CACHE_TTL_SECONDS)
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+    return NullCache()
+
+
+cache = _create_cache()
+
+
+def _encode_entry(body: bytes, headers: dict) -> bytes:
+    return json.dumps(headers).encode() + b"\n" + body
+
+
+def _decode_entry(entry: bytes) -> Tuple[bytes, dict]:
+    headers, _, body = entry.partition(b"\n")
+    return body, json.loads(headers)
+
+
+async def cached_json_response(
+    namespace: str,
+    key: str,
+    load: Callable[[], Awaitable[Tuple[object, dict]]],
+) -> Response:
+    """Serve namespace/key from the cache, or call load() and cache its JSON.
+
+    load returns (content, headers); content must already be in response
+    schema form (e.g. a list of TeamOut), headers are replayed on hits.
+    """
+    entry, full_key = await cache.get(namespace, key)
+    if entry is None:
+        content, headers = await load()
+        entry = _encode_entry(json.dumps(jsonable_encoder(content)).encode(), headers)
+        # Keyed by the generation seen before load(): if a write invalidated the
+        # namespace meanwhile, this entry is already orphaned.
+        await cache.set(full_key, entry)
+    body, headers = _decode_entry(entry)
+    return Response(content=body, media_type="application/json", headers=headers)
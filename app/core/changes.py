@@ -0,0 +1,144 @@
+# app/core/changes.py
+"""Change feed: compact events about committed writes, fanned out per project.
+
+Write paths call record_change() inside their transaction; the handler calls
+publish_changes() after the commit, so subscribers never hear about work that
+was rolled back. An event is {"entity", "op", "id", "fields"} and each commit
+is delivered as one list of events to every subscriber of the project.
+"""
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Iterable, List, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "pending_changes"
+
+
+def resync_events(project_id: int) -> List[dict]:
+    """Sent instead of events that could not be delivered; clients refetch everything."""
+    return [{"entity": "project", "op": "resync", "id": project_id}]
+
+
+class MemoryBroadcaster:
+    """In-process fan-out. Each subscriber has a bounded queue of event lists."""
+
+    def __init__(self, queue_size: int):
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+
+    @asynccontextmanager
+    async def subscribe(self, project_id: int):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[project_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[project_id].discard(queue)
+            if not self._subscribers[project_id]:
+                del self._subscribers[project_id]
+
+    async def publish(self, project_id: int, events: List[dict]) -> None:
+        self.deliver(project_id, events)
+
+    def deliver(self, project_id: int, events: List[dict]) -> None:
+        for queue in list(self._subscribers.get(project_id, ())):
+            try:
+                queue.put_nowait(events)
+            except asyncio.QueueFull:
+                # A subscriber that cannot keep up loses its backlog and refetches.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(resync_events(project_id))
+
+    def resync_all(self) -> None:
+        for project_id in list(self._subscribers):
+            self.deliver(project_id, resync_events(project_id))
+
+
+class RedisBroadcaster:
+    """Redis pub/sub for multi-worker deployments.
+
+    Every worker publishes to changes:<project_id> and runs one pattern
+    subscription that feeds its local subscribers. If Redis is unavailable,
+    events still reach the subscribers of the publishing worker.
+    """
+
+    def __init__(self, url: str, queue_size: int):
+        import redis.asyncio as redis
+
+        self.client = redis.Redis.from_url(url)
+        self.local = MemoryBroadcaster(queue_size)
+        self._listener = None
+
+    def subscribe(self, project_id: int):
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+        return self.local.subscribe(project_id)
+
+    async def publish(self, project_id: int, events: List[dict]) -> None:
+        try:
+            await self.client.publish(f"changes:{project_id}", json.dumps(events))
+        except Exception:
+            logger.warning("Change feed publish failed for project %s", project_id, exc_info=True)
+            self.local.deliver(project_id, events)
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.psubscribe("changes:*")
+                    async for message in pubsub.listen():
+                        if message["type"] != "pmessage":
+                            continue
+                        project_id = int(message["channel"].rsplit(b":", 1)[1])
+                        self.local.deliver(project_id, json.loads(message["data"]))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Change feed subscription lost; retrying", exc_info=True)
+                self.local.resync_all()  # whatever was published meanwhile is gone
+                await asyncio.sleep(1)
+
+
+class NullBroadcaster:
+    async def publish(self, project_id: int, events: List[dict]) -> None:
+        pass
+
+
+def _create_broadcaster():
+    if settings.CHANGE_FEED_BACKEND == "redis":
+        return RedisBroadcaster(settings.CHANGE_FEED_REDIS_URL, settings.CHANGE_FEED_QUEUE_SIZE)
+    if settings.CHANGE_FEED_BACKEND == "memory":
+        return MemoryBroadcaster(settings.CHANGE_FEED_QUEUE_SIZE)
+    return NullBroadcaster()
+
+
+broadcaster = _create_broadcaster()
+
+
+def changed_fields(obj, values: dict) -> List[str]:
+    """Names of the attributes of obj that values would change."""
+    return sorted(key for key, value in values.items() if getattr(obj, key) != value)
+
+
+def record_change(db, entity: str, op: str, entity_id: int, project_id: int, fields: Iterable[str] = ()) -> None:
+    """Queue an event on the (sync or async) session; publish_changes sends it after commit."""
+    event = {"entity": entity, "op": op, "id": entity_id}
+    if fields:
+        event["fields"] = sorted(fields)
+    db.info.setdefault(PENDING_KEY, []).append((project_id, event))
+
+
+async def publish_changes(db) -> None:
+    """Send the events recorded on db since the last publish, one message per project."""
+    by_project = defaultdict(list)
+    for project_id, event in db.info.pop(PENDING_KEY, []):
+        by_project[project_id].append(event)
+    for project_id, events in by_project.items():
+        await broadcaster.publish(project_id, events)
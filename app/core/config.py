@@ -1,5 +1,69 @@
+import os
+
+
+def _env_bool(name: str, default: bool) -> bool:
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
 class Settings:
     PROJECT_NAME: str = 'Migration Tracker'
     VERSION: str = '0.1.0'
 
+    DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite:///./test.db")
+
+    # Connection pool (server databases; SQLite connections are cheap and local)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: int = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = _env_bool("DB_POOL_PRE_PING", True)
+
+    # SQLite PRAGMAs applied on every new connection
+    SQLITE_JOURNAL_MODE: str = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS: str = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    SQLITE_MMAP_SIZE: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB: int = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+    # Enforce foreign keys (and their ON DELETE CASCADE) like Postgres does
+    SQLITE_FOREIGN_KEYS: bool = _env_bool("SQLITE_FOREIGN_KEYS", True)
+
+    # Background jobs (Celery). CELERY_TASK_ALWAYS_EAGER runs jobs inline with
+    # an in-memory broker, which is what tests and single-process setups use.
+    CELERY_TASK_ALWAYS_EAGER: bool = _env_bool("CELERY_TASK_ALWAYS_EAGER", False)
+    CELERY_BROKER_URL: str = os.getenv(
+        "CELERY_BROKER_URL", "memory://" if CELERY_TASK_ALWAYS_EAGER else "redis://localhost:6379/0"
+    )
+    CELERY_RESULT_BACKEND: str = os.getenv(
+        "CELERY_RESULT_BACKEND", "cache+memory://" if CELERY_TASK_ALWAYS_EAGER else "redis://localhost:6379/1"
+    )
+    JOB_STORAGE_DIR: str = os.getenv("JOB_STORAGE_DIR", "./job_files")
+
+    # DELETE /projects/{id}: projects with more tasks than this are deleted by a
+    # background job, in chunks of PROJECT_DELETE_CHUNK_SIZE tasks per transaction
+    PROJECT_DELETE_ASYNC_THRESHOLD: int = int(os.getenv("PROJECT_DELETE_ASYNC_THRESHOLD", "20000"))
+    PROJECT_DELETE_CHUNK_SIZE: int = int(os.getenv("PROJECT_DELETE_CHUNK_SIZE", "5000"))
+
+    # Reference-data response cache: "memory" (per process), "redis" or "none"
+    CACHE_BACKEND: str = os.getenv("CACHE_BACKEND", "memory")
+    CACHE_TTL_SECONDS: int = int(os.getenv("CACHE_TTL_SECONDS", "300"))
+    CACHE_MAX_ENTRIES: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    CACHE_REDIS_URL: str = os.getenv("CACHE_REDIS_URL", "redis://localhost:6379/2")
+
+    # Large list endpoints: rows are projected straight from SQL into dicts. With
+    # FAST_JSON_RESPONSES they are also encoded with orjson, skipping response
+    # model validation (the rows already have the response schema's columns).
+    FAST_JSON_RESPONSES: bool = _env_bool("FAST_JSON_RESPONSES", False)
+
+    # Request/SQL instrumentation served at /metrics (Prometheus text format)
+    METRICS_ENABLED: bool = _env_bool("METRICS_ENABLED", True)
+    SERVER_TIMING_HEADER: bool = _env_bool("SERVER_TIMING_HEADER", True)
+    SLOW_QUERY_MS: float = float(os.getenv("SLOW_QUERY_MS", "200"))
+
+    # Change feed pushed to dashboards over SSE/WebSocket: "memory" (per
+    # process), "redis" (pub/sub shared by all workers) or "none" (disabled)
+    CHANGE_FEED_BACKEND: str = os.getenv("CHANGE_FEED_BACKEND", "memory")
+    CHANGE_FEED_REDIS_URL: str = os.getenv("CHANGE_FEED_REDIS_URL", "redis://localhost:6379/3")
+    CHANGE_FEED_QUEUE_SIZE: int = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "100"))
+    CHANGE_FEED_HEARTBEAT_SECONDS: float = float(os.getenv("CHANGE_FEED_HEARTBEAT_SECONDS", "15"))
+
 settings = Settings()
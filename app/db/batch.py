@@ -0,0 +1,277 @@
+# app/db/batch.py
+"""Mixed create/update/delete batches for tasks and task buckets.
+
+A batch is validated as a whole first: every referenced id is checked with
+one IN query per table. If any operation is invalid nothing is written and
+the caller gets the per-item errors. Otherwise the whole batch is applied
+with bulk statements in the caller's transaction; the caller commits. A
+batch that still fails while it is applied (a bucket that gained tasks
+since validation) also comes back with errors, and the caller must not
+commit it.
+"""
+from typing import Dict, List
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.core.changes import record_change
+from app.db import schemas
+from app.db.rollups import apply_rollup_delta
+from app.db.snapshots import insert_snapshots
+from app.db.versions import ALL_TASKS, bucket_tasks_key, bump_versions
+from app.models import ProjectPhase, Subsystem, Task, TaskBucket, TaskDailyRollup, TaskStatusSnapshot, Team
+
+TASK_REQUIRED_FIELDS = tuple(name for name, field in schemas.TaskCreate.model_fields.items() if field.is_required())
+TASK_STATE_FIELDS = ("task_bucket_id", "team_id", "subsystem_id", "start_date", "end_date", "status_by_day")
+BUCKET_REQUIRED_FIELDS = ("name", "order", "phase_id")
+
+
+def _existing_ids(db: Session, column, ids) -> set:
+    ids = {value for value in ids if value is not None}
+    if not ids:
+        return set()
+    return set(db.scalars(select(column).where(column.in_(ids))))
+
+
+def _batch_result(operations, errors: Dict[int, str], ids: Dict[int, int]) -> schemas.BatchResult:
+    results = []
+    for index, operation in enumerate(operations):
+        detail = errors.get(index)
+        results.append(schemas.BatchItemResult(
+            index=index,
+            op=operation.op,
+            id=ids.get(index, getattr(operation, "id", None)),
+            status="error" if detail else "ok",
+            detail=detail,
+        ))
+    return schemas.BatchResult(applied=not errors, results=results)
+
+
+def _duplicate_target_errors(operations) -> Dict[int, str]:
+    """A row may be the target of one update or delete per batch."""
+    seen = set()
+    errors = {}
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            continue
+        if operation.id in seen:
+            errors[index] = f"Id {operation.id} is targeted by more than one operation"
+        seen.add(operation.id)
+    return errors
+
+
+# ------------------ TASKS ------------------
+def apply_task_batch(db: Session, operations: List) -> schemas.BatchResult:
+    target_ids = [operation.id for operation in operations if operation.op != "create"]
+    payloads = [operation.data.dict(exclude_unset=True) for operation in operations if operation.op != "delete"]
+
+    existing = {
+        row["id"]: dict(row)
+        for row in db.execute(select(*Task.__table__.c).where(Task.id.in_(target_ids))).mappings()
+    } if target_ids else {}
+    bucket_ids = {payload.get("task_bucket_id") for payload in payloads} - {None}
+    bucket_ids |= {task["task_bucket_id"] for task in existing.values()}
+    buckets = {
+        row.id: row
+        for row in db.execute(
+            select(TaskBucket.id, TaskBucket.phase_id, TaskBucket.project_id).where(TaskBucket.id.in_(bucket_ids))
+        )
+    } if bucket_ids else {}
+    team_ids = _existing_ids(db, Team.id, (payload.get("team_id") for payload in payloads))
+    subsystem_ids = _existing_ids(db, Subsystem.id, (payload.get("subsystem_id") for payload in payloads))
+
+    errors = _duplicate_target_errors(operations)
+    for index, operation in enumerate(operations):
+        if index in errors:
+            continue
+        if operation.op != "create" and operation.id not in existing:
+            errors[index] = "Task not found"
+            continue
+        if operation.op == "delete":
+            continue
+        payload = operation.data.dict(exclude_unset=True)
+        nulls = [field for field in TASK_REQUIRED_FIELDS if field in payload and payload[field] is None]
+        if nulls:
+            errors[index] = f"Field(s) cannot be null: {', '.join(nulls)}"
+        elif "task_bucket_id" in payload and payload["task_bucket_id"] not in buckets:
+            errors[index] = "TaskBucket does not exist"
+        elif "team_id" in payload and payload["team_id"] not in team_ids:
+            errors[index] = "Team does not exist"
+        elif "subsystem_id" in payload and payload["subsystem_id"] not in subsystem_ids:
+            errors[index] = "Subsystem does not exist"
+    if errors:
+        return _batch_result(operations, errors, {})
+
+    def state(task: dict) -> dict:
+        bucket = buckets[task["task_bucket_id"]]
+        return {
+            **{field: task[field] for field in TASK_STATE_FIELDS},
+            "project_id": bucket.project_id,
+            "phase_id": bucket.phase_id,
+        }
+
+    creates, updates, delete_ids = [], [], []
+    old_states, new_states = [], []
+    restatused_ids = []
+    version_keys = {ALL_TASKS}
+    created_indexes = []
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            mapping = operation.data.dict()
+            mapping["project_id"] = buckets[mapping["task_bucket_id"]].project_id
+            mapping["status_by_day"] = mapping["status_by_day"] or {}
+            creates.append(mapping)
+            created_indexes.append(index)
+            new_states.append(state(mapping))
+            version_keys.add(bucket_tasks_key(mapping["task_bucket_id"]))
+            continue
+
+        task = existing[operation.id]
+        old_states.append(state(task))
+        version_keys.add(bucket_tasks_key(task["task_bucket_id"]))
+        if operation.op == "delete":
+            delete_ids.append(operation.id)
+            continue
+
+        changes = operation.data.dict(exclude_unset=True)
+        if "task_bucket_id" in changes:
+            changes["project_id"] = buckets[changes["task_bucket_id"]].project_id
+            version_keys.add(bucket_tasks_key(changes["task_bucket_id"]))
+        if "status_by_day" in changes:
+            changes["status_by_day"] = changes["status_by_day"] or {}
+            restatused_ids.append(operation.id)
+        updates.append({"id": operation.id, **changes})
+        new_states.append(state({**task, **changes}))
+
+    if creates:
+        db.bulk_insert_mappings(Task, creates, return_defaults=True)
+        insert_snapshots(db, creates)
+    if updates:
+        db.bulk_update_mappings(Task, updates)
+    if restatused_ids:
+        db.query(TaskStatusSnapshot).filter(TaskStatusSnapshot.task_id.in_(restatused_ids)).delete(
+            synchronize_session=False
+        )
+        insert_snapshots(db, [update for update in updates if "status_by_day" in update])
+    if delete_ids:
+        # Their snapshots go with them (ON DELETE CASCADE).
+        db.query(Task).filter(Task.id.in_(delete_ids)).delete(synchronize_session=False)
+    apply_rollup_delta(db, old_states=old_states, new_states=new_states)
+    bump_versions(db, version_keys)
+
+    for mapping in creates:
+        record_change(db, "task", "created", mapping["id"], mapping["project_id"])
+    for update in updates:
+        old_project_id = existing[update["id"]]["project_id"]
+        fields = [field for field in update if field != "id"]
+        for project_id in {old_project_id, update.get("project_id", old_project_id)}:
+            record_change(db, "task", "updated", update["id"], project_id, fields)
+    for task_id in delete_ids:
+        record_change(db, "task", "deleted", task_id, existing[task_id]["project_id"])
+
+    created_ids = {index: mapping["id"] for index, mapping in zip(created_indexes, creates)}
+    return _batch_result(operations, {}, created_ids)
+
+
+# ------------------ TASK BUCKETS ------------------
+def follow_bucket_move(db: Session, bucket_id: int, phase_id: int, project_id: int) -> None:
+    """Point the tasks and rollup rows of a bucket moved to another phase at its new phase/project."""
+    db.query(Task).filter(Task.task_bucket_id == bucket_id).update(
+        {Task.project_id: project_id}, synchronize_session=False
+    )
+    db.query(TaskDailyRollup).filter(TaskDailyRollup.task_bucket_id == bucket_id).update(
+        {TaskDailyRollup.phase_id: phase_id, TaskDailyRollup.project_id: project_id},
+        synchronize_session=False,
+    )
+
+
+def apply_task_bucket_batch(db: Session, operations: List) -> schemas.BatchResult:
+    target_ids = [operation.id for operation in operations if operation.op != "create"]
+    payloads = [operation.data.dict(exclude_unset=True) for operation in operations if operation.op != "delete"]
+
+    existing = {
+        row.id: row
+        for row in db.execute(
+            select(TaskBucket.id, TaskBucket.phase_id, TaskBucket.project_id).where(TaskBucket.id.in_(target_ids))
+        )
+    } if target_ids else {}
+    phase_ids = {payload.get("phase_id") for payload in payloads} - {None}
+    phases = dict(db.execute(
+        select(ProjectPhase.id, ProjectPhase.project_id).where(ProjectPhase.id.in_(phase_ids))
+    ).all()) if phase_ids else {}
+    delete_ids = [operation.id for operation in operations if operation.op == "delete"]
+    task_counts = dict(db.execute(
+        select(Task.task_bucket_id, func.count()).where(Task.task_bucket_id.in_(delete_ids)).group_by(Task.task_bucket_id)
+    ).all()) if delete_ids else {}
+
+    errors = _duplicate_target_errors(operations)
+    for index, operation in enumerate(operations):
+        if index in errors:
+            continue
+        if operation.op != "create" and operation.id not in existing:
+            errors[index] = "TaskBucket not found"
+            continue
+        if operation.op == "delete":
+            if task_counts.get(operation.id):
+                errors[index] = "Cannot delete TaskBucket with associated Tasks"
+            continue
+        payload = operation.data.dict(exclude_unset=True)
+        nulls = [field for field in BUCKET_REQUIRED_FIELDS if field in payload and payload[field] is None]
+        if nulls:
+            errors[index] = f"Field(s) cannot be null: {', '.join(nulls)}"
+        elif "phase_id" in payload and payload["phase_id"] not in phases:
+            errors[index] = "ProjectPhase does not exist"
+    if errors:
+        return _batch_result(operations, errors, {})
+
+    if delete_ids:
+        # Deletes go first and repeat the emptiness check in the same statement (as in
+        # DELETE /task-buckets/{id}), so a task added since task_counts is never cascaded away.
+        deleted = set(db.scalars(
+            delete(TaskBucket)
+            .where(TaskBucket.id.in_(delete_ids), ~select(Task.id).where(Task.task_bucket_id == TaskBucket.id).exists())
+            .returning(TaskBucket.id),
+            execution_options={"synchronize_session": False},
+        ))
+        errors = {
+            index: "Cannot delete TaskBucket with associated Tasks"
+            for index, operation in enumerate(operations)
+            if operation.op == "delete" and operation.id not in deleted
+        }
+        if errors:
+            return _batch_result(operations, errors, {})
+        bump_versions(db, [ALL_TASKS] + [bucket_tasks_key(bucket_id) for bucket_id in delete_ids])
+
+    creates, updates, moved = [], [], {}
+    created_indexes = []
+    for index, operation in enumerate(operations):
+        if operation.op == "create":
+            mapping = operation.data.dict()
+            creates.append({**mapping, "project_id": phases[mapping["phase_id"]]})
+            created_indexes.append(index)
+        elif operation.op == "update":
+            changes = operation.data.dict(exclude_unset=True)
+            if "phase_id" in changes and changes["phase_id"] != existing[operation.id].phase_id:
+                changes["project_id"] = phases[changes["phase_id"]]
+                moved[operation.id] = changes
+            updates.append({"id": operation.id, **changes})
+
+    if creates:
+        db.bulk_insert_mappings(TaskBucket, creates, return_defaults=True)
+    if updates:
+        db.bulk_update_mappings(TaskBucket, updates)
+    for bucket_id, changes in moved.items():
+        follow_bucket_move(db, bucket_id, changes["phase_id"], changes["project_id"])
+
+    for mapping in creates:
+        record_change(db, "task_bucket", "created", mapping["id"], mapping["project_id"])
+    for update in updates:
+        old_project_id = existing[update["id"]].project_id
+        fields = [field for field in update if field != "id"]
+        for project_id in {old_project_id, update.get("project_id", old_project_id)}:
+            record_change(db, "task_bucket", "updated", update["id"], project_id, fields)
+    for bucket_id in delete_ids:
+        record_change(db, "task_bucket", "deleted", bucket_id, existing[bucket_id].project_id)
+
+    created_ids = {index: mapping["id"] for index, mapping in zip(created_indexes, creates)}
+    return _batch_result(operations, {}, created_ids)
@@ -0,0 +1,108 @@
+# app/db/clone.py
+"""Copy a project's phase/bucket/task hierarchy with set-based INSERT ... SELECT.
+
+Each level is one statement. Phases and buckets record the row they were
+copied from in cloned_from_id, and the next level joins on it to find its
+new parent. No ids travel through Python, so the cost does not depend on
+the number of tasks. Task history is not copied: clones start with an
+empty status_by_day, and their rollups are derived from the source's (see
+_clone_rollups).
+"""
+from typing import Optional
+
+from sqlalchemy import JSON, and_, cast, func, insert, literal, select
+from sqlalchemy.orm import Session, aliased
+
+from app.models import Project, ProjectPhase, Task, TaskBucket, TaskDailyRollup
+
+
+def _shift_date(dialect: str, column, days: int):
+    if not days:
+        return column
+    if dialect == "postgresql":
+        return column + days
+    return func.date(column, f"{days:+d} days")
+
+
+def clone_project(db: Session, source_id: int, name: str, description: Optional[str], date_offset_days: int = 0) -> Project:
+    """Create project `name` as a copy of project source_id in the caller's transaction."""
+    dialect = db.get_bind().dialect.name
+    project = Project(name=name, description=description)
+    db.add(project)
+    db.flush()
+
+    db.execute(insert(ProjectPhase).from_select(
+        ["project_id", "label", "date", "order", "cloned_from_id"],
+        select(
+            literal(project.id), ProjectPhase.label, _shift_date(dialect, ProjectPhase.date, date_offset_days),
+            ProjectPhase.order, ProjectPhase.id,
+        ).where(ProjectPhase.project_id == source_id),
+    ))
+
+    new_phase = aliased(ProjectPhase)
+    db.execute(insert(TaskBucket).from_select(
+        ["project_id", "phase_id", "name", "order", "cloned_from_id"],
+        select(literal(project.id), new_phase.id, TaskBucket.name, TaskBucket.order, TaskBucket.id)
+        .join(new_phase, and_(new_phase.project_id == project.id, new_phase.cloned_from_id == TaskBucket.phase_id))
+        .where(TaskBucket.project_id == source_id),
+    ))
+
+    new_bucket = aliased(TaskBucket)
+    # A bare '{}' in a SELECT list is text to Postgres, which will not assign it to a json column.
+    empty_status = cast(literal("{}"), JSON) if dialect == "postgresql" else literal("{}")
+    db.execute(insert(Task).from_select(
+        [
+            "project_id", "task_bucket_id", "subsystem_id", "team_id", "vendor_system", "subject",
+            "description", "detailed_description", "start_date", "end_date", "status_by_day", "order",
+        ],
+        select(
+            literal(project.id), new_bucket.id, Task.subsystem_id, Task.team_id, Task.vendor_system, Task.subject,
+            Task.description, Task.detailed_description,
+            _shift_date(dialect, Task.start_date, date_offset_days), _shift_date(dialect, Task.end_date, date_offset_days),
+            empty_status, Task.order,
+        )
+        .join(new_bucket, and_(new_bucket.project_id == project.id, new_bucket.cloned_from_id == Task.task_bucket_id))
+        .where(Task.project_id == source_id),
+    ))
+
+    _clone_rollups(db, dialect, source_id, project.id, date_offset_days)
+    return project
+
+
+def _clone_rollups(db: Session, dialect: str, source_id: int, project_id: int, date_offset_days: int) -> None:
+    """Write the clone's task_daily_rollups from the source's, in one statement.
+
+    Nothing in a clone is done, so each task-day is pending, or overdue on the
+    task's end_date. Per slice and day the number of tasks is the source's
+    done + pending + overdue; overdue is the number of tasks ending that day.
+    """
+    ends = (
+        select(
+            Task.task_bucket_id, Task.team_id, Task.subsystem_id, Task.end_date, func.count().label("ending"),
+        )
+        .where(Task.project_id == source_id, Task.start_date <= Task.end_date)
+        .group_by(Task.task_bucket_id, Task.team_id, Task.subsystem_id, Task.end_date)
+        .subquery()
+    )
+    new_bucket = aliased(TaskBucket)
+    total = TaskDailyRollup.done_count + TaskDailyRollup.pending_count + TaskDailyRollup.overdue_count
+    overdue = func.coalesce(ends.c.ending, 0)
+    db.execute(insert(TaskDailyRollup).from_select(
+        ["project_id", "phase_id", "task_bucket_id", "team_id", "subsystem_id", "date",
+         "done_count", "pending_count", "overdue_count"],
+        select(
+            literal(project_id), new_bucket.phase_id, new_bucket.id, TaskDailyRollup.team_id,
+            TaskDailyRollup.subsystem_id, _shift_date(dialect, TaskDailyRollup.date, date_offset_days),
+            literal(0), total - overdue, overdue,
+        )
+        # Driven from the (few) new buckets into ix_task_daily_rollups_bucket_date.
+        .select_from(new_bucket)
+        .join(TaskDailyRollup, TaskDailyRollup.task_bucket_id == new_bucket.cloned_from_id)
+        .outerjoin(ends, and_(
+            ends.c.task_bucket_id == TaskDailyRollup.task_bucket_id,
+            ends.c.team_id.is_not_distinct_from(TaskDailyRollup.team_id),
+            ends.c.subsystem_id.is_not_distinct_from(TaskDailyRollup.subsystem_id),
+            ends.c.end_date == TaskDailyRollup.date,
+        ))
+        .where(new_bucket.project_id == project_id),
+    ))
@@ -0,0 +1,43 @@
+# app/db/deletes.py
+"""Deletes of whole projects and phases as single statements.
+
+Every foreign key below a project is ON DELETE CASCADE (migration
+0c7e4f9a2b61), and the ORM relationships are passive_deletes, so removing
+the parent row lets the database remove phases, buckets, tasks, snapshots,
+rollups and search entries without any of them being loaded. Python only
+collects the bucket ids whose task-list ETags have to change.
+"""
+from typing import List
+
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from app.db.versions import ALL_TASKS, bucket_tasks_key, bump_versions, project_phases_key
+from app.models import Project, ProjectPhase, Task, TaskBucket
+
+# The deleted rows are never read back, so the session need not fetch their ids.
+_NO_SYNC = {"synchronize_session": False}
+
+
+def _bump_for_buckets(db: Session, bucket_ids: List[int], project_id: int) -> None:
+    bump_versions(db, [ALL_TASKS, project_phases_key(project_id), *map(bucket_tasks_key, bucket_ids)])
+
+
+def delete_project_rows(db: Session, project_id: int) -> None:
+    """Delete the project and everything under it in the caller's transaction."""
+    bucket_ids = db.scalars(select(TaskBucket.id).where(TaskBucket.project_id == project_id)).all()
+    db.execute(delete(Project).where(Project.id == project_id), execution_options=_NO_SYNC)
+    _bump_for_buckets(db, bucket_ids, project_id)
+
+
+def delete_phase_rows(db: Session, phase_id: int, project_id: int) -> None:
+    """Delete the phase with its buckets and their tasks in the caller's transaction."""
+    bucket_ids = db.scalars(select(TaskBucket.id).where(TaskBucket.phase_id == phase_id)).all()
+    db.execute(delete(ProjectPhase).where(ProjectPhase.id == phase_id), execution_options=_NO_SYNC)
+    _bump_for_buckets(db, bucket_ids, project_id)
+
+
+def delete_project_tasks_chunk(db: Session, project_id: int, limit: int) -> int:
+    """Delete up to limit of the project's tasks (and their snapshots); returns how many went."""
+    chunk = select(Task.id).where(Task.project_id == project_id).limit(limit).scalar_subquery()
+    return db.execute(delete(Task).where(Task.id.in_(chunk)), execution_options=_NO_SYNC).rowcount
@@ -1,7 +1,11 @@
-
 from app.db.database import engine
 from app.models import *
 from app.db.database import Base
 
 def init_db():
+    """Create all tables directly, for throwaway databases (tests, benchmarks).
+
+    Real deployments manage the schema with `alembic upgrade head`; the app
+    never calls this on startup.
+    """
     Base.metadata.create_all(bind=engine)
@@ -0,0 +1,98 @@
+# app/db/ordering.py
+"""Sparse ordering keys for tasks, task buckets and phases.
+
+Siblings are numbered ORDER_STEP apart, so moving an item between two others
+only rewrites the moved row (it takes the midpoint). When a gap is used up
+the siblings are renumbered: inline if the move cannot be placed at all,
+otherwise in a background job once a gap drops below ORDER_MIN_GAP.
+"""
+from typing import Literal
+
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.db.versions import bucket_tasks_key, bump_versions, project_phases_key
+from app.models import ProjectPhase, Task, TaskBucket
+
+ORDER_STEP = 1024
+ORDER_MIN_GAP = 8
+
+# scope -> (model, parent column, version key of the sibling list)
+ORDER_SCOPES = {
+    "tasks": (Task, Task.task_bucket_id, bucket_tasks_key),
+    "task_buckets": (TaskBucket, TaskBucket.phase_id, None),
+    "phases": (ProjectPhase, ProjectPhase.project_id, project_phases_key),
+}
+
+
+def next_order(scope: str, parent_id: int):
+    """Scalar subquery for the order of an item appended to its siblings."""
+    model, parent, _ = ORDER_SCOPES[scope]
+    return select(func.coalesce(func.max(model.order), 0) + ORDER_STEP).where(parent == parent_id).scalar_subquery()
+
+
+def _bump_siblings(db: Session, scope: str, parent_id: int) -> None:
+    version_key = ORDER_SCOPES[scope][2]
+    if version_key:
+        bump_versions(db, [version_key(parent_id)])
+
+
+def rebalance_siblings(db: Session, scope: str, parent_id: int) -> int:
+    """Renumber the siblings under parent_id ORDER_STEP apart, keeping their order."""
+    model, parent, _ = ORDER_SCOPES[scope]
+    ids = db.scalars(select(model.id).where(parent == parent_id).order_by(model.order, model.id)).all()
+    db.bulk_update_mappings(model, [{"id": item_id, "order": index * ORDER_STEP} for index, item_id in enumerate(ids, start=1)])
+    _bump_siblings(db, scope, parent_id)
+    return len(ids)
+
+
+def _neighbor_order(db: Session, scope: str, item, target, position: Literal["before", "after"]):
+    """Order of the sibling on the far side of target, ignoring the item being moved."""
+    model, parent, _ = ORDER_SCOPES[scope]
+    if position == "before":
+        beyond = or_(model.order < target.order, and_(model.order == target.order, model.id < target.id))
+        ordering = (model.order.desc(), model.id.desc())
+    else:
+        beyond = or_(model.order > target.order, and_(model.order == target.order, model.id > target.id))
+        ordering = (model.order, model.id)
+    return db.scalar(
+        select(model.order)
+        .where(parent == getattr(target, parent.key), model.id != item.id, beyond)
+        .order_by(*ordering)
+        .limit(1)
+    )
+
+
+def move_item(db: Session, scope: str, item, target, position: Literal["before", "after"]) -> bool:
+    """Place item right before or after target (a sibling) by writing item.order.
+
+    Returns True when the remaining gap is small enough that the siblings
+    should be rebalanced in the background.
+    """
+    parent_id = getattr(target, ORDER_SCOPES[scope][1].key)
+    for attempt in range(2):
+        neighbor = _neighbor_order(db, scope, item, target, position)
+        low, high = (neighbor, target.order) if position == "before" else (target.order, neighbor)
+        if low is None:
+            new_order = high - ORDER_STEP
+        elif high is None:
+            new_order = low + ORDER_STEP
+        elif high - low >= 2:
+            new_order = (low + high) // 2
+        elif attempt == 0:
+            # No room between the two neighbours (or legacy 1, 2, 3 numbering): renumber now.
+            rebalance_siblings(db, scope, parent_id)
+            db.expire(target)
+            continue
+        else:
+            raise RuntimeError("Siblings still have no gap after rebalancing")
+        break
+
+    item.order = new_order
+    _bump_siblings(db, scope, parent_id)
+    gaps = []
+    if low is not None:
+        gaps.append(new_order - low)
+    if high is not None:
+        gaps.append(high - new_order)
+    return min(gaps) < ORDER_MIN_GAP
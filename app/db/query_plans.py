@@ -0,0 +1,133 @@
+# app/db/query_plans.py
+"""Check that the hot read paths are served by indexes.
+
+Run ``python -m app.db.query_plans`` (in-memory SQLite built from the models)
+or ``python -m app.db.query_plans --database-url <url>`` against a migrated
+database. The exit status is 1 if any statement falls back to a full scan.
+
+The statements come from the same builders the endpoints execute. Each one is
+run against a probe project (inserted in a transaction that is rolled back)
+and every SQL statement it emits, selectin loads included, is explained.
+"""
+import argparse
+import sys
+from datetime import date
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.phases import phases_by_project_statement
+from app.api.endpoints.projects import burndown_statement, project_tree_statement
+from app.api.endpoints.task_buckets import buckets_by_phase_statement
+from app.api.endpoints.tasks import daily_summary_statement, task_list_statement, tasks_by_bucket_statement
+from app.db.database import Base
+from app.db.task_export import export_statement
+from app.db.task_query import task_group_statement, task_query_conditions
+from app.models import Project, ProjectPhase, Task, TaskBucket
+
+DAY = date(2025, 1, 15)
+
+
+def _probe_rows(session: Session) -> dict:
+    """One project -> phase -> bucket -> task chain, so selectin loads emit their queries."""
+    project = Project(name="query plans probe")
+    phase = ProjectPhase(project=project, date=DAY, order=1)
+    bucket = TaskBucket(phase=phase, project=project, name="probe", order=1)
+    task = Task(bucket=bucket, project=project, subject="probe", description="probe",
+                start_date=DAY, end_date=DAY, status_by_day={}, order=1)
+    session.add_all([project, phase, bucket, task])
+    session.flush()
+    return {"project": project.id, "phase": phase.id, "bucket": bucket.id}
+
+
+def hot_statements(ids: dict) -> dict:
+    """The statements behind the endpoints dashboards poll, keyed by endpoint."""
+    project_id, phase_id, bucket_id = ids["project"], ids["phase"], ids["bucket"]
+    return {
+        "GET /tasks/by-bucket/{id}": tasks_by_bucket_statement(bucket_id),
+        "GET /task-buckets/by-phase/{id}": buckets_by_phase_statement(phase_id),
+        "GET /phases/by-project/{id}": phases_by_project_statement(project_id),
+        "GET /daily-summary/": daily_summary_statement(DAY),
+        "GET /daily-summary/?view=ids": daily_summary_statement(DAY, "ids"),
+        "GET /daily-summary/?view=counts&team_id": daily_summary_statement(DAY, "counts", team_id=1),
+        "GET /daily-summary/?view=counts&subsystem_id": daily_summary_statement(DAY, "counts", subsystem_id=1),
+        "GET /tasks/export?project_id": export_statement(project_id=project_id),
+        "GET /projects/{id}/burndown": burndown_statement(project_id),
+        "GET /projects/{id}/tree": project_tree_statement(project_id),
+        "GET /tasks/query?phase_id&status": task_list_statement(task_query_conditions(
+            phase_id=[phase_id], status=["pending"], status_date=DAY
+        )),
+        "GET /tasks/query?team_id&group_by=status": task_group_statement(
+            task_query_conditions(team_id=[1], start_date=DAY, end_date=DAY), ["status"], DAY
+        ),
+    }
+
+
+def emitted_sql(session: Session, stmt) -> list:
+    """Run stmt and return the (sql, parameters) of every statement it sent."""
+    connection = session.connection()
+    emitted = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        emitted.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        session.execute(stmt).all()
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+    return emitted
+
+
+def full_scans(connection, sql: str, parameters=()) -> list:
+    """Return the plan lines that read a whole table."""
+    if connection.dialect.name == "sqlite":
+        plan = [row[-1] for row in connection.exec_driver_sql("EXPLAIN QUERY PLAN " + sql, parameters)]
+        return [line for line in plan if line.startswith("SCAN") and "INDEX" not in line]
+    if connection.dialect.name == "postgresql":
+        # Small tables are always cheaper to scan; ask whether an index path exists.
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        plan = [row[0] for row in connection.exec_driver_sql("EXPLAIN " + sql, parameters)]
+        return [line.strip() for line in plan if "Seq Scan" in line]
+    raise RuntimeError(f"Unsupported dialect: {connection.dialect.name}")
+
+
+def check(database_url: str = None) -> tuple:
+    """Return (number of statements checked, endpoint -> full-scan plan lines)."""
+    engine = create_engine(database_url or "sqlite://")
+    if database_url is None:
+        Base.metadata.create_all(bind=engine)
+    failures = {}
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        session = Session(bind=connection)
+        try:
+            statements = hot_statements(_probe_rows(session))
+            for name, stmt in statements.items():
+                scans = [
+                    line
+                    for sql, parameters in emitted_sql(session, stmt)
+                    for line in full_scans(connection, sql, parameters)
+                ]
+                if scans:
+                    failures[name] = scans
+        finally:
+            session.close()
+            transaction.rollback()
+    return len(statements), failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", help="migrated database to check instead of the model metadata")
+    args = parser.parse_args()
+
+    total, failures = check(args.database_url)
+    for name, scans in failures.items():
+        print(f"FULL SCAN  {name}: {'; '.join(scans)}")
+    print(f"{total - len(failures)}/{total} hot statements use indexes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+# app/db/rollups.py
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.db.snapshots import DONE_STATUS
+from app.models import Task, TaskBucket, TaskDailyRollup
+from app.models.task_rollup import SLICE_KEY
+
+# (project_id, phase_id, task_bucket_id, team_id, subsystem_id, date)
+RollupKey = Tuple[int, int, int, Optional[int], Optional[int], date]
+KEY_COLUMNS = ("project_id", "phase_id", "task_bucket_id", "team_id", "subsystem_id", "date")
+COUNT_COLUMNS = ("done_count", "pending_count", "overdue_count")
+UPSERT_CHUNK_SIZE = 500  # rows per INSERT; keeps SQLite under its bound-parameter limit
+
+
+def task_state(db: Session, task: Task) -> dict:
+    """Capture the fields of a task that determine its rollup contribution."""
+    phase_id, project_id = db.query(TaskBucket.phase_id, TaskBucket.project_id).filter(
+        TaskBucket.id == task.task_bucket_id
+    ).one()
+    return {
+        "project_id": project_id,
+        "phase_id": phase_id,
+        "task_bucket_id": task.task_bucket_id,
+        "team_id": task.team_id,
+        "subsystem_id": task.subsystem_id,
+        "start_date": task.start_date,
+        "end_date": task.end_date,
+        "status_by_day": dict(task.status_by_day or {}),
+    }
+
+
+def task_contribution(state: dict) -> Dict[RollupKey, list]:
+    """Return {rollup key: [done, pending, overdue]} for one task state."""
+    start, end = state["start_date"], state["end_date"]
+    if start is None or end is None or end < start:
+        return {}
+    statuses = {day: str(status).strip().lower() for day, status in (state["status_by_day"] or {}).items()}
+    dims = tuple(state[column] for column in KEY_COLUMNS[:-1])
+
+    contribution = {}
+    day = start
+    while day <= end:
+        contribution[dims + (day,)] = _day_counts(day, end, statuses.get(day.isoformat()))
+        day += timedelta(days=1)
+    return contribution
+
+
+def _day_counts(day: date, end: date, status: Optional[str]) -> list:
+    if status == DONE_STATUS:
+        return [1, 0, 0]
+    if day == end:
+        return [0, 0, 1]
+    return [0, 1, 0]
+
+
+def apply_rollup_delta(db: Session, old_states: Iterable[dict] = (), new_states: Iterable[dict] = ()) -> None:
+    """Subtract the old task states and add the new ones to task_daily_rollups.
+
+    All affected slices are written by one upsert per UPSERT_CHUNK_SIZE keys,
+    so a chunk of imported tasks costs about as many statements as one task.
+    """
+    delta = defaultdict(lambda: [0, 0, 0])
+    for sign, states in ((-1, old_states), (1, new_states)):
+        for state in states:
+            for key, counts in task_contribution(state).items():
+                totals = delta[key]
+                for index, count in enumerate(counts):
+                    totals[index] += sign * count
+    _write_rollup_delta(db, delta)
+
+
+def apply_day_status_deltas(db: Session, changes: Iterable[Tuple[dict, date, Optional[str], Optional[str]]]) -> None:
+    """Move single task-days between done and pending/overdue after their status changed.
+
+    changes holds (state, day, old_status, new_status); state needs the rollup
+    dimensions plus start_date and end_date, statuses are the normalized
+    snapshot values. Days outside the task's date range count for nothing.
+    """
+    delta = defaultdict(lambda: [0, 0, 0])
+    for state, day, old_status, new_status in changes:
+        start, end = state["start_date"], state["end_date"]
+        if start is None or end is None or not start <= day <= end:
+            continue
+        totals = delta[tuple(state[column] for column in KEY_COLUMNS[:-1]) + (day,)]
+        for index, (old, new) in enumerate(zip(_day_counts(day, end, old_status), _day_counts(day, end, new_status))):
+            totals[index] += new - old
+    _write_rollup_delta(db, delta)
+
+
+def _write_rollup_delta(db: Session, delta: Dict[RollupKey, list]) -> None:
+    """Add per-key count deltas to task_daily_rollups, creating and dropping rows as needed.
+
+    The addition happens in the database: INSERT ... ON CONFLICT on the slice
+    index with count = count + excluded.count. Concurrent writers to the same
+    slice therefore neither lose increments nor insert duplicate rows.
+    """
+    delta = {key: counts for key, counts in delta.items() if any(counts)}
+    if not delta:
+        return
+
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    # Fixed key order, so concurrent writers lock rows consistently (None sorts first).
+    rows = [
+        {**dict(zip(KEY_COLUMNS, key)), **dict(zip(COUNT_COLUMNS, counts))}
+        for key, counts in sorted(delta.items(), key=lambda item: tuple((v is not None, v) for v in item[0]))
+    ]
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        stmt = dialect.insert(TaskDailyRollup).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=list(SLICE_KEY),
+            set_={column: getattr(TaskDailyRollup, column) + getattr(stmt.excluded, column) for column in COUNT_COLUMNS},
+        ))
+
+    days = [key[-1] for key in delta]
+    db.query(TaskDailyRollup).filter(
+        TaskDailyRollup.project_id.in_({key[0] for key in delta}),
+        TaskDailyRollup.task_bucket_id.in_({key[2] for key in delta}),
+        TaskDailyRollup.date >= min(days),
+        TaskDailyRollup.date <= max(days),
+        *(getattr(TaskDailyRollup, column) == 0 for column in COUNT_COLUMNS),
+    ).delete(synchronize_session=False)
+
+
+def rebuild_project_rollup(db: Session, project_id: int) -> None:
+    """Recompute every rollup row of a project from its tasks."""
+    db.query(TaskDailyRollup).filter(TaskDailyRollup.project_id == project_id).delete(synchronize_session=False)
+    rows = db.query(
+        Task.task_bucket_id, Task.team_id, Task.subsystem_id, Task.start_date, Task.end_date,
+        Task.status_by_day, TaskBucket.phase_id, TaskBucket.project_id,
+    ).join(TaskBucket, Task.task_bucket_id == TaskBucket.id).filter(TaskBucket.project_id == project_id)
+    states = (
+        {
+            "project_id": row.project_id,
+            "phase_id": row.phase_id,
+            "task_bucket_id": row.task_bucket_id,
+            "team_id": row.team_id,
+            "subsystem_id": row.subsystem_id,
+            "start_date": row.start_date,
+            "end_date": row.end_date,
+            "status_by_day": row.status_by_day,
+        }
+        for row in rows
+    )
+    apply_rollup_delta(db, new_states=states)
@@ -1,7 +1,7 @@
 # app/db/schemas.py
-from pydantic import BaseModel
-from typing import Optional, List, Dict
-from datetime import date
+from pydantic import BaseModel, Field
+from typing import Optional, List, Dict, Any, Literal, Union, Annotated
+from datetime import date, datetime
 
 # ------------------ TASK BUCKET ------------------
 class TaskBucketBase(BaseModel):
@@ -49,6 +49,18 @@ class TaskOut(TaskBase):
     class Config:
         from_attributes = True
 
+class TaskSearchHit(TaskOut):
+    rank: float  # lower is more relevant
+
+class TaskImportError(BaseModel):
+    row: int
+    detail: str
+
+class TaskImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[TaskImportError] = []
+
 # ------------------ TEAM ------------------
 class TeamBase(BaseModel):
     name: str
@@ -106,8 +118,36 @@ class DailySummary(BaseModel):
     date: date
     subsystem_id: Optional[int] = None
     team_id: Optional[int] = None
-    completed_tasks: List[TaskOut]
-    pending_tasks: List[TaskOut]
+    completed_count: Optional[int] = None
+    pending_count: Optional[int] = None
+    completed_tasks: Optional[List[TaskOut]] = None
+    pending_tasks: Optional[List[TaskOut]] = None
+    completed_ids: Optional[List[int]] = None
+    pending_ids: Optional[List[int]] = None
+
+class DailyRollupRow(BaseModel):
+    group_id: Optional[int] = None
+    completed_count: int
+    pending_count: int
+
+# ------------------ TASK QUERY ------------------
+TaskGroupBy = Literal["project", "phase", "bucket", "team", "subsystem", "vendor_system", "status"]
+
+class TaskQueryGroup(BaseModel):
+    # Only the group_by dimensions of the request are present
+    project_id: Optional[int] = None
+    phase_id: Optional[int] = None
+    task_bucket_id: Optional[int] = None
+    team_id: Optional[int] = None
+    subsystem_id: Optional[int] = None
+    vendor_system: Optional[str] = None
+    status: Optional[str] = None
+    count: int
+    done_count: Optional[int] = None
+
+class TaskQueryResult(BaseModel):
+    tasks: Optional[List[TaskOut]] = None
+    groups: Optional[List[TaskQueryGroup]] = None
 
 
 # ------------------ PROJECT SUMMARY ------------------
@@ -122,3 +162,133 @@ class ProjectOut(ProjectBase):
 
     class Config:
         from_attributes = True
+
+class ProjectClone(ProjectBase):
+    description: Optional[str] = None
+    date_offset_days: int = 0  # added to every phase and task date
+
+class BurndownPoint(BaseModel):
+    date: date
+    done_count: int
+    pending_count: int
+    overdue_count: int
+
+# ------------------ PROJECT TREE ------------------
+class TaskBucketTreeOut(TaskBucketOut):
+    tasks: List[TaskOut] = []
+
+class ProjectPhaseTreeOut(ProjectPhaseOut):
+    task_buckets: List[TaskBucketTreeOut] = []
+
+class ProjectTreeOut(ProjectOut):
+    phases: List[ProjectPhaseTreeOut] = []
+
+# ------------------ JOBS ------------------
+class ExportJobCreate(BaseModel):
+    format: Literal["ndjson", "csv", "xlsx"] = "csv"
+    project_id: Optional[int] = None
+    task_bucket_id: Optional[int] = None
+    subsystem_id: Optional[int] = None
+    team_id: Optional[int] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+
+class RollupRebuildJobCreate(BaseModel):
+    project_id: Optional[int] = None
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    progress: int
+    processed: int
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
+
+# ------------------ BATCH OPERATIONS ------------------
+BATCH_MAX_OPERATIONS = 1000
+
+class BatchItemResult(BaseModel):
+    index: int
+    op: Literal["create", "update", "delete"]
+    id: Optional[int] = None
+    status: Literal["ok", "error"]
+    detail: Optional[str] = None
+
+class BatchResult(BaseModel):
+    applied: bool
+    results: List[BatchItemResult]
+
+class TaskPatch(BaseModel):
+    task_bucket_id: Optional[int] = None
+    subsystem_id: Optional[int] = None
+    team_id: Optional[int] = None
+    vendor_system: Optional[str] = None
+    subject: Optional[str] = None
+    description: Optional[str] = None
+    detailed_description: Optional[str] = None
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    status_by_day: Optional[Dict[str, str]] = None
+    order: Optional[int] = None
+
+class TaskBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TaskCreate
+
+class TaskBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TaskPatch  # only the fields present in the payload are written
+
+class TaskBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+class TaskBatchRequest(BaseModel):
+    operations: List[Annotated[
+        Union[TaskBatchCreate, TaskBatchUpdate, TaskBatchDelete], Field(discriminator="op")
+    ]] = Field(..., min_length=1, max_length=BATCH_MAX_OPERATIONS)
+
+class TaskBucketBatchCreate(BaseModel):
+    op: Literal["create"]
+    data: TaskBucketCreate
+
+class TaskBucketBatchUpdate(BaseModel):
+    op: Literal["update"]
+    id: int
+    data: TaskBucketUpdate  # only the fields present in the payload are written
+
+class TaskBucketBatchDelete(BaseModel):
+    op: Literal["delete"]
+    id: int
+
+class TaskBucketBatchRequest(BaseModel):
+    operations: List[Annotated[
+        Union[TaskBucketBatchCreate, TaskBucketBatchUpdate, TaskBucketBatchDelete], Field(discriminator="op")
+    ]] = Field(..., min_length=1, max_length=BATCH_MAX_OPERATIONS)
+
+# ------------------ REORDER ------------------
+class ReorderRequest(BaseModel):
+    position: Literal["before", "after"]
+    target_id: int  # sibling to place the item next to
+
+# ------------------ DAY STATUS ------------------
+class TaskStatusPatch(BaseModel):
+    status: Optional[str] = None  # null clears the day
+
+class TaskStatusChange(BaseModel):
+    task_id: int
+    date: date
+    status: Optional[str] = None  # null clears the day
+
+class TaskStatusBulkPatch(BaseModel):
+    changes: List[TaskStatusChange] = Field(..., min_length=1, max_length=BATCH_MAX_OPERATIONS)
+
+class TaskStatusBulkResult(BaseModel):
+    updated: int
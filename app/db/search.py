@@ -0,0 +1,44 @@
+# app/db/search.py
+"""Ranked keyword search over tasks, on the index defined in app/models/task.py.
+
+The user's text is reduced to word tokens, each matched as a prefix, all of
+them required. Free text therefore never reaches the FTS5 / tsquery parsers
+as syntax, and "sap ord" finds "SAP orders". The rank is lower-is-better on
+both backends (FTS5's convention), so it can lead the (rank, id) keyset.
+"""
+import re
+from typing import List
+
+from sqlalchemy import Float, cast, column, func, literal_column, select, table
+
+from app.models import Task
+
+MAX_SEARCH_TERMS = 16
+
+# bm25 weights, in the column order of the FTS5 table (see SEARCH_COLUMNS)
+SQLITE_WEIGHTS = (10.0, 4.0, 1.0, 4.0)
+
+_tasks_fts = table("tasks_fts", column("rowid"))
+_search_vector = literal_column("tasks.search_vector")
+
+
+def search_terms(text: str) -> List[str]:
+    return re.findall(r"\w+", text.lower())[:MAX_SEARCH_TERMS]
+
+
+def search_statement(dialect: str, terms: List[str], columns: list):
+    """select(*columns, rank) restricted to tasks matching every term; the caller orders and pages it."""
+    if dialect == "postgresql":
+        query = func.to_tsquery("simple", " & ".join(f"{term}:*" for term in terms))
+        # ts_rank_cd is float4; as double the value survives the cursor round trip exactly.
+        rank = (-cast(func.ts_rank_cd(_search_vector, query), Float)).label("rank")
+        return select(*columns, rank).where(_search_vector.op("@@")(query))
+
+    match = " ".join(f'"{term}"*' for term in terms)
+    rank = func.bm25(literal_column("tasks_fts"), *SQLITE_WEIGHTS).label("rank")
+    return (
+        select(*columns, rank)
+        .select_from(Task)
+        .join(_tasks_fts, _tasks_fts.c.rowid == Task.id)
+        .where(literal_column("tasks_fts").op("MATCH")(match))
+    )
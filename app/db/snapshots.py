@@ -0,0 +1,45 @@
+# app/db/snapshots.py
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import TaskStatusSnapshot
+
+DONE_STATUS = "done"
+# Not stored: a task without a snapshot row for a day is pending that day.
+PENDING_STATUS = "pending"
+
+
+def snapshot_rows(task_id: int, status_by_day: Optional[Dict[str, str]]) -> List[dict]:
+    """Turn a status_by_day mapping into task_snapshots rows.
+
+    Keys that are not ISO dates cannot be indexed by day and are skipped;
+    they stay available in the JSON column.
+    """
+    rows = []
+    for day, status in (status_by_day or {}).items():
+        try:
+            snapshot_date = date.fromisoformat(str(day))
+        except ValueError:
+            continue
+        if status is None:
+            continue
+        rows.append({"task_id": task_id, "date": snapshot_date, "status": str(status).strip().lower()})
+    return rows
+
+
+def insert_snapshots(db: Session, tasks: Iterable[dict]) -> None:
+    """Bulk insert snapshot rows for freshly created tasks (dicts with id and status_by_day)."""
+    rows = []
+    for task in tasks:
+        rows.extend(snapshot_rows(task["id"], task.get("status_by_day")))
+    if rows:
+        db.bulk_insert_mappings(TaskStatusSnapshot, rows)
+
+
+def replace_task_snapshots(db: Session, task_id: int, status_by_day: Optional[Dict[str, str]]) -> None:
+    """Rewrite the snapshot rows of one task after its status_by_day changed."""
+    db.query(TaskStatusSnapshot).filter(TaskStatusSnapshot.task_id == task_id).delete(synchronize_session=False)
+    insert_snapshots(db, [{"id": task_id, "status_by_day": status_by_day}])
+
@@ -0,0 +1,138 @@
+# app/db/task_export.py
+import csv
+import json
+from datetime import date
+from io import StringIO
+from tempfile import TemporaryFile
+from typing import BinaryIO, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import Task
+
+EXPORT_BATCH_SIZE = 1000
+EXPORT_COLUMNS = (
+    Task.id, Task.project_id, Task.task_bucket_id, Task.subsystem_id, Task.team_id,
+    Task.vendor_system, Task.subject, Task.description, Task.detailed_description,
+    Task.start_date, Task.end_date, Task.order, Task.status_by_day,
+)
+EXPORT_HEADER = [column.key for column in EXPORT_COLUMNS]
+
+
+def export_statement(
+    project_id: Optional[int] = None,
+    task_bucket_id: Optional[int] = None,
+    subsystem_id: Optional[int] = None,
+    team_id: Optional[int] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+):
+    stmt = select(*EXPORT_COLUMNS).order_by(Task.id)
+    if project_id:
+        stmt = stmt.where(Task.project_id == project_id)
+    if task_bucket_id:
+        stmt = stmt.where(Task.task_bucket_id == task_bucket_id)
+    if subsystem_id:
+        stmt = stmt.where(Task.subsystem_id == subsystem_id)
+    if team_id:
+        stmt = stmt.where(Task.team_id == team_id)
+    if start_date:
+        stmt = stmt.where(Task.end_date >= start_date)
+    if end_date:
+        stmt = stmt.where(Task.start_date <= end_date)
+    return stmt.execution_options(yield_per=EXPORT_BATCH_SIZE)
+
+
+def _cell(value):
+    if isinstance(value, dict):
+        return json.dumps(value)
+    return value
+
+
+# Encoders turn row batches into output chunks: start(), encode(rows) per
+# batch, then finish() for anything that can only be written at the end.
+class NdjsonEncoder:
+    media_type = "application/x-ndjson"
+
+    def start(self):
+        return ""
+
+    def encode(self, rows):
+        return "".join(json.dumps(dict(row._mapping), default=str) + "\n" for row in rows)
+
+    def finish(self):
+        return iter(())
+
+
+class CsvEncoder:
+    media_type = "text/csv"
+
+    def __init__(self):
+        self.buffer = StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _drain(self):
+        chunk = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return chunk
+
+    def start(self):
+        self.writer.writerow(EXPORT_HEADER)
+        return self._drain()
+
+    def encode(self, rows):
+        self.writer.writerows([_cell(value) for value in row] for row in rows)
+        return self._drain()
+
+    def finish(self):
+        return iter(())
+
+
+class XlsxEncoder:
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+    def __init__(self):
+        from openpyxl import Workbook
+
+        # write_only workbooks spool rows to disk, so memory stays flat here too.
+        self.workbook = Workbook(write_only=True)
+        self.sheet = self.workbook.create_sheet("Tasks")
+
+    def start(self):
+        self.sheet.append(EXPORT_HEADER)
+        return b""
+
+    def encode(self, rows):
+        for row in rows:
+            self.sheet.append([_cell(value) for value in row])
+        return b""
+
+    def finish(self):
+        with TemporaryFile() as output:
+            self.workbook.save(output)
+            output.seek(0)
+            while chunk := output.read(64 * 1024):
+                yield chunk
+
+
+EXPORT_ENCODERS = {"ndjson": NdjsonEncoder, "csv": CsvEncoder, "xlsx": XlsxEncoder}
+
+
+def write_task_export(db: Session, stmt, export_format: str, output: BinaryIO) -> int:
+    """Write a full export to a binary file with the sync engine; returns the row count."""
+    encoder = EXPORT_ENCODERS[export_format]()
+    row_count = 0
+
+    def write(chunk):
+        if chunk:
+            output.write(chunk.encode() if isinstance(chunk, str) else chunk)
+
+    write(encoder.start())
+    for rows in db.execute(stmt).partitions():
+        write(encoder.encode(rows))
+        row_count += len(rows)
+    for chunk in encoder.finish():
+        write(chunk)
+    return row_count
@@ -0,0 +1,164 @@
+# app/db/task_import.py
+import json
+from datetime import datetime
+from typing import BinaryIO, Callable, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.db import schemas
+from app.db.rollups import apply_rollup_delta
+from app.db.snapshots import insert_snapshots
+from app.db.versions import ALL_TASKS, bucket_tasks_key, bump_versions
+from app.models import Subsystem, Task, TaskBucket, Team
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_EXTENSIONS = (".csv", ".xlsx")
+
+
+def is_supported_import(filename: Optional[str]) -> bool:
+    return (filename or "").lower().endswith(IMPORT_EXTENSIONS)
+
+
+def _iter_import_rows(fileobj: BinaryIO, filename: str, chunk_size: int):
+    """Yield (row_number, row_dict) chunks from a .csv or .xlsx file."""
+    if filename.lower().endswith(".csv"):
+        import pandas as pd  # heavy; only the import path needs it
+
+        reader = pd.read_csv(fileobj, chunksize=chunk_size, dtype=str, keep_default_na=False)
+        row_number = 2  # row 1 is the header
+        for frame in reader:
+            chunk = []
+            for record in frame.to_dict(orient="records"):
+                chunk.append((row_number, record))
+                row_number += 1
+            yield chunk
+    else:
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+            chunk = []
+            for row_number, values in enumerate(rows, start=2):
+                if all(value is None for value in values):
+                    continue
+                chunk.append((row_number, dict(zip(header, values))))
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+        finally:
+            workbook.close()
+
+
+def _load_import_lookups(db: Session):
+    """Preload name -> id maps so rows never trigger per-row lookups."""
+    buckets_by_name = {}
+    bucket_projects = {}
+    bucket_phases = {}
+    for bucket_id, name, project_id, phase_id in db.query(
+        TaskBucket.id, TaskBucket.name, TaskBucket.project_id, TaskBucket.phase_id
+    ):
+        buckets_by_name.setdefault(name, []).append(bucket_id)
+        bucket_projects[bucket_id] = project_id
+        bucket_phases[bucket_id] = phase_id
+    return {
+        "buckets": buckets_by_name,
+        "bucket_projects": bucket_projects,
+        "bucket_phases": bucket_phases,
+        "subsystems": dict(db.query(Subsystem.name, Subsystem.id)),
+        "teams": dict(db.query(Team.name, Team.id)),
+    }
+
+
+def _resolve_import_row(record: dict, lookups: dict) -> dict:
+    data = {}
+    for key, value in record.items():
+        key = str(key).strip()
+        if isinstance(value, str):
+            value = value.strip()
+        if value == "" or value is None:
+            continue
+        if isinstance(value, datetime):
+            value = value.date()
+        data[key] = value
+
+    bucket_name = data.pop("bucket", None) or data.pop("task_bucket", None)
+    if "task_bucket_id" not in data and bucket_name is not None:
+        bucket_ids = lookups["buckets"].get(str(bucket_name), [])
+        if not bucket_ids:
+            raise ValueError(f"TaskBucket '{bucket_name}' does not exist")
+        if len(bucket_ids) > 1:
+            raise ValueError(f"TaskBucket name '{bucket_name}' is ambiguous, use task_bucket_id")
+        data["task_bucket_id"] = bucket_ids[0]
+
+    for field, table in (("subsystem", "subsystems"), ("team", "teams")):
+        name = data.pop(field, None)
+        if f"{field}_id" not in data and name is not None:
+            if str(name) not in lookups[table]:
+                raise ValueError(f"{field.capitalize()} '{name}' does not exist")
+            data[f"{field}_id"] = lookups[table][str(name)]
+
+    if isinstance(data.get("status_by_day"), str):
+        data["status_by_day"] = json.loads(data["status_by_day"])
+
+    task = schemas.TaskCreate(**data)
+    project_id = lookups["bucket_projects"].get(task.task_bucket_id)
+    if project_id is None:
+        raise ValueError("TaskBucket does not exist")
+    return {**task.dict(), "status_by_day": task.status_by_day or {}, "project_id": project_id}
+
+
+def run_task_import(
+    db: Session,
+    fileobj: BinaryIO,
+    filename: str,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> schemas.TaskImportResult:
+    """Validate and insert every row of a plan file, one transaction per chunk.
+
+    on_progress(processed_rows, inserted_rows) is called after each chunk.
+    """
+    lookups = _load_import_lookups(db)
+    inserted = 0
+    processed = 0
+    errors = []
+
+    for chunk in _iter_import_rows(fileobj, filename, IMPORT_CHUNK_SIZE):
+        mappings = []
+        mapped_rows = []
+        for row_number, record in chunk:
+            try:
+                mappings.append(_resolve_import_row(record, lookups))
+                mapped_rows.append(row_number)
+            except ValidationError as exc:
+                detail = "; ".join(
+                    f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in exc.errors()
+                )
+                errors.append(schemas.TaskImportError(row=row_number, detail=detail))
+            except ValueError as exc:
+                errors.append(schemas.TaskImportError(row=row_number, detail=str(exc)))
+
+        processed += len(chunk)
+        if mappings:
+            try:
+                db.bulk_insert_mappings(Task, mappings, return_defaults=True)
+                insert_snapshots(db, mappings)
+                apply_rollup_delta(db, new_states=[
+                    {**mapping, "phase_id": lookups["bucket_phases"][mapping["task_bucket_id"]]} for mapping in mappings
+                ])
+                bump_versions(db, [ALL_TASKS] + [bucket_tasks_key(mapping["task_bucket_id"]) for mapping in mappings])
+                db.commit()
+                inserted += len(mappings)
+            except SQLAlchemyError as exc:
+                db.rollback()
+                detail = f"Chunk rejected by database: {exc.__class__.__name__}"
+                errors.extend(schemas.TaskImportError(row=row, detail=detail) for row in mapped_rows)
+        if on_progress:
+            on_progress(processed, inserted)
+
+    return schemas.TaskImportResult(inserted=inserted, failed=len(errors), errors=errors)
@@ -0,0 +1,111 @@
+# app/db/task_query.py
+"""Filters and group-by aggregates for GET /tasks/query, built as single statements.
+
+Every filter is a plain predicate on tasks or an IN (subquery) against an
+indexed table: phases resolve through task_buckets (phase_id, order) and
+per-day statuses through task_snapshots (date, status, task_id), so neither
+the status_by_day JSON nor ORM rows are ever touched.
+"""
+from datetime import date
+from typing import List, Optional, Sequence
+
+from sqlalchemy import and_, case, func, literal, or_, select
+
+from app.db.snapshots import DONE_STATUS, PENDING_STATUS
+from app.models import Task, TaskBucket, TaskStatusSnapshot
+
+# group_by value -> (output key, column)
+GROUP_COLUMNS = {
+    "project": ("project_id", Task.project_id),
+    "phase": ("phase_id", TaskBucket.phase_id),
+    "bucket": ("task_bucket_id", Task.task_bucket_id),
+    "team": ("team_id", Task.team_id),
+    "subsystem": ("subsystem_id", Task.subsystem_id),
+    "vendor_system": ("vendor_system", Task.vendor_system),
+    # Tasks without an entry for the day are pending, as in the daily summary.
+    "status": ("status", func.coalesce(TaskStatusSnapshot.status, literal(PENDING_STATUS))),
+}
+
+
+def _tasks_with_status(status_date: date, statuses: Sequence[str]):
+    return select(TaskStatusSnapshot.task_id).where(
+        TaskStatusSnapshot.date == status_date,
+        TaskStatusSnapshot.status.in_(statuses),
+    )
+
+
+def _status_condition(status_date: date, statuses: Sequence[str]):
+    """Tasks with one of statuses on status_date.
+
+    "pending" means not done, as in the daily summary: no entry for the day,
+    or an entry with any status but done.
+    """
+    named = sorted(set(statuses) - {PENDING_STATUS})
+    if PENDING_STATUS not in statuses:
+        return Task.id.in_(_tasks_with_status(status_date, named))
+    pending = Task.id.not_in(_tasks_with_status(status_date, [DONE_STATUS]))
+    return or_(pending, Task.id.in_(_tasks_with_status(status_date, named))) if named else pending
+
+
+def task_query_conditions(
+    project_id: Optional[List[int]] = None,
+    phase_id: Optional[List[int]] = None,
+    task_bucket_id: Optional[List[int]] = None,
+    team_id: Optional[List[int]] = None,
+    subsystem_id: Optional[List[int]] = None,
+    vendor_system: Optional[List[str]] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    status: Optional[List[str]] = None,
+    done: Optional[bool] = None,
+    status_date: Optional[date] = None,
+) -> list:
+    """WHERE clauses for the given filters; list filters match any of their values.
+
+    start_date/end_date keep tasks whose window overlaps them. status and
+    done look at the status_by_day entry for status_date.
+    """
+    conditions = []
+    for column, values in (
+        (Task.project_id, project_id),
+        (Task.task_bucket_id, task_bucket_id),
+        (Task.team_id, team_id),
+        (Task.subsystem_id, subsystem_id),
+        (Task.vendor_system, vendor_system),
+    ):
+        if values:
+            conditions.append(column.in_(values))
+    if phase_id:
+        conditions.append(Task.task_bucket_id.in_(select(TaskBucket.id).where(TaskBucket.phase_id.in_(phase_id))))
+    if start_date:
+        conditions.append(Task.end_date >= start_date)
+    if end_date:
+        conditions.append(Task.start_date <= end_date)
+    if status:
+        conditions.append(_status_condition(status_date, [value.strip().lower() for value in status]))
+    if done is not None:
+        is_done = Task.id.in_(_tasks_with_status(status_date, [DONE_STATUS]))
+        conditions.append(is_done if done else ~is_done)
+    return conditions
+
+
+def task_group_statement(conditions: list, group_by: Sequence[str], status_date: Optional[date] = None):
+    """SELECT <group columns>, count[, done_count] ... GROUP BY, ordered by the group columns.
+
+    done_count (tasks done on status_date) is included when status_date is given.
+    """
+    columns = [GROUP_COLUMNS[name][1].label(GROUP_COLUMNS[name][0]) for name in group_by]
+    aggregates = [func.count(Task.id).label("count")]
+    if status_date:
+        is_done = Task.id.in_(_tasks_with_status(status_date, [DONE_STATUS]))
+        aggregates.append(func.coalesce(func.sum(case((is_done, 1), else_=0)), 0).label("done_count"))
+
+    stmt = select(*columns, *aggregates).select_from(Task)
+    if "phase" in group_by:
+        stmt = stmt.join(TaskBucket, TaskBucket.id == Task.task_bucket_id)
+    if "status" in group_by:
+        # Tasks without an entry for the day fall in the pending group.
+        stmt = stmt.outerjoin(TaskStatusSnapshot, and_(
+            TaskStatusSnapshot.task_id == Task.id, TaskStatusSnapshot.date == status_date
+        ))
+    return stmt.where(*conditions).group_by(*columns).order_by(*columns)
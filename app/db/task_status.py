@@ -0,0 +1,118 @@
+# app/db/task_status.py
+"""Set single status_by_day entries in place.
+
+Each change is one UPDATE that edits the JSON column inside the database
+(json_set / json_remove on SQLite, jsonb || / - on Postgres), so a daily
+tick neither sends nor rewrites the rest of the task, and two ticks on
+different days of the same task cannot overwrite each other. The matching
+snapshot upsert and rollup increments (app/db/rollups.py) are computed in
+SQL as well, so concurrent ticks on tasks of one slice keep every count.
+"""
+from collections import defaultdict
+from typing import List, Optional
+
+from sqlalchemy import JSON, case, cast, func, literal, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Session
+
+from app.core.changes import record_change
+from app.db import schemas
+from app.db.rollups import apply_day_status_deltas
+from app.db.snapshots import snapshot_rows
+from app.db.versions import ALL_TASKS, bucket_tasks_key, bump_versions
+from app.models import Task, TaskBucket, TaskStatusSnapshot
+
+
+def _set_day_expression(dialect: str, day: str, status: Optional[str]):
+    """SQL expression for status_by_day with one day set to status (or removed if None)."""
+    # Anything but an object (SQL NULL, a stored JSON null) starts from {}: jsonb || would
+    # otherwise build an array and json_set would leave a JSON null untouched.
+    if dialect == "postgresql":
+        stored = cast(Task.status_by_day, JSONB)
+        current = case((func.jsonb_typeof(stored) == "object", stored), else_=cast(literal("{}"), JSONB))
+        if status is None:
+            return cast(current.op("-")(literal(day)), JSON)
+        return cast(current.op("||")(func.jsonb_build_object(literal(day), literal(status))), JSON)
+    current = case((func.json_type(Task.status_by_day) == "object", Task.status_by_day), else_=literal("{}"))
+    path = f'$."{day}"'
+    if status is None:
+        return func.json_remove(current, path)
+    return func.json_set(current, path, status)
+
+
+def set_day_statuses(db: Session, changes: List[schemas.TaskStatusChange]) -> List[int]:
+    """Apply (task_id, date, status) changes in the caller's transaction; return the ids that exist.
+
+    The UPDATE takes the task row lock first, so the previous snapshot status
+    read afterwards is the one this change replaces.
+    """
+    dialect = db.get_bind().dialect.name
+    ids_by_value = defaultdict(list)
+    for change in changes:
+        ids_by_value[(change.date, change.status)].append(change.task_id)
+
+    tasks = {}
+    for (day, status), task_ids in ids_by_value.items():
+        stmt = (
+            update(Task)
+            .where(Task.id.in_(task_ids))
+            .values(status_by_day=_set_day_expression(dialect, day.isoformat(), status))
+            .returning(
+                Task.id, Task.task_bucket_id, Task.project_id, Task.team_id,
+                Task.subsystem_id, Task.start_date, Task.end_date,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        for row in db.execute(stmt):
+            tasks[row.id] = row
+    changes = [change for change in changes if change.task_id in tasks]
+    if not changes:
+        return []
+
+    old_statuses = {
+        (row.task_id, row.date): row.status
+        for row in db.execute(
+            select(TaskStatusSnapshot.task_id, TaskStatusSnapshot.date, TaskStatusSnapshot.status).where(
+                TaskStatusSnapshot.task_id.in_(tasks),
+                TaskStatusSnapshot.date.in_({change.date for change in changes}),
+            )
+        )
+    }
+
+    snapshots = []
+    cleared_by_day = defaultdict(list)
+    for change in changes:
+        rows = snapshot_rows(change.task_id, {change.date.isoformat(): change.status})
+        if rows:
+            snapshots.extend(rows)
+        else:
+            cleared_by_day[change.date].append(change.task_id)
+    if snapshots:
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert(TaskStatusSnapshot).values(snapshots)
+        db.execute(insert.on_conflict_do_update(
+            index_elements=[TaskStatusSnapshot.task_id, TaskStatusSnapshot.date],
+            set_={"status": insert.excluded.status},
+        ))
+    for day, task_ids in cleared_by_day.items():
+        db.query(TaskStatusSnapshot).filter(
+            TaskStatusSnapshot.date == day, TaskStatusSnapshot.task_id.in_(task_ids)
+        ).delete(synchronize_session=False)
+
+    new_statuses = {(row["task_id"], row["date"]): row["status"] for row in snapshots}
+    phases = dict(db.execute(
+        select(TaskBucket.id, TaskBucket.phase_id).where(TaskBucket.id.in_({row.task_bucket_id for row in tasks.values()}))
+    ).all())
+    apply_day_status_deltas(db, (
+        (
+            {**tasks[change.task_id]._asdict(), "phase_id": phases[tasks[change.task_id].task_bucket_id]},
+            change.date,
+            old_statuses.get((change.task_id, change.date)),
+            new_statuses.get((change.task_id, change.date)),
+        )
+        for change in changes
+    ))
+    bump_versions(db, [ALL_TASKS] + [bucket_tasks_key(row.task_bucket_id) for row in tasks.values()])
+    for row in tasks.values():
+        record_change(db, "task", "updated", row.id, row.project_id, ["status_by_day"])
+    return sorted(tasks)
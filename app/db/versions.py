@@ -0,0 +1,36 @@
+# app/db/versions.py
+from datetime import datetime
+from typing import Iterable
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.models import ResourceVersion
+
+ALL_TASKS = "tasks"
+
+
+def bucket_tasks_key(bucket_id: int) -> str:
+    return f"bucket-tasks:{bucket_id}"
+
+
+def project_phases_key(project_id: int) -> str:
+    return f"project-phases:{project_id}"
+
+
+def bump_versions(db: Session, keys: Iterable[str]) -> None:
+    """Increment the version of each key in the caller's transaction.
+
+    Uses INSERT ... ON CONFLICT so the first write to a key cannot race.
+    """
+    keys = sorted(set(keys))  # fixed order, so concurrent writers lock rows consistently
+    if not keys:
+        return
+    dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+    now = datetime.utcnow()
+    stmt = dialect.insert(ResourceVersion).values([{"key": key, "version": 1, "updated_at": now} for key in keys])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[ResourceVersion.key],
+        set_={"version": ResourceVersion.version + 1, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt)
@@ -0,0 +1,19 @@
+# app/jobs/celery_app.py
+# Start a worker with: celery -A app.jobs.celery_app worker --loglevel=info
+from celery import Celery
+from app.core.config import settings
+
+celery_app = Celery(
+    "migration_tracker",
+    broker=settings.CELERY_BROKER_URL,
+    backend=settings.CELERY_RESULT_BACKEND,
+    include=["app.jobs.tasks"],
+)
+celery_app.conf.update(
+    task_always_eager=settings.CELERY_TASK_ALWAYS_EAGER,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+)
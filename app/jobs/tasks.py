@@ -0,0 +1,202 @@
+# app/jobs/tasks.py
+import asyncio
+import logging
+import os
+from datetime import date
+from typing import Iterable
+
+import anyio
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache
+from app.core.changes import broadcaster, publish_changes, record_change
+from app.core.config import settings
+from app.db.database import SessionLocal
+from app.db.deletes import delete_project_rows, delete_project_tasks_chunk
+from app.db.ordering import rebalance_siblings
+from app.db.rollups import rebuild_project_rollup
+from app.db.task_export import export_statement, write_task_export
+from app.db.task_import import run_task_import
+from app.jobs.celery_app import celery_app
+from app.models import Job, Project
+
+logger = logging.getLogger(__name__)
+
+JOB_HANDLERS = {}
+
+
+def job_handler(kind: str):
+    def register(func):
+        JOB_HANDLERS[kind] = func
+        return func
+    return register
+
+
+def job_file_path(name: str) -> str:
+    os.makedirs(settings.JOB_STORAGE_DIR, exist_ok=True)
+    return os.path.join(settings.JOB_STORAGE_DIR, name)
+
+
+def _report_progress(db: Session, job: Job, processed: int, total: int = None):
+    job.processed = processed
+    if total:
+        job.progress = min(99, processed * 100 // total)
+    db.commit()
+
+
+def _notify_committed(db: Session, namespaces: Iterable[str]) -> None:
+    """Invalidate cache namespaces and publish db's recorded changes after a job committed.
+
+    Inline (eager) jobs run in a worker thread of the app and go back to its
+    event loop, which owns the cache and change-feed connections. A Celery
+    worker has no such loop, so it runs one for the call.
+    """
+    async def notify():
+        for namespace in namespaces:
+            await cache.invalidate(namespace)
+        await publish_changes(db)
+
+    async def notify_in_own_loop():
+        try:
+            await notify()
+        finally:
+            # Redis connections belong to the loop that opened them, and this one ends here.
+            for backend in (cache, broadcaster):
+                if hasattr(backend, "client"):
+                    await backend.client.connection_pool.disconnect()
+
+    try:
+        anyio.from_thread.run(notify)
+    except anyio.NoEventLoopError:
+        asyncio.run(notify_in_own_loop())
+
+
+@celery_app.task(name="jobs.run")
+def run_job(job_id: int):
+    """Run one queued job and record its outcome on the jobs row."""
+    db = SessionLocal()
+    try:
+        # Tasks are acked late, so a job can be delivered again; only the delivery
+        # that moves it out of "queued" runs it.
+        claimed = db.execute(
+            update(Job).where(Job.id == job_id, Job.status == "queued").values(status="running")
+        ).rowcount
+        db.commit()
+        if not claimed:
+            logger.warning("Job %s is gone or no longer queued; not running it", job_id)
+            return
+        job = db.get(Job, job_id)
+        try:
+            result = JOB_HANDLERS[job.kind](db, job)
+        except Exception as exc:
+            logger.exception("Job %s (%s) failed", job.id, job.kind)
+            db.rollback()
+            job.status = "failed"
+            job.error = str(exc)
+        else:
+            job.status = "succeeded"
+            job.progress = 100
+            job.result = result
+        db.commit()
+    finally:
+        db.close()
+
+
+@job_handler("import_tasks")
+def import_tasks_job(db: Session, job: Job) -> dict:
+    path = job.params["path"]
+    try:
+        with open(path, "rb") as fileobj:
+            result = run_task_import(
+                db, fileobj, job.params["filename"],
+                on_progress=lambda processed, inserted: _report_progress(db, job, processed),
+            )
+    finally:
+        os.remove(path)
+    return result.dict()
+
+
+@job_handler("export_tasks")
+def export_tasks_job(db: Session, job: Job) -> dict:
+    params = dict(job.params)
+    export_format = params.pop("format")
+    for key in ("start_date", "end_date"):
+        if params.get(key):
+            params[key] = date.fromisoformat(params[key])
+    filename = f"tasks-{job.id}.{export_format}"
+    with open(job_file_path(filename), "wb") as output:
+        rows = write_task_export(db, export_statement(**params), export_format, output)
+    job.processed = rows
+    return {"filename": filename, "rows": rows}
+
+
+@job_handler("rebuild_rollups")
+def rebuild_rollups_job(db: Session, job: Job) -> dict:
+    project_id = job.params.get("project_id")
+    if project_id:
+        project_ids = [project_id]
+    else:
+        project_ids = [row.id for row in db.query(Project.id).order_by(Project.id)]
+    for index, pid in enumerate(project_ids, start=1):
+        rebuild_project_rollup(db, pid)
+        _report_progress(db, job, index, len(project_ids))
+    return {"projects": len(project_ids)}
+
+
+@job_handler("rebalance_order")
+def rebalance_order_job(db: Session, job: Job) -> dict:
+    scope = job.params["scope"]
+    rows = rebalance_siblings(db, scope, job.params["parent_id"])
+    job.processed = rows
+    if scope == "phases":  # the only sibling lists that are cached
+        db.commit()
+        _notify_committed(db, ["phases"])
+    return {"rows": rows}
+
+
+@job_handler("delete_project")
+def delete_project_job(db: Session, job: Job) -> dict:
+    # Tasks go in short transactions so neither the database nor its readers wait on one huge delete;
+    # the final statement cascades whatever is left.
+    project_id = job.params["project_id"]
+    deleted = 0
+    while rows := delete_project_tasks_chunk(db, project_id, settings.PROJECT_DELETE_CHUNK_SIZE):
+        deleted += rows
+        _report_progress(db, job, deleted)
+    delete_project_rows(db, project_id)
+    record_change(db, "project", "deleted", project_id, project_id)
+    db.commit()
+    _notify_committed(db, ["projects", "phases"])
+    return {"project_id": project_id, "tasks": deleted}
+
+
+async def enqueue_job(db: AsyncSession, kind: str, params: dict) -> Job:
+    """Insert a queued job row, commit the caller's transaction and hand the job to Celery.
+
+    The caller's work is committed either way. If the broker cannot take the
+    job, it is marked failed rather than left queued forever.
+    """
+    db_job = Job(kind=kind, status="queued", progress=0, processed=0, params=params)
+    db.add(db_job)
+    await db.commit()
+    try:
+        # .delay talks to the broker (or runs the job inline in eager mode), so keep it off the event loop.
+        await run_in_threadpool(run_job.delay, db_job.id)
+    except Exception as exc:
+        logger.exception("Could not queue job %s (%s)", db_job.id, kind)
+        db_job.status = "failed"
+        db_job.error = f"Could not queue job: {exc}"
+        await db.commit()
+    await db.refresh(db_job)
+    return db_job
+
+
+async def enqueue_rebalance(db: AsyncSession, scope: str, parent_id: int) -> None:
+    """Commit the caller's move and rebalance its siblings in a job, or inline if no job can be queued."""
+    db_job = await enqueue_job(db, "rebalance_order", {"scope": scope, "parent_id": parent_id})
+    if db_job.status == "failed":
+        await db.run_sync(rebalance_siblings, scope, parent_id)
+        await db.commit()
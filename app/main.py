@@ -8,25 +8,20 @@ from app.api.endpoints.teams import router as teams_router
 from app.api.endpoints.subsystems import router as subsystems_router
 from app.api.endpoints.phases import router as phases_router
 from app.api.endpoints.projects import router as projects_router  # ← NEW
+from app.api.endpoints.jobs import router as jobs_router
+from app.api.endpoints.metrics import router as metrics_router
+from app.api.endpoints.changes import router as changes_router
 
-from app.db.database import Base, engine
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.core.config import settings
+from app.core.metrics import MetricsMiddleware, instrument_engine
+from app.db.database import engine, async_engine
 
-app = FastAPI()
+# The schema is owned by Alembic (`alembic upgrade head`); nothing here talks
+# to the database at import time, so a worker starts without DDL round-trips.
 
-# Enable CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Create DB tables
-Base.metadata.create_all(bind=engine)
 
 # Global error handler
-@app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
         status_code=500,
@@ -39,10 +34,41 @@ async def global_exception_handler(request: Request, exc: Exception):
         },
     )
 
-# Include routers
-app.include_router(projects_router)         # ← Added first for hierarchy
-app.include_router(phases_router)
-app.include_router(task_buckets_router)
-app.include_router(tasks_router)
-app.include_router(teams_router)
-app.include_router(subsystems_router)
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    # Enable CORS
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified", "Server-Timing"],
+    )
+
+    # Request timing and SQL instrumentation (added last, so it wraps CORS too)
+    if settings.METRICS_ENABLED:
+        instrument_engine(engine)
+        instrument_engine(async_engine.sync_engine)
+        app.add_middleware(MetricsMiddleware, server_timing=settings.SERVER_TIMING_HEADER)
+
+    app.add_exception_handler(Exception, global_exception_handler)
+
+    # Include routers
+    app.include_router(projects_router)         # ← Added first for hierarchy
+    app.include_router(phases_router)
+    app.include_router(task_buckets_router)
+    app.include_router(tasks_router)
+    app.include_router(teams_router)
+    app.include_router(subsystems_router)
+    app.include_router(jobs_router)
+    if settings.CHANGE_FEED_BACKEND != "none":
+        app.include_router(changes_router)
+    if settings.METRICS_ENABLED:
+        app.include_router(metrics_router)
+    return app
+
+
+app = create_app()
@@ -4,4 +4,7 @@ from .team import Team
 from .subsystem import Subsystem
 from .task import Task
 from .task_snapshot import TaskStatusSnapshot
-from .task_bucket import TaskBucket  # ✅ Add this line
\ No newline at end of file
+from .task_bucket import TaskBucket  # ✅ Add this line
+from .task_rollup import TaskDailyRollup
+from .job import Job
+from .resource_version import ResourceVersion
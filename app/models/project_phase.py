@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class ProjectPhase(Base):
     __tablename__ = "project_phases"
+    __table_args__ = (
+        Index("ix_project_phases_project_order", "project_id", "order"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    date = Column(Date)
+    label = Column(String)
     order = Column(Integer, nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    cloned_from_id = Column(Integer, nullable=True)  # source phase when created by a project clone
 
     project = relationship("Project", back_populates="phases")
+    task_buckets = relationship("TaskBucket", back_populates="phase", passive_deletes=True)
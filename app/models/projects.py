@@ -9,4 +9,6 @@ class Project(Base):
     name = Column(String, nullable=False, unique=True)
     description = Column(String, nullable=True)
 
-    phases = relationship("ProjectPhase", back_populates="project", cascade="all, delete")
+    phases = relationship("ProjectPhase", back_populates="project", cascade="all, delete", passive_deletes=True)
+    task_buckets = relationship("TaskBucket", back_populates="project", passive_deletes=True)
+    tasks = relationship("Task", back_populates="project", passive_deletes=True)
@@ -0,0 +1,11 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime
+from app.db.database import Base
+
+class ResourceVersion(Base):
+    """Change counter behind the ETag / Last-Modified of a polled resource."""
+    __tablename__ = "resource_versions"
+
+    key = Column(String, primary_key=True)  # e.g. "tasks", "bucket-tasks:12", "project-phases:3"
+    version = Column(Integer, nullable=False, default=1)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -1,23 +1,70 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, JSON, Index, DDL, event
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_bucket_order", "task_bucket_id", "order"),
+        Index("ix_tasks_project_id", "project_id"),
+        Index("ix_tasks_dates", "start_date", "end_date"),
+        Index("ix_tasks_team_dates", "team_id", "start_date", "end_date"),
+        Index("ix_tasks_subsystem_dates", "subsystem_id", "start_date", "end_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     subsystem_id = Column(Integer, ForeignKey("subsystems.id"), nullable=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
-    task_bucket_id = Column(Integer, ForeignKey("task_buckets.id"), nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    task_bucket_id = Column(Integer, ForeignKey("task_buckets.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
 
-    vendor_system = Column(String, nullable=False)
+    vendor_system = Column(String)
     subject = Column(String, nullable=False)
     description = Column(String, nullable=False)
     detailed_description = Column(String)
     start_date = Column(Date)
     end_date = Column(Date)
+    status_by_day = Column(JSON, default={})
     order = Column(Integer, nullable=False)
 
     bucket = relationship("TaskBucket", back_populates="tasks")
     project = relationship("Project", back_populates="tasks")
+    snapshots = relationship("TaskStatusSnapshot", cascade="all, delete-orphan", passive_deletes=True)
+
+# ------------------ FULL-TEXT SEARCH INDEX ------------------
+# Maintained by the database itself, so every write path (ORM, bulk
+# statements, imports) keeps it current. SQLite: an external-content FTS5
+# table plus triggers. Postgres: a generated, weighted tsvector column with a
+# GIN index. Not mapped on the model; app/db/search.py queries it. The
+# migration that adds it is 9a1d7e3c5b20.
+SEARCH_COLUMNS = ("subject", "description", "detailed_description", "vendor_system")
+
+_fts_columns = ", ".join(SEARCH_COLUMNS)
+_fts_new = ", ".join(f"new.{name}" for name in SEARCH_COLUMNS)
+_fts_old = ", ".join(f"old.{name}" for name in SEARCH_COLUMNS)
+
+SQLITE_SEARCH_DDL = [
+    f"CREATE VIRTUAL TABLE tasks_fts USING fts5({_fts_columns}, content='tasks', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new}); END",
+    f"CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old}); END",
+    f"CREATE TRIGGER tasks_fts_update AFTER UPDATE OF {_fts_columns} ON tasks BEGIN "
+    f"INSERT INTO tasks_fts(tasks_fts, rowid, {_fts_columns}) VALUES ('delete', old.id, {_fts_old}); "
+    f"INSERT INTO tasks_fts(rowid, {_fts_columns}) VALUES (new.id, {_fts_new}); END",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE tasks ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('simple', coalesce(subject, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(vendor_system, '')), 'B') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('simple', coalesce(detailed_description, '')), 'D')) STORED",
+    "CREATE INDEX ix_tasks_search_vector ON tasks USING gin (search_vector)",
+]
+
+for _statement in SQLITE_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+for _statement in POSTGRES_SEARCH_DDL:
+    event.listen(Task.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
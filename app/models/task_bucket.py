@@ -1,17 +1,22 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
 class TaskBucket(Base):
     __tablename__ = "task_buckets"
+    __table_args__ = (
+        Index("ix_task_buckets_phase_order", "phase_id", "order"),
+        Index("ix_task_buckets_project_id", "project_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
     order = Column(Integer, nullable=False)
 
-    phase_id = Column(Integer, ForeignKey("project_phases.id"), nullable=False)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("project_phases.id", ondelete="CASCADE"), nullable=False)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    cloned_from_id = Column(Integer, nullable=True)  # source bucket when created by a project clone
 
-    tasks = relationship("Task", back_populates="bucket", cascade="all, delete")
+    tasks = relationship("Task", back_populates="bucket", cascade="all, delete", passive_deletes=True)
     phase = relationship("ProjectPhase", back_populates="task_buckets")
     project = relationship("Project", back_populates="task_buckets")
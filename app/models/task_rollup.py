@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, Date, ForeignKey, Index, func, literal_column
+from app.db.database import Base
+
+class TaskDailyRollup(Base):
+    """Per-day task counts for one (project, phase, bucket, team, subsystem) slice.
+
+    A task counts on every day of its start_date..end_date window: as done if
+    marked done that day, as overdue if it is still not done on its end_date,
+    and as pending otherwise.
+    """
+    __tablename__ = "task_daily_rollups"
+    __table_args__ = (
+        Index("ix_task_daily_rollups_project_date", "project_id", "date"),
+        Index("ix_task_daily_rollups_bucket_date", "task_bucket_id", "date"),
+        Index("ix_task_daily_rollups_phase_id", "phase_id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    phase_id = Column(Integer, ForeignKey("project_phases.id", ondelete="CASCADE"), nullable=False)
+    task_bucket_id = Column(Integer, ForeignKey("task_buckets.id", ondelete="CASCADE"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=True)
+    subsystem_id = Column(Integer, ForeignKey("subsystems.id"), nullable=True)
+    date = Column(Date, nullable=False)
+    done_count = Column(Integer, nullable=False, default=0)
+    pending_count = Column(Integer, nullable=False, default=0)
+    overdue_count = Column(Integer, nullable=False, default=0)
+
+# The slice a row counts for; one row per slice. team_id and subsystem_id are
+# nullable and NULLs never collide in a unique index, so they are compared as
+# coalesce(..., 0). app/db/rollups.py upserts on this index.
+SLICE_KEY = (
+    TaskDailyRollup.project_id,
+    TaskDailyRollup.phase_id,
+    TaskDailyRollup.task_bucket_id,
+    func.coalesce(TaskDailyRollup.team_id, literal_column("0")),
+    func.coalesce(TaskDailyRollup.subsystem_id, literal_column("0")),
+    TaskDailyRollup.date,
+)
+Index("ux_task_daily_rollups_slice", *SLICE_KEY, unique=True)
@@ -1,9 +1,14 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, UniqueConstraint
 from app.db.database import Base
 
 class TaskStatusSnapshot(Base):
     __tablename__ = "task_snapshots"
+    __table_args__ = (
+        UniqueConstraint("task_id", "date", name="uq_task_snapshots_task_date"),
+        Index("ix_task_snapshots_date_status_task", "date", "status", "task_id"),
+    )
+
     id = Column(Integer, primary_key=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"))
-    date = Column(Date)
-    status = Column(String)
\ No newline at end of file
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
+    date = Column(Date, nullable=False)
+    status = Column(String, nullable=False)  # stored lower-cased, e.g. "done"
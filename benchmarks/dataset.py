@@ -0,0 +1,151 @@
+# benchmarks/dataset.py
+"""Generate a synthetic migration dataset through the app's models.
+
+Run ``python -m benchmarks.dataset --database-url <url> [--projects 5 ...]``.
+Every project gets phases, buckets and tasks; each task has a date range and
+a status_by_day history in which earlier days are more likely to be done.
+Snapshots and rollups are derived the same way the API derives them, so the
+read endpoints see consistent data. Output is deterministic for a given --seed.
+"""
+import argparse
+import random
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db.database import Base
+from app.db.ordering import ORDER_STEP
+from app.db.rollups import rebuild_project_rollup
+from app.db.snapshots import insert_snapshots
+from app.models import Project, ProjectPhase, Subsystem, Task, TaskBucket, Team
+
+STATUSES = ("done", "in progress", "blocked", "pending")
+
+
+@dataclass
+class DatasetSize:
+    projects: int = 2
+    phases: int = 4  # per project
+    buckets: int = 5  # per phase
+    tasks: int = 50  # per bucket
+    teams: int = 10
+    subsystems: int = 20
+    days: int = 60  # length of the plan, and of each task's possible history
+    seed: int = 42
+
+    @property
+    def total_tasks(self) -> int:
+        return self.projects * self.phases * self.buckets * self.tasks
+
+
+@dataclass
+class Dataset:
+    """Ids of what was generated, so callers can address real rows."""
+    size: DatasetSize
+    start: date
+    project_ids: List[int] = field(default_factory=list)
+    phase_ids: List[int] = field(default_factory=list)
+    bucket_ids: List[int] = field(default_factory=list)
+    task_ids: List[int] = field(default_factory=list)
+
+    def summary(self) -> dict:
+        return {**asdict(self.size), "start": self.start.isoformat(), "total_tasks": len(self.task_ids)}
+
+
+def _status_history(rng: random.Random, start: date, end: date) -> dict:
+    history = {}
+    span = (end - start).days or 1
+    day = start
+    while day <= end:
+        progress = (day - start).days / span
+        if rng.random() < 0.8:  # not every day gets a status
+            history[day.isoformat()] = "done" if rng.random() < 0.3 + 0.6 * progress else rng.choice(STATUSES[1:])
+        day += timedelta(days=1)
+    return history
+
+
+def generate(db: Session, size: DatasetSize, start: date = date(2025, 1, 1)) -> Dataset:
+    """Insert a dataset of the given size, one commit per project."""
+    rng = random.Random(size.seed)
+    dataset = Dataset(size=size, start=start)
+
+    teams = [Team(name=f"Team {index}") for index in range(size.teams)]
+    subsystems = [Subsystem(name=f"Subsystem {index}") for index in range(size.subsystems)]
+    db.add_all(teams + subsystems)
+    db.flush()
+    team_ids = [team.id for team in teams]
+    subsystem_ids = [subsystem.id for subsystem in subsystems]
+
+    for project_index in range(size.projects):
+        project = Project(name=f"Migration {size.seed}-{project_index}", description="Synthetic benchmark project")
+        db.add(project)
+        db.flush()
+        dataset.project_ids.append(project.id)
+
+        phases = [
+            ProjectPhase(
+                project_id=project.id, label=f"Phase {index + 1}", order=(index + 1) * ORDER_STEP,
+                date=start + timedelta(days=index * size.days // max(size.phases, 1)),
+            )
+            for index in range(size.phases)
+        ]
+        db.add_all(phases)
+        db.flush()
+        dataset.phase_ids.extend(phase.id for phase in phases)
+
+        buckets = [
+            TaskBucket(project_id=project.id, phase_id=phase.id, name=f"{phase.label} / Bucket {index + 1}", order=(index + 1) * ORDER_STEP)
+            for phase in phases
+            for index in range(size.buckets)
+        ]
+        db.add_all(buckets)
+        db.flush()
+        dataset.bucket_ids.extend(bucket.id for bucket in buckets)
+
+        tasks = []
+        for bucket in buckets:
+            for index in range(size.tasks):
+                task_start = start + timedelta(days=rng.randrange(size.days))
+                task_end = min(task_start + timedelta(days=rng.randint(1, 21)), start + timedelta(days=size.days))
+                tasks.append({
+                    "task_bucket_id": bucket.id,
+                    "project_id": project.id,
+                    "team_id": rng.choice(team_ids),
+                    "subsystem_id": rng.choice(subsystem_ids),
+                    "vendor_system": rng.choice((None, "SAP", "Oracle", "Salesforce")),
+                    "subject": f"Migrate object {bucket.id}-{index}",
+                    "description": "Synthetic benchmark task",
+                    "start_date": task_start,
+                    "end_date": task_end,
+                    "status_by_day": _status_history(rng, task_start, task_end),
+                    "order": (index + 1) * ORDER_STEP,
+                })
+        db.bulk_insert_mappings(Task, tasks, return_defaults=True)
+        insert_snapshots(db, tasks)
+        rebuild_project_rollup(db, project.id)
+        db.commit()
+        dataset.task_ids.extend(task["id"] for task in tasks)
+    return dataset
+
+
+def main() -> None:
+    defaults = DatasetSize()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True, help="target database; tables are created if missing")
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name}", type=int, default=value)
+    args = parser.parse_args()
+
+    size = DatasetSize(**{name: getattr(args, name) for name in asdict(defaults)})
+    engine = create_engine(args.database_url)
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as db:
+        dataset = generate(db, size)
+    print(dataset.summary())
+
+
+if __name__ == "__main__":
+    main()
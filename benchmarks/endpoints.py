@@ -0,0 +1,160 @@
+# benchmarks/endpoints.py
+"""Time the hot endpoints of every router against a generated dataset.
+
+    python -m benchmarks.endpoints --database-url sqlite:////tmp/bench.db
+    python -m benchmarks.endpoints --database-url postgresql://localhost/bench
+    python -m benchmarks.endpoints ... --compare benchmarks/results/<earlier>.json
+
+The database is filled with benchmarks.dataset (unless --no-generate), then
+each scenario is requested in-process through the ASGI app. Results go to
+benchmarks/results/<commit>-<dialect>.json; with --compare the exit status
+is 1 if any scenario's median got slower than --threshold.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import asdict
+from datetime import timedelta
+from pathlib import Path
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def scenarios(dataset) -> dict:
+    """name -> (method, path, params, json body), addressing rows that exist."""
+    day = (dataset.start + timedelta(days=dataset.size.days // 2)).isoformat()
+    project_id, phase_id, bucket_id = dataset.project_ids[0], dataset.phase_ids[0], dataset.bucket_ids[0]
+    task_id = dataset.task_ids[len(dataset.task_ids) // 2]
+    return {
+        "GET /projects/": ("GET", "/projects/", {}, None),
+        "GET /projects/{id}/tree": ("GET", f"/projects/{project_id}/tree", {}, None),
+        "GET /projects/{id}/burndown": ("GET", f"/projects/{project_id}/burndown", {}, None),
+        "GET /phases/by-project/{id}": ("GET", f"/phases/by-project/{project_id}", {}, None),
+        "GET /task-buckets/": ("GET", "/task-buckets/", {"limit": 100}, None),
+        "GET /task-buckets/by-phase/{id}": ("GET", f"/task-buckets/by-phase/{phase_id}", {}, None),
+        "GET /tasks/": ("GET", "/tasks/", {"limit": 100}, None),
+        "GET /tasks/?limit=1000": ("GET", "/tasks/", {"limit": 1000}, None),
+        "GET /tasks/by-bucket/{id}": ("GET", f"/tasks/by-bucket/{bucket_id}", {}, None),
+        "GET /daily-summary/": ("GET", "/daily-summary/", {"date_query": day}, None),
+        "GET /daily-summary/?view=counts": ("GET", "/daily-summary/", {"date_query": day, "view": "counts"}, None),
+        "GET /daily-summary/?view=ids": ("GET", "/daily-summary/", {"date_query": day, "view": "ids"}, None),
+        "GET /daily-summary/rollup": ("GET", "/daily-summary/rollup", {"date_query": day}, None),
+        "GET /teams/": ("GET", "/teams/", {}, None),
+        "GET /subsystems/": ("GET", "/subsystems/", {}, None),
+        "PATCH /tasks/{id}/status/{date}": ("PATCH", f"/tasks/{task_id}/status/{day}", {}, {"status": "done"}),
+    }
+
+
+def measure(client, method: str, path: str, params: dict, body, iterations: int, warmup: int) -> dict:
+    timings = []
+    size = 0
+    for iteration in range(warmup + iterations):
+        started = time.perf_counter()
+        response = client.request(method, path, params=params, json=body)
+        elapsed = time.perf_counter() - started
+        if response.status_code != 200:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+        if iteration >= warmup:
+            timings.append(elapsed * 1000)
+            size = len(response.content)
+    timings.sort()
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "bytes": size,
+        "iterations": iterations,
+    }
+
+
+def compare(results: dict, baseline_path: str, threshold: float) -> bool:
+    """Print median changes against an earlier results file; True if nothing regressed."""
+    baseline = json.loads(Path(baseline_path).read_text())["scenarios"]
+    ok = True
+    for name, result in results.items():
+        before = baseline.get(name)
+        if not before:
+            continue
+        ratio = result["median_ms"] / before["median_ms"] if before["median_ms"] else 1.0
+        regressed = ratio > 1 + threshold
+        ok &= not regressed
+        print(f"{'REGRESSED' if regressed else 'ok':<10} {name:<36} {before['median_ms']:9.2f} -> {result['median_ms']:9.2f} ms ({ratio:.2f}x)")
+    return ok
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", required=True)
+    # The app reads its settings at import time, so nothing from app (or
+    # benchmarks.dataset) may be imported before DATABASE_URL is set.
+    os.environ["DATABASE_URL"] = parser.parse_known_args()[0].database_url
+    from benchmarks.dataset import Dataset, DatasetSize, generate
+
+    defaults = DatasetSize()
+    parser.add_argument("--no-generate", action="store_true", help="reuse the dataset already in the database")
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--compare", help="earlier results JSON to compare medians against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed median slowdown for --compare")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<commit>-<dialect>.json)")
+    for name, value in asdict(defaults).items():
+        parser.add_argument(f"--{name}", type=int, default=value)
+    args = parser.parse_args()
+
+    from fastapi.testclient import TestClient
+    from sqlalchemy import select
+
+    from app.db.database import Base, SessionLocal, engine
+    from app.main import app
+    from app.models import Project, ProjectPhase, Task, TaskBucket
+
+    size = DatasetSize(**{name: getattr(args, name) for name in asdict(defaults)})
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        if args.no_generate:
+            dataset = Dataset(size=size, start=db.scalar(select(Task.start_date).order_by(Task.start_date).limit(1)))
+            dataset.project_ids = list(db.scalars(select(Project.id).order_by(Project.id)))
+            dataset.phase_ids = list(db.scalars(select(ProjectPhase.id).order_by(ProjectPhase.id)))
+            dataset.bucket_ids = list(db.scalars(select(TaskBucket.id).order_by(TaskBucket.id)))
+            dataset.task_ids = list(db.scalars(select(Task.id).order_by(Task.id)))
+        else:
+            dataset = generate(db, size)
+
+    results = {}
+    with TestClient(app) as client:
+        for name, (method, path, params, body) in scenarios(dataset).items():
+            results[name] = measure(client, method, path, params, body, args.iterations, args.warmup)
+            print(f"{name:<36} median {results[name]['median_ms']:9.2f} ms  p95 {results[name]['p95_ms']:9.2f} ms  {results[name]['bytes']:>10} B")
+
+    commit = _git_commit()
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}-{engine.dialect.name}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "commit": commit,
+        "dialect": engine.dialect.name,
+        "python": sys.version.split()[0],
+        "dataset": dataset.summary(),
+        "scenarios": results,
+    }, indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare and not compare(results, args.compare, args.threshold):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
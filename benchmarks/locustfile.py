@@ -0,0 +1,56 @@
+# benchmarks/locustfile.py
+"""Concurrent load against a running server (``pip install locust``).
+
+    python -m benchmarks.dataset --database-url <url>
+    uvicorn app.main:app --workers 4   # with DATABASE_URL=<url>
+    locust -f benchmarks/locustfile.py --host http://localhost:8000
+
+Users poll the dashboard reads and occasionally tick a task's status, in
+roughly the mix the frontend produces. Ids are discovered from the API.
+"""
+import random
+from datetime import date, timedelta
+
+from locust import HttpUser, between, task
+
+
+class DashboardUser(HttpUser):
+    wait_time = between(0.5, 2)
+
+    def on_start(self):
+        self.project_ids = [project["id"] for project in self.client.get("/projects/").json()] or [1]
+        self.bucket_ids = [bucket["id"] for bucket in self.client.get("/task-buckets/", params={"limit": 500}).json()] or [1]
+        tasks = self.client.get("/tasks/", params={"limit": 500}).json()
+        self.task_ids = [item["id"] for item in tasks] or [1]
+        self.days = sorted({item["start_date"] for item in tasks}) or [date.today().isoformat()]
+
+    def _day(self) -> str:
+        return (date.fromisoformat(random.choice(self.days)) + timedelta(days=random.randint(0, 5))).isoformat()
+
+    @task(6)
+    def daily_summary_counts(self):
+        self.client.get("/daily-summary/", params={"date_query": self._day(), "view": "counts"}, name="/daily-summary/?view=counts")
+
+    @task(3)
+    def daily_summary(self):
+        self.client.get("/daily-summary/", params={"date_query": self._day()}, name="/daily-summary/")
+
+    @task(6)
+    def tasks_by_bucket(self):
+        self.client.get(f"/tasks/by-bucket/{random.choice(self.bucket_ids)}", name="/tasks/by-bucket/{id}")
+
+    @task(2)
+    def project_tree(self):
+        self.client.get(f"/projects/{random.choice(self.project_ids)}/tree", name="/projects/{id}/tree")
+
+    @task(2)
+    def burndown(self):
+        self.client.get(f"/projects/{random.choice(self.project_ids)}/burndown", name="/projects/{id}/burndown")
+
+    @task(1)
+    def tick_status(self):
+        self.client.patch(
+            f"/tasks/{random.choice(self.task_ids)}/status/{self._day()}",
+            json={"status": random.choice(("done", "in progress"))},
+            name="/tasks/{id}/status/{date}",
+        )
@@ -0,0 +1,78 @@
+# benchmarks/serialization.py
+"""Compare the ways a large task list can be turned into a JSON body.
+
+Run ``python -m benchmarks.serialization [--tasks 10000] [--repeat 5]``.
+An in-memory SQLite database is filled by benchmarks.dataset and each
+strategy is timed end to end (query + serialization), best of --repeat.
+"""
+import argparse
+import json
+import time
+from typing import List
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session
+
+from app.api.responses import projection
+from app.db import schemas
+from app.db.database import Base
+from app.models import Task
+from benchmarks.dataset import DatasetSize, generate
+
+TASK_LIST = TypeAdapter(List[schemas.TaskOut])
+
+
+def orm_jsonable_stdlib(session: Session) -> bytes:
+    """ORM instances -> response model -> jsonable_encoder -> json.dumps (pre-0.1xx FastAPI path)."""
+    tasks = session.scalars(select(Task)).all()
+    return json.dumps(jsonable_encoder([schemas.TaskOut.from_orm(task) for task in tasks])).encode()
+
+
+def orm_pydantic_dump(session: Session) -> bytes:
+    """ORM instances validated and dumped by Pydantic (FastAPI's default response_model path)."""
+    return TASK_LIST.dump_json(TASK_LIST.validate_python(session.scalars(select(Task)).all(), from_attributes=True))
+
+
+def projected_pydantic_dump(session: Session) -> bytes:
+    """Projected row dicts validated and dumped by Pydantic (list endpoints, default mode)."""
+    rows = [dict(row) for row in session.execute(select(*projection(Task, schemas.TaskOut))).mappings()]
+    return TASK_LIST.dump_json(TASK_LIST.validate_python(rows))
+
+
+def projected_orjson(session: Session) -> bytes:
+    """Projected row dicts dumped with orjson (FAST_JSON_RESPONSES=1)."""
+    return orjson.dumps([dict(row) for row in session.execute(select(*projection(Task, schemas.TaskOut))).mappings()])
+
+
+STRATEGIES = [orm_jsonable_stdlib, orm_pydantic_dump, projected_pydantic_dump, projected_orjson]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(bind=engine)
+    with Session(engine) as session:
+        generate(session, DatasetSize(projects=1, phases=1, buckets=1, tasks=args.tasks))
+
+    baseline = None
+    for strategy in STRATEGIES:
+        timings = []
+        for _ in range(args.repeat):
+            with Session(engine) as session:
+                started = time.perf_counter()
+                body = strategy(session)
+                timings.append(time.perf_counter() - started)
+        best = min(timings)
+        baseline = baseline or best
+        print(f"{strategy.__name__:<26} {best * 1000:8.1f} ms  {baseline / best:5.1f}x  {len(body) / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
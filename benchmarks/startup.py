@@ -0,0 +1,68 @@
+# benchmarks/startup.py
+"""Measure cold-start cost: importing app.main in a fresh interpreter.
+
+Run ``python -m benchmarks.startup [--runs 10] [--top 15]``.
+Each run spawns a new Python process, so nothing is cached in sys.modules;
+the median wall time is reported, followed by the slowest top-level imports
+from one ``python -X importtime`` run. Importing the app must not touch the
+database, so a throwaway SQLite URL is used and never created.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+TARGET = "import app.main"
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(ROOT), env.get("PYTHONPATH")]))
+    env["DATABASE_URL"] = "sqlite:///" + os.path.join(tempfile.gettempdir(), "startup-benchmark.db")
+    return env
+
+
+def time_import(runs: int) -> list:
+    timings = []
+    env = _env()
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", TARGET], env=env, check=True)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def slowest_imports(top: int) -> list:
+    """(cumulative µs, module) for the slowest imports, nested ones included."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", TARGET], env=_env(), capture_output=True, text=True, check=True
+    ).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line.split("|")
+        rows.append((int(cumulative), module.rstrip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    timings = time_import(args.runs)
+    print(f"{TARGET}: median {statistics.median(timings):.0f} ms, min {min(timings):.0f} ms over {args.runs} runs")
+    print("\nslowest imports (cumulative, from -X importtime):")
+    for cumulative, module in slowest_imports(args.top):
+        print(f"{cumulative / 1000:8.1f} ms {module}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a scratch database first.
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault("CELERY_TASK_ALWAYS_EAGER", "1")
+os.environ.setdefault("JOB_STORAGE_DIR", os.path.join(_db_dir, "jobs"))
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from fastapi.testclient import TestClient
+
+from app.main import create_app  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="session")
+def client():
+    # The migrations, not the models, build the schema, so drift between them fails here.
+    config = Config(os.path.join(ROOT, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(ROOT, "alembic"))
+    command.upgrade(config, "head")
+    with TestClient(create_app()) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def make_project(client):
+    """Create a project with one phase; returns (project_id, phase_id)."""
+    def make(name: str):
+        project_id = client.post("/projects/", json={"name": name}).json()["id"]
+        phase = client.post(
+            "/phases/", json={"project_id": project_id, "date": "2025-01-01", "label": name}
+        ).json()
+        return project_id, phase["id"]
+    return make
+
+
+@pytest.fixture(scope="session")
+def team_and_subsystem(client):
+    team = client.post("/teams/", json={"name": "fixture-team"}).json()["id"]
+    subsystem = client.post("/subsystems/", json={"name": "fixture-subsystem"}).json()["id"]
+    return team, subsystem
+
+
+@pytest.fixture
+def make_task(client, team_and_subsystem):
+    """Create a task in the bucket; fields override the defaults. Returns the task JSON."""
+    team, subsystem = team_and_subsystem
+
+    def make(bucket_id: int, **fields):
+        body = {
+            "task_bucket_id": bucket_id, "team_id": team, "subsystem_id": subsystem,
+            "subject": "task", "description": "d", "start_date": "2025-01-01", "end_date": "2025-01-03",
+            "order": 1, "status_by_day": {}, **fields,
+        }
+        response = client.post("/tasks/", json=body)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return make
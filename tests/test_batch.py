@@ -0,0 +1,116 @@
+from datetime import date
+
+from app.db.database import SessionLocal
+from app.db.snapshots import snapshot_rows
+from app.models import Task, TaskDailyRollup, TaskStatusSnapshot
+
+
+def _task_body(bucket, team_and_subsystem, **fields):
+    team, subsystem = team_and_subsystem
+    return {
+        "task_bucket_id": bucket, "team_id": team, "subsystem_id": subsystem, "subject": "task", "description": "d",
+        "start_date": "2025-01-01", "end_date": "2025-01-03", "order": 1, "status_by_day": {}, **fields,
+    }
+
+
+def _bucket(client, make_project, name):
+    project, phase = make_project(name)
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    return project, bucket
+
+
+def _statuses(response):
+    return [item["status"] for item in response.json()["results"]]
+
+
+def _rollup_rows(db, project_ids):
+    return sorted(
+        (row.project_id, row.task_bucket_id, row.team_id, row.subsystem_id, row.date,
+         row.done_count, row.pending_count, row.overdue_count)
+        for row in db.query(TaskDailyRollup).filter(TaskDailyRollup.project_id.in_(project_ids))
+    )
+
+
+def test_invalid_batch_writes_nothing_and_reports_each_item(client, make_project, make_task, team_and_subsystem):
+    _, bucket = _bucket(client, make_project, "batch-rejected")
+    task = make_task(bucket, subject="before")["id"]
+
+    response = client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": _task_body(bucket, team_and_subsystem, subject="new")},
+        {"op": "update", "id": task, "data": {"subject": "after"}},
+        {"op": "update", "id": 999999, "data": {"subject": "missing"}},
+        {"op": "create", "data": _task_body(bucket, team_and_subsystem, team_id=999999)},
+    ]})
+
+    assert response.status_code == 422
+    assert response.json()["applied"] is False
+    assert _statuses(response) == ["ok", "ok", "error", "error"]
+    assert [item["detail"] for item in response.json()["results"][2:]] == ["Task not found", "Team does not exist"]
+    tasks = client.get(f"/tasks/by-bucket/{bucket}").json()
+    assert [(item["id"], item["subject"]) for item in tasks] == [(task, "before")]
+
+
+def test_mixed_batch_applies_every_operation(client, make_project, make_task, team_and_subsystem):
+    _, bucket = _bucket(client, make_project, "batch-mixed")
+    kept, removed = make_task(bucket, subject="kept")["id"], make_task(bucket, subject="removed")["id"]
+
+    response = client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": _task_body(bucket, team_and_subsystem, subject="created")},
+        {"op": "update", "id": kept, "data": {"subject": "renamed"}},
+        {"op": "delete", "id": removed},
+    ]})
+
+    assert response.status_code == 200
+    assert response.json()["applied"] is True
+    assert _statuses(response) == ["ok", "ok", "ok"]
+    created = response.json()["results"][0]["id"]
+    subjects = {item["id"]: item["subject"] for item in client.get(f"/tasks/by-bucket/{bucket}").json()}
+    assert subjects == {created: "created", kept: "renamed"}
+    assert client.get(f"/tasks/{removed}").status_code == 404
+
+
+def test_batch_keeps_rollups_and_snapshots_consistent(client, make_project, make_task, team_and_subsystem):
+    project, bucket = _bucket(client, make_project, "batch-rollups")
+    other_project, other_bucket = _bucket(client, make_project, "batch-rollups-target")
+    restatused = make_task(bucket, status_by_day={"2025-01-01": "Done"})["id"]
+    moved = make_task(bucket, status_by_day={"2025-01-02": "Done"})["id"]
+    removed = make_task(bucket, status_by_day={"2025-01-03": "Done"})["id"]
+
+    response = client.post("/tasks/batch", json={"operations": [
+        {"op": "create", "data": _task_body(bucket, team_and_subsystem, status_by_day={"2025-01-02": "Done"})},
+        {"op": "update", "id": restatused, "data": {"status_by_day": {"2025-01-03": "Done"}, "end_date": "2025-01-05"}},
+        {"op": "update", "id": moved, "data": {"task_bucket_id": other_bucket}},
+        {"op": "delete", "id": removed},
+    ]})
+    assert response.status_code == 200
+
+    with SessionLocal() as db:
+        incremental = _rollup_rows(db, [project, other_project])
+        stored = sorted((row.task_id, row.date, row.status) for row in db.query(TaskStatusSnapshot))
+        expected = sorted(
+            (row["task_id"], row["date"], row["status"])
+            for task in db.query(Task) for row in snapshot_rows(task.id, task.status_by_day)
+        )
+    assert stored == expected
+    assert (restatused, date(2025, 1, 1), "done") not in stored
+
+    for rebuilt_project in (project, other_project):
+        rebuild = client.post("/jobs/rollup-rebuild", json={"project_id": rebuilt_project})
+        assert rebuild.json()["status"] == "succeeded"
+    with SessionLocal() as db:
+        assert _rollup_rows(db, [project, other_project]) == incremental
+
+
+def test_batch_rejects_two_operations_on_one_row(client, make_project, make_task):
+    _, bucket = _bucket(client, make_project, "batch-duplicate")
+    task = make_task(bucket, subject="before")["id"]
+
+    response = client.post("/tasks/batch", json={"operations": [
+        {"op": "update", "id": task, "data": {"subject": "after"}},
+        {"op": "delete", "id": task},
+    ]})
+
+    assert response.status_code == 422
+    assert _statuses(response) == ["ok", "error"]
+    assert response.json()["results"][1]["detail"] == f"Id {task} is targeted by more than one operation"
+    assert client.get(f"/tasks/{task}").json()["subject"] == "before"
@@ -0,0 +1,16 @@
+import asyncio
+
+from app.core.cache import MemoryCache
+
+
+def test_load_racing_an_invalidation_is_not_served():
+    async def scenario():
+        cache = MemoryCache(max_entries=10, ttl=60)
+        entry, full_key = await cache.get("teams", "list")
+        assert entry is None
+        await cache.invalidate("teams")  # a write commits while the read is loading
+        await cache.set(full_key, b"stale")
+        return await cache.get("teams", "list")
+
+    entry, _ = asyncio.run(scenario())
+    assert entry is None
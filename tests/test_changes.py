@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app.api.endpoints.changes import _event_stream
+from app.core.changes import MemoryBroadcaster, broadcaster, resync_events
+
+
+def test_websocket_receives_each_commit_of_its_project(client, make_project, make_task):
+    project, phase = make_project("feed")
+    _, other_phase = make_project("feed-other")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    other_bucket = client.post("/task-buckets/", json={"phase_id": other_phase, "name": "b", "order": 1}).json()["id"]
+
+    with client.websocket_connect(f"/projects/{project}/changes/ws") as websocket:
+        make_task(other_bucket)  # another project's feed
+        rejected = client.post("/tasks/batch", json={"operations": [{"op": "delete", "id": 999999}]})
+        assert rejected.status_code == 422  # nothing committed, nothing published
+        task = make_task(bucket)["id"]
+        client.put(f"/task-buckets/{bucket}", json={"name": "renamed", "order": 1, "phase_id": phase})
+
+        assert websocket.receive_json() == [{"entity": "task", "op": "created", "id": task}]
+        assert websocket.receive_json() == [{"entity": "task_bucket", "op": "updated", "id": bucket, "fields": ["name"]}]
+
+
+def test_websocket_for_missing_project_is_closed(client):
+    with pytest.raises(WebSocketDisconnect) as closed:
+        with client.websocket_connect("/projects/999999/changes/ws") as websocket:
+            websocket.receive_json()
+    assert closed.value.code == 1008
+
+
+def test_sse_for_missing_project_is_404(client):
+    assert client.get("/projects/999999/changes").status_code == 404
+
+
+def test_sse_stream_frames_each_commit():
+    async def read():
+        stream = _event_stream(424242)
+        assert await anext(stream) == "retry: 3000\n\n"  # subscribed from here on
+        await broadcaster.publish(424242, [{"entity": "task", "op": "deleted", "id": 1}])
+        frame = await anext(stream)
+        await stream.aclose()
+        return frame
+
+    frame = asyncio.run(read())
+    assert frame.startswith("event: changes\ndata: ")
+    assert json.loads(frame.split("data: ", 1)[1]) == [{"entity": "task", "op": "deleted", "id": 1}]
+
+
+def test_slow_subscriber_is_told_to_resync():
+    async def overflow():
+        feed = MemoryBroadcaster(queue_size=2)
+        async with feed.subscribe(7) as queue:
+            for index in range(3):
+                await feed.publish(7, [{"entity": "task", "op": "updated", "id": index}])
+            return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    assert asyncio.run(overflow()) == [resync_events(7)]
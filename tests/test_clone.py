@@ -0,0 +1,53 @@
+from datetime import date
+
+
+def _tree(client, project_id):
+    tree = client.get(f"/projects/{project_id}/tree").json()
+    return [
+        (phase["label"], phase["date"], [
+            (bucket["name"], [(task["subject"], task["start_date"], task["end_date"], task["status_by_day"])
+                              for task in bucket["tasks"]])
+            for bucket in phase["task_buckets"]
+        ])
+        for phase in tree["phases"]
+    ]
+
+
+def test_clone_without_offset_keeps_phase_dates(client, make_project, make_task):
+    source, phase = make_project("clone-source")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    make_task(bucket, subject="first", status_by_day={"2025-01-02": "Done"})
+    make_task(bucket, subject="second", order=2)
+
+    response = client.post(f"/projects/{source}/clone", json={"name": "clone-copy"})
+    assert response.status_code == 200, response.text
+    clone = response.json()["id"]
+
+    copied = _tree(client, clone)
+    assert [(label, day) for label, day, _ in copied] == [("clone-source", "2025-01-01")]
+    assert copied[0][2] == [("b", [
+        ("first", "2025-01-01", "2025-01-03", {}),
+        ("second", "2025-01-01", "2025-01-03", {}),
+    ])]
+
+
+def test_clone_with_offset_shifts_dates_and_rollups(client, make_project, make_task):
+    source, phase = make_project("clone-offset-source")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    make_task(bucket, status_by_day={"2025-01-02": "Done"})
+
+    clone = client.post(f"/projects/{source}/clone", json={"name": "clone-offset", "date_offset_days": 7}).json()["id"]
+
+    (label, day, buckets), = _tree(client, clone)
+    assert day == "2025-01-08"
+    assert buckets[0][1][0][1:3] == ("2025-01-08", "2025-01-10")
+    burndown = client.get(f"/projects/{clone}/burndown").json()
+    assert [(point["date"], point["done_count"], point["pending_count"], point["overdue_count"]) for point in burndown] == [
+        (date(2025, 1, day).isoformat(), 0, 1 if day < 10 else 0, 1 if day == 10 else 0) for day in (8, 9, 10)
+    ]
+
+
+def test_clone_to_existing_name_is_rejected(client, make_project):
+    source, _ = make_project("clone-taken")
+    assert client.post(f"/projects/{source}/clone", json={"name": "clone-taken"}).status_code == 400
+    assert client.post("/projects/999999/clone", json={"name": "clone-missing"}).status_code == 404
@@ -0,0 +1,31 @@
+import pytest
+
+
+@pytest.mark.parametrize("path", ["/tasks/by-bucket/99999", "/phases/by-project/99999"])
+def test_missing_resource_is_404_even_if_the_etag_matches(client, path):
+    assert client.get(path, headers={"If-None-Match": '"0"'}).status_code == 404
+
+
+def test_unchanged_bucket_tasks_are_not_modified(client, make_project):
+    _, phase = make_project("conditional")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    etag = client.get(f"/tasks/by-bucket/{bucket}").headers["ETag"]
+    assert client.get(f"/tasks/by-bucket/{bucket}", headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_phase_list_follows_writes_the_cache_did_not_see(client, make_project):
+    from app.db.database import SessionLocal
+    from app.db.versions import bump_versions, project_phases_key
+    from app.models import ProjectPhase
+
+    project, phase = make_project("conditional-phases")
+    first = client.get(f"/phases/by-project/{project}")
+    with SessionLocal() as db:  # as another worker would: no cache invalidation in this process
+        db.get(ProjectPhase, phase).label = "renamed"
+        bump_versions(db, [project_phases_key(project)])
+        db.commit()
+
+    second = client.get(f"/phases/by-project/{project}", headers={"If-None-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+    assert [p["label"] for p in second.json()] == ["renamed"]
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+
+import pytest
+from openpyxl import load_workbook
+
+from app.db.task_export import EXPORT_HEADER
+
+
+def _rows(export_format, content):
+    """Parse an export into header-keyed dicts of strings (status_by_day as JSON)."""
+    if export_format == "ndjson":
+        return [
+            {key: json.dumps(value) if isinstance(value, dict) else str(value) for key, value in json.loads(line).items()}
+            for line in content.decode().splitlines()
+        ]
+    if export_format == "csv":
+        return list(csv.DictReader(io.StringIO(content.decode())))
+    sheet = load_workbook(io.BytesIO(content), read_only=True).active
+    header, *rows = sheet.iter_rows(values_only=True)
+    return [{key: str(value) for key, value in zip(header, row)} for row in rows]
+
+
+@pytest.fixture
+def export_bucket(client, make_project, make_task, request):
+    _, phase = make_project(request.node.name)
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    tasks = [
+        make_task(bucket, subject="early", end_date="2025-01-05", status_by_day={"2025-01-02": "Done"}),
+        make_task(bucket, subject="late", start_date="2025-02-01", end_date="2025-02-03"),
+    ]
+    return bucket, tasks
+
+
+@pytest.mark.parametrize("export_format", ["ndjson", "csv", "xlsx"])
+def test_export_formats_carry_the_same_rows(client, export_bucket, export_format):
+    bucket, tasks = export_bucket
+
+    response = client.get("/tasks/export", params={"format": export_format, "task_bucket_id": bucket})
+
+    assert response.status_code == 200
+    assert f'filename="tasks.{export_format}"' in response.headers["content-disposition"]
+    rows = _rows(export_format, response.content)
+    assert [list(row) for row in rows] == [EXPORT_HEADER] * len(tasks)
+    assert [(row["id"], row["subject"]) for row in rows] == [(str(task["id"]), task["subject"]) for task in tasks]
+    assert json.loads(rows[0]["status_by_day"]) == {"2025-01-02": "Done"}
+
+
+def test_export_filters_by_date_range(client, export_bucket):
+    bucket, (early, _) = export_bucket
+    response = client.get("/tasks/export", params={
+        "format": "ndjson", "task_bucket_id": bucket, "start_date": "2025-01-04", "end_date": "2025-01-10",
+    })
+    assert [row["id"] for row in _rows("ndjson", response.content)] == [str(early["id"])]
+
+
+def test_export_job_matches_the_streamed_export(client, export_bucket):
+    bucket, _ = export_bucket
+    job = client.post("/jobs/export", json={"format": "csv", "task_bucket_id": bucket}).json()
+    assert job["status"] == "succeeded"
+
+    download = client.get(f"/jobs/{job['id']}/download")
+
+    assert download.status_code == 200
+    streamed = client.get("/tasks/export", params={"format": "csv", "task_bucket_id": bucket})
+    assert _rows("csv", download.content) == _rows("csv", streamed.content)
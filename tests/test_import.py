@@ -0,0 +1,58 @@
+import io
+
+from openpyxl import Workbook
+
+from app.db import task_import
+
+HEADER = "bucket,team,subsystem,subject,description,start_date,end_date,order,status_by_day"
+
+
+def _import(client, filename, content):
+    return client.post("/tasks/import", files={"file": (filename, content)})
+
+
+def test_csv_import_resolves_names_and_reports_bad_rows(client, make_project, team_and_subsystem, monkeypatch):
+    monkeypatch.setattr(task_import, "IMPORT_CHUNK_SIZE", 2)  # row numbers must carry across chunks
+    _, phase = make_project("import-csv")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "import-bucket", "order": 1}).json()["id"]
+    rows = [
+        HEADER,
+        'import-bucket,fixture-team,fixture-subsystem,first,d,2025-01-01,2025-01-03,1,"{""2025-01-02"": ""Done""}"',
+        "import-bucket,no-such-team,fixture-subsystem,second,d,2025-01-01,2025-01-03,2,",
+        "import-bucket,fixture-team,fixture-subsystem,third,d,not-a-date,2025-01-03,3,",
+        "import-bucket,fixture-team,fixture-subsystem,fourth,d,2025-01-02,2025-01-04,4,",
+    ]
+
+    response = _import(client, "plan.csv", "\n".join(rows).encode())
+
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["inserted"], result["failed"]) == (2, 2)
+    assert [error["row"] for error in result["errors"]] == [3, 4]
+    assert result["errors"][0]["detail"] == "Team 'no-such-team' does not exist"
+    assert result["errors"][1]["detail"].startswith("start_date:")
+    tasks = client.get(f"/tasks/by-bucket/{bucket}").json()
+    assert sorted(task["subject"] for task in tasks) == ["first", "fourth"]
+    first = next(task for task in tasks if task["subject"] == "first")
+    assert first["status_by_day"] == {"2025-01-02": "Done"}
+
+
+def test_xlsx_import(client, make_project, team_and_subsystem):
+    _, phase = make_project("import-xlsx")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "xlsx-bucket", "order": 1}).json()["id"]
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.append(["task_bucket_id", "team", "subsystem", "subject", "description", "start_date", "end_date", "order"])
+    sheet.append([bucket, "fixture-team", "fixture-subsystem", "from-xlsx", "d", "2025-01-01", "2025-01-03", 1])
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+
+    response = _import(client, "plan.xlsx", buffer.getvalue())
+
+    assert response.status_code == 200
+    assert response.json() == {"inserted": 1, "failed": 0, "errors": []}
+    assert [task["subject"] for task in client.get(f"/tasks/by-bucket/{bucket}").json()] == ["from-xlsx"]
+
+
+def test_import_rejects_other_file_types(client):
+    assert _import(client, "plan.txt", b"subject\nx\n").status_code == 400
@@ -0,0 +1,28 @@
+from app.jobs.tasks import run_job
+
+CSV = (
+    "bucket,team,subsystem,subject,description,start_date,end_date,order\n"
+    "jobs-bucket,fixture-team,fixture-subsystem,imported,d,2025-01-01,2025-01-03,1\n"
+)
+
+
+def test_redelivered_import_job_runs_once(client, make_project, team_and_subsystem):
+    _, phase = make_project("jobs-redelivery")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "jobs-bucket", "order": 1}).json()["id"]
+    job = client.post("/jobs/import", files={"file": ("plan.csv", CSV.encode())}).json()
+    assert (job["status"], job["result"]["inserted"]) == ("succeeded", 1)
+
+    run_job(job["id"])  # the broker hands the same job out again
+
+    assert [task["subject"] for task in client.get(f"/tasks/by-bucket/{bucket}").json()] == ["imported"]
+    assert client.get(f"/jobs/{job['id']}").json() == job
+
+
+def test_job_output_does_not_expose_params(client):
+    job = client.post("/jobs/export", json={"format": "csv", "task_bucket_id": 999999}).json()
+    assert job["status"] == "succeeded"
+    assert "params" not in job
+
+
+def test_missing_job_is_skipped(client):
+    run_job(999999)
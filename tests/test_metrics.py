@@ -0,0 +1,25 @@
+import copy
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from app.db.database import engine
+
+
+def test_requests_report_their_sql_usage(client):
+    response = client.get("/projects/")
+    assert response.headers["server-timing"].startswith("app;dur=")
+    assert 'queries"' in response.headers["server-timing"]
+    metrics = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="GET",route="/projects/",status="200"}' in metrics
+
+
+def test_failed_statement_leaves_no_timing_state(client):
+    with engine.connect() as conn:
+        conn.exec_driver_sql("SELECT 1")
+        before = copy.deepcopy(dict(conn.info))
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("SELECT * FROM no_such_table")
+        conn.rollback()
+        conn.exec_driver_sql("SELECT 1")
+        assert conn.info == before
@@ -0,0 +1,72 @@
+import base64
+import json
+
+import pytest
+
+from app.api.pagination import NEXT_CURSOR_HEADER, encode_cursor
+
+
+def _walk(client, path, limit, **params):
+    """Follow X-Next-Cursor from the first page; returns every page's ids."""
+    pages = []
+    response = client.get(path, params={"limit": limit, **params})
+    while True:
+        assert response.status_code == 200
+        pages.append([row["id"] for row in response.json()])
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return pages
+        response = client.get(path, params={"limit": limit, "cursor": cursor, **params})
+
+
+def test_cursor_pages_cover_every_row_once(client, make_project, make_task):
+    _, phase = make_project("cursor-tasks")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    for order in range(5):
+        make_task(bucket, order=order)
+
+    pages = _walk(client, "/tasks/", 2)
+    ids = [task_id for page in pages for task_id in page]
+    assert ids == sorted(ids)
+    assert len(ids) == len(set(ids)) == len(client.get("/tasks/", params={"limit": 1000}).json())
+    assert all(len(page) <= 2 for page in pages)
+
+
+def test_composite_cursor_follows_the_sort_order(client, make_project):
+    # phases sort by (order, id): the cursor must carry both
+    project, _ = make_project("cursor-phases")
+    for day in ("2025-01-02", "2025-01-03"):
+        client.post("/phases/", json={"project_id": project, "date": day, "label": day})
+
+    phases = client.get("/phases/", params={"limit": 1000}).json()
+    pages = _walk(client, "/phases/", 2)
+    assert [phase_id for page in pages for phase_id in page] == [
+        phase["id"] for phase in sorted(phases, key=lambda phase: (phase["order"], phase["id"]))
+    ]
+
+
+def test_last_page_has_no_next_cursor(client):
+    response = client.get("/projects/", params={"limit": 1000})
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def _raw_cursor(payload):
+    return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip("=")
+
+
+@pytest.mark.parametrize("cursor", [
+    "not base64 json!",
+    _raw_cursor({"id": 1}),
+    _raw_cursor([1, 2]),
+    _raw_cursor([[1]]),
+    _raw_cursor([{"id": 1}]),
+    _raw_cursor([True]),
+])
+def test_malformed_cursor_is_400(client, cursor):
+    response = client.get("/tasks/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+def test_encoded_cursor_round_trips(client):
+    assert client.get("/tasks/", params={"cursor": encode_cursor([0])}).status_code == 200
@@ -0,0 +1,32 @@
+from app.core import changes
+from app.core.config import settings
+
+
+def test_queued_project_delete_refreshes_caches_and_feed(client, make_project, make_task, monkeypatch):
+    project, phase = make_project("delete-queued")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    make_task(bucket)
+    make_task(bucket, order=2)
+    monkeypatch.setattr(settings, "PROJECT_DELETE_ASYNC_THRESHOLD", 1)
+    monkeypatch.setattr(settings, "PROJECT_DELETE_CHUNK_SIZE", 1)
+    published = []
+
+    async def publish(project_id, events):
+        published.append((project_id, events))
+    monkeypatch.setattr(changes.broadcaster, "publish", publish)
+    # Warm the caches the job has to invalidate.
+    assert client.get(f"/projects/{project}").status_code == 200
+    assert project in [p["id"] for p in client.get("/projects/", params={"limit": 1000}).json()]
+    phases_etag = client.get(f"/phases/by-project/{project}").headers["ETag"]
+
+    response = client.delete(f"/projects/{project}")
+    assert response.status_code == 202
+    assert client.get(f"/jobs/{response.json()['job_id']}").json()["status"] == "succeeded"
+
+    assert published == [(project, [{"entity": "project", "op": "deleted", "id": project}])]
+    assert client.get(f"/projects/{project}").status_code == 404
+    assert project not in [p["id"] for p in client.get("/projects/", params={"limit": 1000}).json()]
+    assert client.get(f"/phases/by-project/{project}", headers={"If-None-Match": phases_etag}).status_code == 404
+    # the final delete cascades to what the chunks left behind
+    assert client.get(f"/phases/{phase}").status_code == 404
+    assert client.get(f"/task-buckets/{bucket}").status_code == 404
@@ -0,0 +1,37 @@
+from sqlalchemy import event
+
+from app.db import schemas
+from app.db.database import async_engine
+
+
+def test_tree_nests_phases_buckets_and_tasks_in_order(client, make_project, make_task):
+    project, first_phase = make_project("tree")
+    second_phase = client.post("/phases/", json={"project_id": project, "date": "2025-02-01", "label": "second"}).json()["id"]
+    late = client.post("/task-buckets/", json={"phase_id": first_phase, "name": "late", "order": 2}).json()["id"]
+    early = client.post("/task-buckets/", json={"phase_id": first_phase, "name": "early", "order": 1}).json()["id"]
+    tasks = [make_task(early, subject=subject, order=order)["id"] for subject, order in (("b", 2), ("a", 1))]
+
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", count)
+    try:
+        response = client.get(f"/projects/{project}/tree")
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", count)
+
+    assert response.status_code == 200
+    tree = schemas.ProjectTreeOut.model_validate(response.json())
+    assert tree.id == project
+    assert [phase.id for phase in tree.phases] == [first_phase, second_phase]
+    assert [bucket.id for bucket in tree.phases[0].task_buckets] == [early, late]
+    assert [task.id for task in tree.phases[0].task_buckets[0].tasks] == tasks[::-1]
+    assert tree.phases[0].task_buckets[1].tasks == []
+    assert tree.phases[1].task_buckets == []
+    # one query per level, however many rows each level has
+    assert len([statement for statement in statements if statement.lstrip().upper().startswith("SELECT")]) == 4
+
+
+def test_tree_of_missing_project_is_404(client):
+    assert client.get("/projects/999999/tree").status_code == 404
@@ -0,0 +1,6 @@
+from app.db.query_plans import check
+
+
+def test_endpoint_statements_use_indexes():
+    total, failures = check()
+    assert total and failures == {}
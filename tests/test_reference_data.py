@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.mark.parametrize("resource,field", [("teams", "team_id"), ("subsystems", "subsystem_id")])
+def test_referenced_team_or_subsystem_cannot_be_deleted(client, make_project, make_task, resource, field):
+    _, phase = make_project(f"delete-{resource}")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    referenced = client.post(f"/{resource}/", json={"name": f"referenced-{resource}"}).json()["id"]
+    unused = client.post(f"/{resource}/", json={"name": f"unused-{resource}"}).json()["id"]
+    make_task(bucket, **{field: referenced})
+
+    response = client.delete(f"/{resource}/{referenced}")
+    assert response.status_code == 400
+    assert "associated Tasks" in response.json()["detail"]
+    assert client.delete(f"/{resource}/{unused}").status_code == 200
+    assert client.delete(f"/{resource}/{unused}").status_code == 404
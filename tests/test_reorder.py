@@ -0,0 +1,91 @@
+from sqlalchemy import update
+
+from app.db.database import SessionLocal
+from app.db.ordering import ORDER_STEP
+from app.jobs import tasks as jobs
+from app.models import Job, ProjectPhase
+
+
+def _bucket_orders(client, bucket):
+    tasks = client.get(f"/tasks/by-bucket/{bucket}").json()
+    return [(task["id"], task["order"]) for task in sorted(tasks, key=lambda task: (task["order"], task["id"]))]
+
+
+def _latest_job():
+    with SessionLocal() as db:
+        return db.query(Job).order_by(Job.id.desc()).first()
+
+
+def _crowded_bucket(client, make_project, make_task, name):
+    """A bucket whose tasks sit 10 apart, so a move between two of them leaves a gap below ORDER_MIN_GAP."""
+    _, phase = make_project(name)
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    ids = [make_task(bucket, order=order)["id"] for order in (0, 10, 20)]
+    return bucket, ids
+
+
+def test_reorder_takes_the_midpoint_without_renumbering(client, make_project, make_task):
+    _, phase = make_project("reorder-midpoint")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    first, second, third = (make_task(bucket, order=order * ORDER_STEP)["id"] for order in (1, 2, 3))
+
+    response = client.post(f"/tasks/{third}/reorder", json={"position": "before", "target_id": second})
+    assert response.status_code == 200
+    assert response.json()["order"] == ORDER_STEP + ORDER_STEP // 2
+    assert _bucket_orders(client, bucket) == [
+        (first, ORDER_STEP), (third, ORDER_STEP + ORDER_STEP // 2), (second, 2 * ORDER_STEP),
+    ]
+
+
+def test_reorder_rejects_target_in_another_bucket(client, make_project, make_task):
+    _, phase = make_project("reorder-other-bucket")
+    one = client.post("/task-buckets/", json={"phase_id": phase, "name": "one", "order": 1}).json()["id"]
+    two = client.post("/task-buckets/", json={"phase_id": phase, "name": "two", "order": 2}).json()["id"]
+    task, other = make_task(one)["id"], make_task(two)["id"]
+    assert client.post(f"/tasks/{task}/reorder", json={"position": "after", "target_id": other}).status_code == 400
+
+
+def test_small_gap_rebalances_siblings_in_a_job(client, make_project, make_task):
+    bucket, (first, second, third) = _crowded_bucket(client, make_project, make_task, "reorder-gap")
+
+    response = client.post(f"/tasks/{third}/reorder", json={"position": "after", "target_id": first})
+    assert response.status_code == 200
+    assert _bucket_orders(client, bucket) == [(first, ORDER_STEP), (third, 2 * ORDER_STEP), (second, 3 * ORDER_STEP)]
+    job = _latest_job()
+    assert (job.kind, job.status, job.processed) == ("rebalance_order", "succeeded", 3)
+
+
+def test_reorder_renumbers_inline_when_the_job_cannot_be_queued(client, make_project, make_task, monkeypatch):
+    bucket, (first, second, third) = _crowded_bucket(client, make_project, make_task, "reorder-broker-down")
+
+    def broker_down(job_id):
+        raise ConnectionError("broker unavailable")
+    monkeypatch.setattr(jobs.run_job, "delay", broker_down)
+
+    response = client.post(f"/tasks/{third}/reorder", json={"position": "after", "target_id": first})
+    assert response.status_code == 200
+    assert response.json()["order"] == 2 * ORDER_STEP
+    assert _bucket_orders(client, bucket) == [(first, ORDER_STEP), (third, 2 * ORDER_STEP), (second, 3 * ORDER_STEP)]
+    job = _latest_job()
+    assert (job.kind, job.status) == ("rebalance_order", "failed")
+    assert "broker unavailable" in job.error
+
+
+def test_rebalance_job_refreshes_cached_phases(client, make_project):
+    project, first = make_project("reorder-phase-cache")
+    second = client.post("/phases/", json={"project_id": project, "date": "2025-01-02", "label": "second"}).json()["id"]
+    with SessionLocal() as db:
+        db.execute(update(ProjectPhase).where(ProjectPhase.id == first).values(order=3))
+        db.execute(update(ProjectPhase).where(ProjectPhase.id == second).values(order=5))
+        db.commit()
+    assert client.get(f"/phases/{second}").json()["order"] == 5
+
+    with SessionLocal() as db:
+        job = Job(kind="rebalance_order", status="queued", progress=0, processed=0,
+                  params={"scope": "phases", "parent_id": project})
+        db.add(job)
+        db.commit()
+        job_id = job.id
+    jobs.run_job(job_id)
+
+    assert client.get(f"/phases/{second}").json()["order"] == 2 * ORDER_STEP
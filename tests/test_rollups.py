@@ -0,0 +1,34 @@
+def _rollup_rows(project_id):
+    from app.db.database import SessionLocal
+    from app.models import TaskDailyRollup
+
+    with SessionLocal() as db:
+        return sorted(
+            (row.task_bucket_id, row.team_id, row.subsystem_id, row.date, row.done_count, row.pending_count, row.overdue_count)
+            for row in db.query(TaskDailyRollup).filter(TaskDailyRollup.project_id == project_id)
+        )
+
+
+def test_incremental_rollups_match_a_rebuild(client, make_project, team_and_subsystem):
+    project, phase = make_project("rollup-incremental")
+    team, subsystem = team_and_subsystem
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    base = {"task_bucket_id": bucket, "team_id": team, "subsystem_id": subsystem, "description": "d",
+            "start_date": "2025-01-01", "end_date": "2025-01-04"}
+    ids = [
+        client.post("/tasks/", json={**base, "subject": f"s{i}", "order": i, "status_by_day": {}}).json()["id"]
+        for i in range(3)
+    ]
+    client.patch("/tasks/status", json={"changes": [
+        {"task_id": ids[0], "date": "2025-01-02", "status": "Done"},
+        {"task_id": ids[1], "date": "2025-01-02", "status": "Done"},
+    ]})
+    client.patch(f"/tasks/{ids[1]}/status/2025-01-02", json={"status": None})
+    client.put(f"/tasks/{ids[2]}", json={**base, "subject": "s2", "order": 2, "end_date": "2025-01-06"})
+    client.delete(f"/tasks/{ids[0]}")
+    incremental = _rollup_rows(project)
+
+    assert client.post("/jobs/rollup-rebuild", json={"project_id": project}).json()["status"] == "succeeded"
+    assert _rollup_rows(project) == incremental
+    # one row per slice and day: both remaining tasks share the slice
+    assert len({row[:4] for row in incremental}) == len(incremental)
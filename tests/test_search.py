@@ -0,0 +1,64 @@
+from app.api.pagination import NEXT_CURSOR_HEADER
+
+
+def _search(client, q, **params):
+    response = client.get("/tasks/search", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response
+
+
+def _ids(response):
+    return [hit["id"] for hit in response.json()]
+
+
+def test_subject_matches_outrank_description_matches(client, make_project, make_task):
+    _, phase = make_project("search-rank")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    in_description = make_task(bucket, subject="other", description="zebrafoo gateway")["id"]
+    in_subject = make_task(bucket, subject="zebrafoo gateway", description="d")["id"]
+    make_task(bucket, subject="zebrafoo only", description="d")
+
+    hits = _search(client, "ZEBRAFOO gate").json()  # case-insensitive, every word, each as a prefix
+
+    assert [hit["id"] for hit in hits] == [in_subject, in_description]
+    assert hits[0]["rank"] <= hits[1]["rank"]
+
+
+def test_search_follows_updates_and_deletes(client, make_project, make_task):
+    _, phase = make_project("search-sync")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    task = make_task(bucket, subject="zebrabar")
+    body = {key: task[key] for key in (
+        "task_bucket_id", "team_id", "subsystem_id", "subject", "description", "start_date", "end_date", "order",
+    )}
+
+    client.put(f"/tasks/{task['id']}", json={**body, "subject": "zebrabaz"})
+    assert _ids(_search(client, "zebrabar")) == []
+    assert _ids(_search(client, "zebrabaz")) == [task["id"]]
+    client.delete(f"/tasks/{task['id']}")
+    assert _ids(_search(client, "zebrabaz")) == []
+
+
+def test_search_cursor_walks_hits_in_rank_order(client, make_project, make_task):
+    project, phase = make_project("search-cursor")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    for index in range(4):
+        make_task(bucket, subject=f"zebraqux {'filler ' * index}", description="zebraqux")
+    everything = _ids(_search(client, "zebraqux", project_id=project))
+
+    walked = []
+    response = _search(client, "zebraqux", project_id=project, limit=1)
+    while True:
+        walked.extend(_ids(response))
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            break
+        response = _search(client, "zebraqux", project_id=project, limit=1, cursor=cursor)
+
+    assert len(everything) == 4
+    assert walked == everything
+
+
+def test_query_syntax_is_treated_as_words(client):
+    assert _search(client, 'zebra" OR NEAR(* -x').json() == []
+    assert client.get("/tasks/search", params={"q": "!!!"}).status_code == 400
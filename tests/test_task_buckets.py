@@ -0,0 +1,71 @@
+from sqlalchemy import event
+
+from app.db.database import async_engine
+
+
+def test_moved_bucket_survives_deleting_its_old_project(client, make_project):
+    old_project, old_phase = make_project("move-source")
+    new_project, new_phase = make_project("move-target")
+    team = client.post("/teams/", json={"name": "move-team"}).json()["id"]
+    subsystem = client.post("/subsystems/", json={"name": "move-subsystem"}).json()["id"]
+    bucket = client.post("/task-buckets/", json={"phase_id": old_phase, "name": "b", "order": 1}).json()["id"]
+    task = client.post("/tasks/", json={
+        "task_bucket_id": bucket, "team_id": team, "subsystem_id": subsystem, "subject": "s", "description": "d",
+        "start_date": "2025-01-01", "end_date": "2025-01-03", "order": 1, "status_by_day": {"2025-01-02": "Done"},
+    }).json()["id"]
+
+    response = client.put(f"/task-buckets/{bucket}", json={"name": "b", "order": 1, "phase_id": new_phase})
+    assert response.status_code == 200
+    assert client.delete(f"/projects/{old_project}").status_code == 200
+
+    assert client.get(f"/tasks/{task}").status_code == 200
+    tree = client.get(f"/projects/{new_project}/tree").json()
+    assert [b["id"] for b in tree["phases"][0]["task_buckets"]] == [bucket]
+    burndown = client.get(f"/projects/{new_project}/burndown").json()
+    assert sum(point["done_count"] for point in burndown) == 1
+
+
+def test_moving_bucket_to_missing_phase_is_rejected(client, make_project):
+    _, phase = make_project("move-missing")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    response = client.put(f"/task-buckets/{bucket}", json={"name": "b", "order": 1, "phase_id": 999999})
+    assert response.status_code == 400
+
+
+def test_batch_delete_of_bucket_with_tasks_rejects_the_whole_batch(client, make_project, make_task):
+    _, phase = make_project("bucket-batch-delete")
+    busy = client.post("/task-buckets/", json={"phase_id": phase, "name": "busy", "order": 1}).json()["id"]
+    empty = client.post("/task-buckets/", json={"phase_id": phase, "name": "empty", "order": 2}).json()["id"]
+    task = make_task(busy)["id"]
+
+    response = client.post("/task-buckets/batch", json={"operations": [
+        {"op": "update", "id": empty, "data": {"name": "renamed"}},
+        {"op": "delete", "id": empty},
+        {"op": "delete", "id": busy},
+    ]})
+    assert response.status_code == 422
+    results = response.json()["results"]
+    assert results[2] == {"index": 2, "op": "delete", "id": busy, "status": "error",
+                          "detail": "Cannot delete TaskBucket with associated Tasks"}
+    assert [result["status"] for result in results[:2]] == ["ok", "error"]  # duplicate target
+    assert client.get(f"/tasks/{task}").status_code == 200
+
+    # A task that arrives after validation: the DELETE itself must still refuse the bucket.
+    def add_task_first(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("DELETE FROM task_buckets"):
+            cursor.execute(
+                "INSERT INTO tasks (task_bucket_id, project_id, subject, description, status_by_day, \"order\") "
+                "SELECT id, project_id, 'late', 'd', '{}', 1 FROM task_buckets WHERE id = ?", (empty,)
+            )
+    event.listen(async_engine.sync_engine, "before_cursor_execute", add_task_first)
+    try:
+        response = client.post("/task-buckets/batch", json={"operations": [
+            {"op": "update", "id": busy, "data": {"name": "renamed"}},
+            {"op": "delete", "id": empty},
+        ]})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", add_task_first)
+    assert response.status_code == 422
+    assert [result["status"] for result in response.json()["results"]] == ["ok", "error"]
+    assert client.get(f"/task-buckets/{busy}").json()["name"] == "busy"  # not committed
+    assert client.get(f"/task-buckets/{empty}").status_code == 200
@@ -0,0 +1,37 @@
+def test_pending_means_not_done_on_the_status_date(client, make_project, make_task):
+    project, phase = make_project("query-pending")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    done = make_task(bucket, subject="done", status_by_day={"2025-01-02": "Done"})["id"]
+    blocked = make_task(bucket, subject="blocked", status_by_day={"2025-01-02": "Blocked"})["id"]
+    untouched = make_task(bucket, subject="untouched")["id"]
+    day = {"project_id": project, "status_date": "2025-01-02"}
+
+    def ids(**params):
+        response = client.get("/tasks/query", params={**day, **params})
+        assert response.status_code == 200, response.text
+        return sorted(task["id"] for task in response.json()["tasks"])
+
+    assert ids(status="pending") == sorted([blocked, untouched])
+    assert ids(status="pending") == ids(done="false")
+    assert ids(status=["pending", "done"]) == sorted([done, blocked, untouched])
+    assert ids(status="blocked") == [blocked]
+    assert ids(status="done") == [done]
+
+    summary = client.get("/daily-summary/", params={"date_query": "2025-01-02", "view": "ids"}).json()
+    assert set(ids(status="pending")) <= set(summary["pending_ids"])
+
+
+def test_group_by_status_labels_tasks_without_an_entry_pending(client, make_project, make_task):
+    project, phase = make_project("query-group-status")
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    make_task(bucket, status_by_day={"2025-01-02": "Done"})
+    make_task(bucket)
+    make_task(bucket)
+
+    response = client.get("/tasks/query", params={
+        "project_id": project, "status_date": "2025-01-02", "group_by": "status",
+    })
+    assert response.json()["groups"] == [
+        {"status": "done", "count": 1, "done_count": 1},
+        {"status": "pending", "count": 2, "done_count": 0},
+    ]
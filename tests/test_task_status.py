@@ -0,0 +1,24 @@
+from sqlalchemy import update
+
+
+def test_day_status_on_task_with_null_status_by_day(client, make_project, team_and_subsystem):
+    from app.db.database import SessionLocal
+    from app.models import Task
+
+    _, phase = make_project("status-null")
+    team, subsystem = team_and_subsystem
+    bucket = client.post("/task-buckets/", json={"phase_id": phase, "name": "b", "order": 1}).json()["id"]
+    task = {"task_bucket_id": bucket, "team_id": team, "subsystem_id": subsystem, "subject": "s", "description": "d",
+            "start_date": "2025-01-01", "end_date": "2025-01-03", "order": 1, "status_by_day": None}
+    created = client.post("/tasks/", json=task).json()
+    assert created["status_by_day"] == {}
+    legacy = client.post("/tasks/", json={**task, "order": 2}).json()["id"]
+    with SessionLocal() as db:  # rows written before null was normalized hold a JSON null
+        db.execute(update(Task).where(Task.id == legacy).values(status_by_day=None))
+        db.commit()
+
+    for task_id in (created["id"], legacy):
+        assert client.patch(f"/tasks/{task_id}/status/2025-01-02", json={"status": "Done"}).status_code == 200
+        assert client.get(f"/tasks/{task_id}").json()["status_by_day"] == {"2025-01-02": "Done"}
+    summary = client.get("/daily-summary/", params={"date_query": "2025-01-02", "team_id": team, "view": "ids"}).json()
+    assert {created["id"], legacy} <= set(summary["completed_ids"])